@@ -0,0 +1,82 @@
+"""
+Compare taking the roll for one class session through the per-row
+``POST /api/attendance`` endpoint against a single
+``POST /api/attendance/bulk`` request.
+
+    python bench_attendance.py --students 40 --sessions 10
+
+Requests go through the Flask test client against a temporary SQLite file
+with the app's normal engine configuration, so the numbers include request
+handling and one commit (fsync) per request.
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from datetime import date, timedelta
+
+from app import create_app
+from extensions import db
+from models import Attendance, Class, Student, UserAccount
+
+
+def setup(students):
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    app = create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{path}"})
+    with app.app_context():
+        db.create_all()
+        user = UserAccount(username="bench", email="bench@example.com", role="admin")
+        user.set_password("bench")
+        cls = Class(class_code="BENCH", class_name="Bench", subject="Bench")
+        db.session.add_all([user, cls])
+        db.session.add_all(Student(student_code=f"B{i}", first_name="S", last_name=str(i)) for i in range(students))
+        db.session.commit()
+        class_id, student_ids = cls.id, [s.id for s in Student.query.all()]
+    client = app.test_client()
+    client.post("/login", data={"username": "bench", "password": "bench"})
+    return app, client, class_id, student_ids
+
+
+def per_row(client, class_id, student_ids, day):
+    for sid in student_ids:
+        r = client.post("/api/attendance", json={
+            "student_id": sid, "class_id": class_id, "date": day.isoformat(), "status": "present"
+        })
+        assert r.status_code in (200, 201), r.get_json()
+
+
+def bulk(client, class_id, student_ids, day):
+    r = client.post("/api/attendance/bulk", json={
+        "class_id": class_id, "date": day.isoformat(),
+        "entries": [{"student_id": sid, "status": "present"} for sid in student_ids]
+    })
+    assert r.status_code == 200, r.get_json()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--students", type=int, default=40)
+    parser.add_argument("--sessions", type=int, default=10)
+    args = parser.parse_args()
+
+    app, client, class_id, student_ids = setup(args.students)
+    timings = {}
+    for label, mark, offset in [("per-row", per_row, 0), ("bulk", bulk, args.sessions)]:
+        samples = []
+        for n in range(args.sessions):
+            day = date(2026, 1, 1) + timedelta(days=offset + n)
+            started = time.perf_counter()
+            mark(client, class_id, student_ids, day)
+            samples.append((time.perf_counter() - started) * 1000)
+        timings[label] = statistics.median(samples)
+        print(f"{label:8} {timings[label]:8.1f} ms per session of {args.students} students")
+
+    with app.app_context():
+        expected = 2 * args.sessions * args.students
+        assert Attendance.query.count() == expected
+    print(f"speedup: {timings['per-row'] / timings['bulk']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Compare concurrent read/write throughput on a SQLite file with SQLite's
+stock settings against the tuned engine configuration from Config
+(WAL, synchronous=NORMAL, busy timeout, mmap).
+
+    python bench_db_concurrency.py --threads 8 --seconds 5
+
+Each thread loops over a request-sized unit of work: writers insert an
+attendance row and commit, readers page through a class's attendance.
+"""
+import argparse
+import itertools
+import os
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import func
+from sqlalchemy.exc import OperationalError
+
+from app import create_app
+from extensions import db
+from models import Attendance, Class, Student
+
+# SQLite's own defaults; the busy timeout matches pysqlite's 5 s default
+UNTUNED = {
+    "SQLITE_JOURNAL_MODE": "DELETE",
+    "SQLITE_SYNCHRONOUS": "FULL",
+    "SQLITE_BUSY_TIMEOUT_MS": 5000,
+    "SQLITE_MMAP_SIZE": 0,
+}
+write_slots = itertools.count()
+
+
+def seed(app, students=200):
+    with app.app_context():
+        db.create_all()
+        cls = Class(class_code="BENCH", class_name="Bench", subject="Bench")
+        db.session.add(cls)
+        db.session.add_all(Student(student_code=f"B{i}", first_name="S", last_name=str(i)) for i in range(students))
+        db.session.commit()
+        return cls.id, [s.id for s in Student.query.all()]
+
+
+def write_once(class_id, student_ids, n):
+    # (student, class, date) is unique, so every write gets a fresh slot
+    slot = next(write_slots)
+    db.session.add(Attendance(
+        student_id=student_ids[slot % len(student_ids)], class_id=class_id,
+        date=date.today() - timedelta(days=slot // len(student_ids)), status="present"
+    ))
+    db.session.commit()
+
+
+def read_once(class_id, student_ids, n):
+    Attendance.query.filter_by(class_id=class_id).order_by(Attendance.id.desc()).limit(50).all()
+    db.session.query(func.count(Attendance.id)).filter_by(class_id=class_id).scalar()
+
+
+def run(label, overrides, threads, seconds):
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    app = create_app(dict(overrides, SQLALCHEMY_DATABASE_URI=f"sqlite:///{path}"))
+    class_id, student_ids = seed(app)
+    counts = {"writes": 0, "reads": 0, "locked": 0}
+    latencies = []
+    lock = threading.Lock()
+    deadline = time.monotonic() + seconds
+
+    def worker(index):
+        op, key = (write_once, "writes") if index % 2 == 0 else (read_once, "reads")
+        n = 0
+        with app.app_context():
+            while time.monotonic() < deadline:
+                started = time.perf_counter()
+                try:
+                    op(class_id, student_ids, n)
+                    outcome = key
+                except OperationalError:
+                    db.session.rollback()
+                    outcome = "locked"
+                elapsed = time.perf_counter() - started
+                with lock:
+                    counts[outcome] += 1
+                    latencies.append(elapsed)
+                n += 1
+            db.session.remove()
+
+    pool = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    with app.app_context():
+        db.engine.dispose()
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95)] * 1000 if latencies else 0
+    print(f"{label:8} writes/s {counts['writes'] / seconds:8.1f}   reads/s {counts['reads'] / seconds:8.1f}   "
+          f"locked {counts['locked']:4}   p95 {p95:6.1f} ms")
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--seconds", type=float, default=5)
+    args = parser.parse_args()
+
+    base = run("untuned", UNTUNED, args.threads, args.seconds)
+    tuned = run("tuned", {}, args.threads, args.seconds)
+    base_ops = base["writes"] + base["reads"]
+    tuned_ops = tuned["writes"] + tuned["reads"]
+    if base_ops:
+        print(f"throughput: {tuned_ops / base_ops:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Logins per second per core for each password hashing setting.
+
+    python bench_passwords.py --logins 20
+    python bench_passwords.py --methods scrypt:16384:8:1 pbkdf2:sha256:600000
+
+Everything runs on one thread, so the figures are per core: the hash check
+alone, and a full ``POST /login`` through the Flask test client against a
+temporary SQLite database. The last column is the first login after
+switching to that setting from the configured one, which also re-hashes.
+Multiply by the number of workers (cores) for a whole instance.
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from app import create_app
+from config import Config
+from extensions import db
+from models import UserAccount
+from passwords import canonical_method
+
+DEFAULT_METHODS = ["scrypt:32768:8:1", "scrypt:16384:8:1", "scrypt:8192:8:1",
+                   "pbkdf2:sha256:1000000", "pbkdf2:sha256:600000", "pbkdf2:sha256:300000"]
+PASSWORD = "correct horse battery staple"
+
+
+def timed(fn, runs):
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - started)
+    return statistics.median(samples)
+
+
+def memory_mb(method):
+    name, *args = method.split(":")
+    return 128 * int(args[0]) * int(args[1]) / 1024 ** 2 if name == "scrypt" else 0.0
+
+
+def bench(path, method, logins, stored_hash):
+    app = create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{path}", "PASSWORD_HASH_METHOD": method})
+    client = app.test_client()
+
+    def login():
+        response = client.post("/login", data={"username": "bench", "password": PASSWORD})
+        assert response.status_code == 302 and "dashboard" in response.location, "login failed"
+
+    with app.app_context():
+        user = UserAccount.query.filter_by(username="bench").one()
+        # Stored with the configured setting: the first login re-hashes to ``method``
+        user.password_hash = stored_hash
+        db.session.commit()
+        rehash = timed(login, 1)
+        user = UserAccount.query.filter_by(username="bench").one()
+        assert not user.password_needs_rehash()
+        verify = timed(lambda: user.check_password(PASSWORD), logins)
+    return verify, timed(login, logins), rehash
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--methods", nargs="+", default=None)
+    parser.add_argument("--logins", type=int, default=10, help="timed logins per setting (median is reported)")
+    args = parser.parse_args()
+
+    configured = canonical_method(Config.PASSWORD_HASH_METHOD)
+    methods = [canonical_method(m) for m in args.methods or DEFAULT_METHODS]
+    if configured not in methods:
+        methods.insert(0, configured)
+
+    path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    app = create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{path}"})
+    with app.app_context():
+        db.create_all()
+        user = UserAccount(username="bench", email="bench@example.com", role="user", active=True)
+        user.set_password(PASSWORD)
+        db.session.add(user)
+        db.session.commit()
+        stored_hash = user.password_hash
+
+    print(f"{'method':24} {'memory':>8} {'verify':>10} {'login':>10} {'logins/s/core':>14} {'rehash login':>13}")
+    for method in methods:
+        verify, login, rehash = bench(path, method, args.logins, stored_hash)
+        marker = "  (configured)" if method == configured else ""
+        print(f"{method:24} {memory_mb(method):6.0f}MB {verify * 1000:8.1f}ms {login * 1000:8.1f}ms "
+              f"{1 / login:14.1f} {rehash * 1000:11.1f}ms{marker}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Measure the cold-start cost of importing app.py and calling create_app():
+wall-clock time and peak resident memory (RSS), each in a fresh interpreter.
+
+    python bench_startup.py --runs 5
+
+Exits with status 1 when the median exceeds STARTUP_IMPORT_BUDGET_MS or
+STARTUP_RSS_BUDGET_MB, or when a module that should load lazily was
+imported at startup, so CI can run it as a budget check.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+IMPORT_BUDGET_MS = float(os.environ.get("STARTUP_IMPORT_BUDGET_MS", 1500))
+RSS_BUDGET_MB = float(os.environ.get("STARTUP_RSS_BUDGET_MB", 100))
+# Heavy dependencies that must only load on first use
+LAZY_MODULES = ["googleapiclient", "google_auth_oauthlib", "youtube_uploader", "classroom_auth", "streamlit", "openpyxl"]
+
+PROBE = """
+import json, resource, sys, time
+started = time.perf_counter()
+import app
+app.create_app()
+elapsed_ms = (time.perf_counter() - started) * 1000
+rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({"import_ms": elapsed_ms, "rss_mb": rss_kb / 1024,
+                  "loaded": [m for m in %r if m in sys.modules]}))
+"""
+
+
+def measure_once():
+    env = dict(os.environ)
+    env.setdefault("DATABASE_URL", "sqlite://")
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE % (LAZY_MODULES,)],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        env=env, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    samples = [measure_once() for _ in range(args.runs)]
+    import_ms = statistics.median(s["import_ms"] for s in samples)
+    rss_mb = statistics.median(s["rss_mb"] for s in samples)
+    eager = sorted({m for s in samples for m in s["loaded"]})
+
+    print(f"import time: {import_ms:.0f} ms (budget {IMPORT_BUDGET_MS:.0f} ms)")
+    print(f"peak RSS:    {rss_mb:.1f} MB (budget {RSS_BUDGET_MB:.0f} MB)")
+    print(f"eagerly loaded heavy modules: {', '.join(eager) or 'none'}")
+
+    over_budget = import_ms > IMPORT_BUDGET_MS or rss_mb > RSS_BUDGET_MB or eager
+    if over_budget:
+        print("❌ Startup budget exceeded")
+        sys.exit(1)
+    print("✅ Within startup budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,20 @@
+from functools import wraps
+
+from flask import jsonify
+from flask_login import current_user
+
+
+def admin_required(f):
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        if not current_user.is_authenticated or getattr(current_user, 'role', None) != 'admin':
+            return jsonify({"status": "error", "message": "Admin access required"}), 403
+        return f(*args, **kwargs)
+    return decorated_function
+
+
+def register_blueprints(app):
+    # Imported here so the route modules can themselves import admin_required
+    from blueprints import users, classes, students, finance, google_integration, admin_mapping
+    for module in (users, classes, students, finance, google_integration, admin_mapping):
+        app.register_blueprint(module.bp)
@@ -0,0 +1,132 @@
+from flask import Blueprint, current_app, render_template, request, jsonify, url_for
+from flask_login import login_required, current_user
+
+from blueprints import admin_required
+from extensions import db
+from http_cache import conditional
+from google_sync import create_sync_job, process_sync_job, serialize_sync_job, sync_runner
+from models import Class, Video, GoogleIntegrationAccount, GoogleClassroomCourse, SyncJob, YouTubePlaylist
+from read_cache import cache_snapshots
+from reference_data import class_catalogue, classroom_courses, youtube_playlists
+
+bp = Blueprint("admin", __name__)
+
+
+# --- Admin Mapping and Sync Routes ---
+
+@bp.route('/admin/mapping')
+@login_required
+@admin_required
+def admin_mapping():
+    # Classes with their linked course, so the selects start on the current mapping
+    return render_template(
+        'admin_mapping.html',
+        classes=list(class_catalogue().values()),
+        gclass_courses=classroom_courses(),
+        playlists=youtube_playlists()
+    )
+
+@bp.route('/api/google_classroom_courses', methods=['GET'])
+@login_required
+@admin_required
+@conditional('google_classroom_course')
+def api_google_classroom_courses():
+    return jsonify(classroom_courses())
+
+@bp.route('/api/youtube_playlists', methods=['GET'])
+@login_required
+@admin_required
+@conditional('youtube_playlist')
+def api_youtube_playlists():
+    return jsonify(youtube_playlists())
+
+@bp.route('/api/map_class_resources/<class_code>', methods=['POST'])
+@login_required
+@admin_required
+def api_map_class_resources(class_code):
+    data = request.json
+    cls = Class.query.filter_by(class_code=class_code).first()
+    if not cls:
+        return jsonify({'status': 'error', 'message': 'Class not found'}), 404
+
+    # Map Google Classroom course
+    gclass_id = data.get('google_classroom_course_id')
+    if gclass_id:
+        gclass = GoogleClassroomCourse.query.get(gclass_id)
+        if gclass:
+            gclass.class_id = cls.id
+            db.session.commit()
+
+    # Map YouTube playlist (the mapping page sends it as playlist_id)
+    playlist_id = data.get('youtube_playlist_id') or data.get('playlist_id')
+    if playlist_id:
+        if not YouTubePlaylist.query.filter_by(playlist_id=playlist_id).first():
+            return jsonify({'status': 'error', 'message': 'Unknown playlist; sync YouTube playlists first'}), 404
+        # Uploads for this class go to the mapped playlist
+        cls.playlist_id = playlist_id
+        # Update all videos with this playlist to point to this class
+        Video.query.filter_by(youtube_playlist_id=playlist_id).update({'class_id': cls.id})
+        db.session.commit()
+
+    return jsonify({'status': 'success', 'message': 'Resources mapped successfully.'})
+
+# --- SYNC ROUTES FOR ADMIN MAPPING TOOL ---
+
+def sync_accounts_from_request(data):
+    """Accounts named by ``teacher_email`` (one) or ``account_ids``; every account when neither is given."""
+    query = GoogleIntegrationAccount.query
+    if data.get('teacher_email'):
+        query = query.filter_by(google_email=data['teacher_email'])
+    elif data.get('account_ids'):
+        query = query.filter(GoogleIntegrationAccount.id.in_(data['account_ids']))
+    return query.order_by(GoogleIntegrationAccount.id).all()
+
+
+def queue_sync_job(kind):
+    accounts = sync_accounts_from_request(request.json or {})
+    if not accounts:
+        return jsonify({'status': 'error', 'message': 'No integration account found for this email'}), 404
+    job = create_sync_job(kind, accounts, current_user.id)
+    sync_runner.submit(process_sync_job, current_app._get_current_object(), job.id)
+    return jsonify({
+        'status': 'queued',
+        'job_id': job.id,
+        'accounts': len(accounts),
+        'status_url': url_for('admin.api_sync_job_status', job_id=job.id)
+    }), 202
+
+
+@bp.route('/api/sync_google_classrooms', methods=['POST'])
+@login_required
+@admin_required
+def sync_google_classrooms():
+    return queue_sync_job('classroom')
+
+
+@bp.route('/api/sync_jobs/<job_id>', methods=['GET'])
+@login_required
+@admin_required
+def api_sync_job_status(job_id):
+    job = SyncJob.query.get_or_404(job_id)
+    return jsonify(serialize_sync_job(job))
+
+@bp.route('/api/sync_youtube_playlists', methods=['POST'])
+@login_required
+@admin_required
+def sync_youtube_playlists():
+    return queue_sync_job('youtube')
+
+@bp.route('/api/google_quota', methods=['GET'])
+@login_required
+@admin_required
+def api_google_quota():
+    # Per-process counters: each gunicorn worker keeps its own budget
+    from google_quota import quota_snapshot
+    return jsonify(quota_snapshot())
+
+@bp.route('/api/read_cache', methods=['GET'])
+@login_required
+@admin_required
+def api_read_cache():
+    # Hit/miss counters of this worker's reference-data and identity caches
+    return jsonify(cache_snapshots())
@@ -0,0 +1,301 @@
+import re
+from datetime import datetime, timedelta
+
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:
+    from pytz import timezone as ZoneInfo
+
+from flask import Blueprint, render_template, redirect, url_for, request, flash, jsonify
+from flask_login import login_required, current_user
+from sqlalchemy import or_
+
+from config import CLASSROOM_OWNER_EMAIL
+from extensions import db
+from http_cache import conditional
+from models import (Class, GoogleClassroomCourse, StudentClassAssignment, Video, StudentFee,
+                    Attendance, class_catalogue_query, serialize_class)
+from pagination import paginated_response
+from reference_data import class_catalogue, class_filter_options
+
+bp = Blueprint("classes", __name__)
+
+
+@bp.route("/add_class", methods=["POST"])
+@login_required
+def add_class():
+
+    subject = request.form["subject"].strip()
+    year_level = request.form["year_level"].strip()
+    batch = request.form["batch"].strip()
+    sub_batch = request.form.get("sub_batch", "").strip()
+    class_type = request.form.get("class_type", "").strip()
+    description = request.form.get("description", "").strip()
+    class_teacher = request.form.get("class_teacher", "Nisa Bandarayapa").strip()
+    class_day = request.form.get("class_day", "Monday").strip()
+    class_time = request.form.get("class_time", "").strip()
+    class_location = request.form.get("class_location", "").strip()
+
+    create_gclassroom = "create_classroom" in request.form
+    gclass_name = request.form.get("gclass_name", "").strip()
+    gclass_section = request.form.get("gclass_section", "").strip()
+
+    # Build unique class code
+    subject_code = subject.replace(" ", "")[:3].upper()
+    year_match = re.search(r'\d+', year_level)
+    year_code = year_match.group(0) if year_match else ""
+    batch_code = batch
+    sub_batch_code = sub_batch.replace(" ", "").upper() if sub_batch else ""
+    class_type_code = class_type[0].upper() if class_type else ""
+    class_code = f"{subject_code}{year_code}{batch_code}{sub_batch_code}{class_type_code}"
+    class_name = f"{subject} - {year_level} - {batch}"
+    if sub_batch and sub_batch.strip():
+        class_name += f" - {sub_batch.strip()}"
+
+    edit_code = request.form.get("edit_code")
+    if edit_code:
+        cls = Class.query.get(edit_code)
+        if not cls:
+            flash("⚠️ That class no longer exists.", "warning")
+            return redirect(url_for("classes.manage_classes", tab="list"))
+        cls.subject = subject
+        cls.year_level = year_level
+        cls.batch = batch
+        cls.sub_batch = sub_batch
+        cls.class_type = class_type
+        cls.description = description
+        cls.class_name = class_name
+        cls.class_teacher = class_teacher
+        cls.class_day = class_day
+        cls.class_time = class_time
+        cls.class_location = class_location
+        db.session.commit()
+        flash(f"🔁 Class '{class_name}' updated successfully.", "success")
+    else:
+        # Check for duplicates (now includes sub_batch and class_type for uniqueness)
+        duplicate = Class.query.filter_by(subject=subject, year_level=year_level, batch=batch, sub_batch=sub_batch, class_type=class_type).first()
+        if duplicate:
+            flash("⚠️ A class with the same subject, year, batch, sub batch, and type already exists.", "warning")
+            return redirect(url_for("classes.manage_classes", tab="add"))
+
+        try:
+            melbourne_time = datetime.now(ZoneInfo('Australia/Melbourne'))
+        except Exception:
+            # Fallback: use UTC and manually add offset for Melbourne (does not handle DST)
+            melbourne_time = datetime.utcnow() + timedelta(hours=10)
+
+        new_class = Class(
+            class_code=class_code,
+            class_name=class_name,
+            subject=subject,
+            year_level=year_level,
+            batch=batch,
+            sub_batch=sub_batch,
+            class_type=class_type,
+            description=description,
+            class_status="active",
+            class_created=melbourne_time,
+            class_teacher=class_teacher,
+            class_day=class_day,
+            class_time=class_time,
+            class_location=class_location
+        )
+
+        # ✅ Google Classroom Creation
+        if create_gclassroom and gclass_name:
+            try:
+                from classroom_utils import create_google_course
+                course_info = create_google_course(
+                    course_name=gclass_name,
+                    section=gclass_section,
+                    room=batch,
+                    ownerId=CLASSROOM_OWNER_EMAIL
+                )
+                new_class.courseId = course_info["courseId"]
+                new_class.joinCode = course_info["joinCode"]
+                new_class.classroom_name = gclass_name
+                new_class.classroom_section = gclass_section
+                db.session.add(new_class)
+                db.session.flush()  # Get new_class.id before committing
+                # Insert GoogleClassroomCourse record
+                integration_account_id = 1  # TODO: Use real integration account selection logic
+                created_by = current_user.id if current_user.is_authenticated else None
+                gclass = GoogleClassroomCourse(
+                    course_id=course_info["courseId"],
+                    name=gclass_name,
+                    section=gclass_section,
+                    join_code=course_info["joinCode"],
+                    class_id=new_class.id,
+                    integration_account_id=integration_account_id,
+                    created_by=created_by,
+                    created_at=datetime.utcnow()
+                )
+                db.session.add(gclass)
+                flash(f"✅ Classroom created with join code: {course_info['joinCode']}", "info")
+            except Exception as e:
+                db.session.add(new_class)
+                flash(f"⚠️ Classroom creation failed: {e}", "warning")
+        else:
+            db.session.add(new_class)
+        flash(f"✅ Class '{class_name}' created successfully!", "success")
+    db.session.commit()
+    return redirect(url_for("classes.manage_classes", tab="list"))
+
+@bp.route("/delete_class/<code>", methods=["POST"])
+@login_required
+def delete_class(code):
+    cls = Class.query.filter_by(class_code=code).first()
+    if cls:
+        # Cascade delete related records
+        GoogleClassroomCourse.query.filter_by(class_id=cls.id).delete()
+        StudentClassAssignment.query.filter_by(class_id=cls.id).delete()
+        Video.query.filter_by(class_id=cls.id).delete()
+        StudentFee.query.filter_by(class_id=cls.id).delete()
+        Attendance.query.filter_by(class_id=cls.id).delete()
+        db.session.delete(cls)
+        db.session.commit()
+        flash(f"🗑️ Class '{cls.class_name}' and all related records deleted.", "success")
+    else:
+        flash(f"⚠️ Class '{code}' not found.", "warning")
+    return redirect(url_for("classes.manage_classes", tab="list"))
+
+# === AJAX Edit Class Route ===
+@bp.route("/edit_class/<code>", methods=["POST"])
+@login_required
+def edit_class(code):
+    cls = Class.query.filter_by(class_code=code).first()
+    if not cls:
+        return jsonify({"status": "error", "message": "Class not found"}), 404
+    data = request.get_json()
+    # Update fields if present in request
+    if "subject" in data:
+        cls.subject = data["subject"].strip()
+    if "year_level" in data:
+        cls.year_level = data["year_level"].strip()
+    if "batch" in data:
+        cls.batch = data["batch"].strip()
+    if "sub_batch" in data:
+        cls.sub_batch = data["sub_batch"].strip()
+    if "class_type" in data:
+        cls.class_type = data["class_type"].strip()
+    if "description" in data:
+        cls.description = data["description"].strip()
+    if "teacher" in data:
+        cls.class_teacher = data["teacher"].strip()
+    if "class_day" in data:
+        cls.class_day = data["class_day"].strip()
+    if "class_time" in data:
+        cls.class_time = data["class_time"].strip()
+    if "class_location" in data:
+        cls.class_location = data["class_location"].strip()
+    if "active" in data:
+        cls.class_status = "active" if data["active"] else "inactive"
+    # Update class_name with sub_batch if available
+    class_name = f"{cls.subject} - {cls.year_level} - {cls.batch}"
+    if cls.sub_batch and cls.sub_batch.strip():
+        class_name += f" - {cls.sub_batch.strip()}"
+    cls.class_name = class_name
+    # Set last_updated to Melbourne time (handles DST)
+    try:
+        melbourne_time = datetime.now(ZoneInfo('Australia/Melbourne'))
+    except Exception:
+        melbourne_time = datetime.utcnow()
+    cls.last_updated = melbourne_time
+    db.session.commit()
+    return jsonify({"status": "success", "message": "Class updated"})
+
+
+
+# New AJAX-friendly API endpoint for Google Classroom linking
+@bp.route("/api/link_google_classroom/<code>", methods=["POST"])
+@login_required
+def api_link_google_classroom(code):
+    cls = Class.query.filter_by(class_code=code).first()
+    if not cls:
+        return jsonify({"status": "error", "message": "Class not found."}), 404
+    data = request.get_json()
+    gclass_name = (data.get("gclass_name") or "").strip()
+    gclass_section = (data.get("gclass_section") or "").strip()
+    if not gclass_name:
+        return jsonify({"status": "error", "message": "Google Classroom name is required."}), 400
+    try:
+        from classroom_utils import create_google_course
+        course_info = create_google_course(
+            course_name=gclass_name,
+            section=gclass_section,
+            room=cls.batch,
+            ownerId=CLASSROOM_OWNER_EMAIL
+        )
+        # Save to GoogleClassroomCourse table
+        integration_account_id = 1  # TODO: Use real integration account selection logic
+        created_by = current_user.id if current_user.is_authenticated else None
+        gclass = GoogleClassroomCourse(
+            course_id=course_info["courseId"],
+            name=gclass_name,
+            section=gclass_section,
+            join_code=course_info["joinCode"],
+            class_id=cls.id,
+            integration_account_id=integration_account_id,
+            created_by=created_by,
+            created_at=datetime.utcnow()
+        )
+        db.session.add(gclass)
+        db.session.commit()
+        return jsonify({
+            "status": "success",
+            "message": f"Google Classroom linked successfully! Join code: {gclass.join_code}",
+            "join_code": gclass.join_code,
+            "course_id": gclass.course_id,
+            "classroom_name": gclass.name,
+            "classroom_section": gclass.section
+        })
+    except Exception as e:
+        print("Google Classroom Error:", e)
+        return jsonify({"status": "error", "message": f"Failed to create Google Classroom: {e}"}), 500
+
+@bp.route("/api/classes", methods=["GET"])
+@login_required
+@conditional('class', 'google_classroom_course')
+def api_classes():
+    return jsonify(class_catalogue())
+
+CLASS_FILTER_FIELDS = ('subject', 'year_level', 'batch', 'class_type')
+CLASS_SORT_FIELDS = ('class_code', 'class_name', 'subject', 'year_level', 'batch', 'class_status',
+                     'class_created', 'updated_at')
+
+@bp.route("/api/classes/search", methods=["GET"])
+@login_required
+@conditional('class', 'google_classroom_course')
+def api_search_classes():
+    """
+    One page of the class catalogue, filtered and sorted in SQL.
+
+    Takes the keyset pagination args (``limit``, ``cursor``, ``sort``), exact
+    filters on ``CLASS_FILTER_FIELDS``, ``status`` (``active`` also matches
+    classes with no status) and ``q``, a substring of code, name or subject.
+    """
+    query = class_catalogue_query().order_by(None)
+    status = request.args.get("status", "").strip()
+    if status == "active":
+        query = query.filter(or_(Class.class_status == "active", Class.class_status.is_(None)))
+    elif status:
+        query = query.filter(Class.class_status == status)
+    search = request.args.get("q", "").strip()
+    if search:
+        pattern = f"%{search}%"
+        query = query.filter(or_(
+            Class.class_code.ilike(pattern), Class.class_name.ilike(pattern), Class.subject.ilike(pattern)
+        ))
+    return paginated_response(
+        query, Class, lambda row: serialize_class(*row),
+        filter_fields=CLASS_FILTER_FIELDS,
+        sort_fields=CLASS_SORT_FIELDS,
+        row_model=lambda row: row[0],
+        with_total=True
+    )
+
+@bp.route("/manage_classes")
+@login_required
+def manage_classes():
+    # The table itself is fetched a page at a time from /api/classes/search
+    return render_template("manage_classes.html", filter_options=class_filter_options())
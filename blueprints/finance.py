@@ -0,0 +1,156 @@
+from datetime import datetime
+
+from flask import Blueprint, request, jsonify
+from flask_login import login_required
+
+from extensions import db
+from http_cache import conditional
+from models import StudentFee, Payment
+from pagination import paginated_response
+
+bp = Blueprint("finance", __name__)
+
+
+# === UPDATED STUDENT FEE API ENDPOINTS ===
+def serialize_fee(f):
+    return {
+        'id': f.id,
+        'student_id': f.student_id,
+        'class_id': f.class_id,
+        'fee_type': f.fee_type,
+        'amount_due': f.amount_due,
+        'amount_paid': f.amount_paid,
+        'discount': f.discount,
+        'due_date': f.due_date.isoformat() if f.due_date else None,
+        'payment_status': f.payment_status,
+        'notes': f.notes
+    }
+
+@bp.route('/api/fees', methods=['GET'])
+@login_required
+@conditional('student_fee')
+def get_fees():
+    return paginated_response(
+        StudentFee.query, StudentFee, serialize_fee,
+        filter_fields=('student_id', 'class_id', 'fee_type', 'payment_status', 'due_date'),
+        sort_fields=('due_date', 'amount_due', 'student_id', 'class_id')
+    )
+
+@bp.route('/api/fees/<int:fee_id>', methods=['GET'])
+@login_required
+def get_fee(fee_id):
+    return jsonify(serialize_fee(StudentFee.query.get_or_404(fee_id)))
+
+@bp.route('/api/fees', methods=['POST'])
+@login_required
+def add_fee():
+    data = request.json
+    due_date = None
+    if data.get('due_date'):
+        try:
+            due_date = datetime.strptime(data['due_date'], '%Y-%m-%d').date()
+        except Exception:
+            due_date = None
+    f = StudentFee(
+        student_id=data['student_id'],
+        class_id=data.get('class_id'),
+        fee_type=data.get('fee_type'),
+        amount_due=data.get('amount_due', 0.0),
+        amount_paid=data.get('amount_paid', 0.0),
+        discount=data.get('discount', 0.0),
+        due_date=due_date,
+        payment_status=data.get('payment_status', 'unpaid'),
+        notes=data.get('notes')
+    )
+    db.session.add(f)
+    db.session.commit()
+    return jsonify({'id': f.id}), 201
+
+@bp.route('/api/fees/<int:fee_id>', methods=['PUT'])
+@login_required
+def update_fee(fee_id):
+    f = StudentFee.query.get_or_404(fee_id)
+    data = request.json
+    for field in ['student_id', 'class_id', 'fee_type', 'amount_due', 'amount_paid', 'discount', 'payment_status', 'notes']:
+        if field in data:
+            setattr(f, field, data[field])
+    # Handle due_date
+    if 'due_date' in data:
+        try:
+            f.due_date = datetime.strptime(data['due_date'], '%Y-%m-%d').date() if data['due_date'] else None
+        except Exception:
+            f.due_date = None
+    db.session.commit()
+    return jsonify({'status': 'success'})
+
+@bp.route('/api/fees/<int:fee_id>', methods=['DELETE'])
+@login_required
+def delete_fee(fee_id):
+    f = StudentFee.query.get_or_404(fee_id)
+    db.session.delete(f)
+    db.session.commit()
+    return jsonify({'status': 'deleted'})
+
+# === PAYMENT API ENDPOINTS ===
+def serialize_payment(p):
+    return {
+        'id': p.id,
+        'student_id': p.student_id,
+        'fee_id': p.fee_id,
+        'amount': p.amount,
+        'date': p.date.isoformat() if p.date else None,
+        'method': p.method,
+        'reference': p.reference,
+        'notes': p.notes
+    }
+
+@bp.route('/api/payments', methods=['GET'])
+@login_required
+@conditional('payment')
+def get_payments():
+    return paginated_response(
+        Payment.query, Payment, serialize_payment,
+        filter_fields=('student_id', 'fee_id', 'method', 'date'),
+        sort_fields=('date', 'amount', 'student_id')
+    )
+
+@bp.route('/api/payments/<int:payment_id>', methods=['GET'])
+@login_required
+def get_payment(payment_id):
+    return jsonify(serialize_payment(Payment.query.get_or_404(payment_id)))
+
+@bp.route('/api/payments', methods=['POST'])
+@login_required
+def add_payment():
+    data = request.json
+    p = Payment(
+        student_id=data['student_id'],
+        fee_id=data.get('fee_id'),
+        amount=data.get('amount', 0.0),
+        date=data.get('date'),
+        method=data.get('method'),
+        reference=data.get('reference'),
+        notes=data.get('notes')
+    )
+    db.session.add(p)
+    db.session.commit()
+    return jsonify({'id': p.id}), 201
+
+@bp.route('/api/payments/<int:payment_id>', methods=['PUT'])
+@login_required
+def update_payment(payment_id):
+    p = Payment.query.get_or_404(payment_id)
+    data = request.json
+    for field in ['student_id', 'fee_id', 'amount', 'date', 'method', 'reference', 'notes']:
+        if field in data:
+            setattr(p, field, data[field])
+    db.session.commit()
+    return jsonify({'status': 'success'})
+
+@bp.route('/api/payments/<int:payment_id>', methods=['DELETE'])
+@login_required
+def delete_payment(payment_id):
+    p = Payment.query.get_or_404(payment_id)
+    db.session.delete(p)
+    db.session.commit()
+    return jsonify({'status': 'deleted'})
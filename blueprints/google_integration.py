@@ -0,0 +1,306 @@
+import json
+import os
+import uuid
+from datetime import datetime
+
+from flask import Blueprint, current_app, render_template, url_for, request, jsonify
+from flask_login import login_required, current_user
+from werkzeug.exceptions import RequestEntityTooLarge
+from werkzeug.utils import secure_filename
+
+from blueprints import admin_required
+from extensions import db
+from http_cache import conditional
+from models import (GoogleClassroomCourse, GoogleIntegrationAccount, GoogleAccountPermissions, UploadJob,
+                    Video, VideoContentHash)
+from pagination import paginated_response
+from reference_data import class_catalogue
+from upload_pipeline import upload_runner, process_upload_job, serialize_upload_job
+
+bp = Blueprint("google", __name__)
+
+
+@bp.route("/upload")
+@login_required
+def upload():
+    # Fetch all classes with their latest GoogleClassroomCourse in one query
+    classes = class_catalogue()
+    return render_template("upload.html", classes=classes)
+
+# === Google Integration Account & Permissions Management (Admin Only) ===
+# --- GoogleIntegrationAccount CRUD ---
+def serialize_google_account(acc):
+    return {
+        'id': acc.id,
+        'account_name': acc.account_name,
+        'google_email': acc.google_email,
+        'owner_user_id': acc.owner_user_id,
+        'created_at': acc.created_at.isoformat() if acc.created_at else None,
+        'last_synced': acc.last_synced.isoformat() if acc.last_synced else None
+    }
+
+@bp.route('/api/google_accounts', methods=['GET'])
+@login_required
+@admin_required
+@conditional('google_integration_account')
+def list_google_accounts():
+    return paginated_response(
+        GoogleIntegrationAccount.query, GoogleIntegrationAccount, serialize_google_account,
+        filter_fields=('owner_user_id', 'google_email', 'created_at', 'last_synced'),
+        sort_fields=('account_name', 'google_email', 'created_at', 'last_synced')
+    )
+
+@bp.route('/api/google_accounts', methods=['POST'])
+@login_required
+@admin_required
+def add_google_account():
+    data = request.json
+    acc = GoogleIntegrationAccount(
+        account_name=data.get('account_name'),
+        google_email=data['google_email'],
+        access_token=data.get('access_token'),
+        refresh_token=data.get('refresh_token'),
+        owner_user_id=data['owner_user_id'],
+        created_at=datetime.utcnow()
+    )
+    db.session.add(acc)
+    db.session.commit()
+    return jsonify({'id': acc.id}), 201
+
+@bp.route('/api/google_accounts/<int:acc_id>', methods=['PUT'])
+@login_required
+@admin_required
+def edit_google_account(acc_id):
+    acc = GoogleIntegrationAccount.query.get_or_404(acc_id)
+    data = request.json
+    for field in ['account_name', 'google_email', 'access_token', 'refresh_token', 'owner_user_id']:
+        if field in data:
+            setattr(acc, field, data[field])
+    db.session.commit()
+    return jsonify({'status': 'success'})
+
+@bp.route('/api/google_accounts/<int:acc_id>', methods=['DELETE'])
+@login_required
+@admin_required
+def delete_google_account(acc_id):
+    acc = GoogleIntegrationAccount.query.get_or_404(acc_id)
+    db.session.delete(acc)
+    db.session.commit()
+    return jsonify({'status': 'deleted'})
+
+# --- GoogleAccountPermissions CRUD ---
+def serialize_google_permission(p):
+    return {
+        'id': p.id,
+        'integration_account_id': p.integration_account_id,
+        'user_id': p.user_id,
+        'permission_level': p.permission_level
+    }
+
+@bp.route('/api/google_permissions', methods=['GET'])
+@login_required
+@admin_required
+@conditional('google_account_permissions')
+def list_google_permissions():
+    return paginated_response(
+        GoogleAccountPermissions.query, GoogleAccountPermissions, serialize_google_permission,
+        filter_fields=('integration_account_id', 'user_id', 'permission_level')
+    )
+
+@bp.route('/api/google_permissions', methods=['POST'])
+@login_required
+@admin_required
+def add_google_permission():
+    data = request.json
+    perm = GoogleAccountPermissions(
+        integration_account_id=data['integration_account_id'],
+        user_id=data['user_id'],
+        permission_level=data.get('permission_level', 'uploader')
+    )
+    db.session.add(perm)
+    db.session.commit()
+    return jsonify({'id': perm.id}), 201
+
+@bp.route('/api/google_permissions/<int:perm_id>', methods=['PUT'])
+@login_required
+@admin_required
+def edit_google_permission(perm_id):
+    perm = GoogleAccountPermissions.query.get_or_404(perm_id)
+    data = request.json
+    for field in ['integration_account_id', 'user_id', 'permission_level']:
+        if field in data:
+            setattr(perm, field, data[field])
+    db.session.commit()
+    return jsonify({'status': 'success'})
+
+@bp.route('/api/google_permissions/<int:perm_id>', methods=['DELETE'])
+@login_required
+@admin_required
+def delete_google_permission(perm_id):
+    perm = GoogleAccountPermissions.query.get_or_404(perm_id)
+    db.session.delete(perm)
+    db.session.commit()
+    return jsonify({'status': 'deleted'})
+
+
+# === Video Upload API ===
+@bp.route("/api/upload_video", methods=["POST"])
+@login_required
+def api_upload_video():
+    print("📡 Received upload request")
+    try:
+        # --- Get form data (the file streams into the spool directory here) ---
+        try:
+            file = request.files.get("file")
+        except RequestEntityTooLarge as e:
+            return jsonify({"status": "error", "message": e.description}), 413
+        class_selected = request.form.get("class_selected")
+        class_name = request.form.get("class_name")
+        title = request.form.get("title")
+        description = request.form.get("description", "")
+        post_to_classroom = request.form.get("post_to_classroom") == "true"
+
+        # --- Validate required fields ---
+        if not file:
+            return jsonify({"status": "error", "message": "No file uploaded."}), 400
+        if not class_selected:
+            return jsonify({"status": "error", "message": "No class selected."}), 400
+        if not title:
+            return jsonify({"status": "error", "message": "No title provided."}), 400
+
+        # --- Find integration_account_id for current user ---
+        integration_account_id = current_user.integration_account_id
+        if not integration_account_id:
+            return jsonify({"status": "error", "message": "No Google integration account permission found for user."}), 400
+
+        job_id = uuid.uuid4().hex
+        spool = file.stream
+        ctx = {"sha256": spool.sha256, "file_size": spool.size}
+
+        # --- Same bytes already on YouTube: reuse that video instead of uploading ---
+        known = None
+        if request.form.get("force_upload") != "true":
+            known = VideoContentHash.query.filter_by(sha256=spool.sha256).first()
+        if known:
+            print(f"♻️ Duplicate upload of {known.video_id}, skipping YouTube upload")
+            ctx.update(
+                video_id=known.video_id,
+                video_url=f"https://www.youtube.com/watch?v={known.video_id}",
+                deduplicated=True,
+                completed=["youtube_upload"]
+            )
+            file_path = spool.path  # discarded at teardown, nothing to upload
+        else:
+            # --- Keep the spooled file under the job id ---
+            try:
+                extension = os.path.splitext(secure_filename(file.filename or ""))[1]
+                file_path = spool.claim(f"{job_id}{extension}")
+            except Exception as e:
+                print("[UPLOAD ERROR] File save failed:", e)
+                return jsonify({"status": "error", "message": f"Failed to save file: {e}"}), 500
+
+        # --- Queue the YouTube / playlist / DB / Classroom stages ---
+        job = UploadJob(
+            id=job_id,
+            status="queued",
+            file_path=file_path,
+            title=title,
+            description=description,
+            class_code=class_selected,
+            class_name=class_name,
+            post_to_classroom=post_to_classroom,
+            integration_account_id=integration_account_id,
+            uploaded_by=current_user.id,
+            context=json.dumps(ctx),
+            created_at=datetime.utcnow(),
+            updated_at=datetime.utcnow()
+        )
+        db.session.add(job)
+        db.session.commit()
+        upload_runner.submit(process_upload_job, current_app._get_current_object(), job_id)
+
+        return jsonify({
+            "status": "queued",
+            "job_id": job_id,
+            "deduplicated": bool(known),
+            "status_url": url_for("google.api_upload_job_status", job_id=job_id)
+        }), 202
+
+    except Exception as e:
+        print("[GENERAL UPLOAD ERROR]", e)
+        return jsonify({"status": "error", "message": f"Unexpected error: {e}"}), 500
+
+
+@bp.route("/api/upload_jobs/<job_id>", methods=["GET"])
+@login_required
+def api_upload_job_status(job_id):
+    job = UploadJob.query.get_or_404(job_id)
+    return jsonify(serialize_upload_job(job))
+
+@bp.route("/api/upload_jobs/<job_id>/retry", methods=["POST"])
+@login_required
+def api_retry_upload_job(job_id):
+    job = UploadJob.query.get_or_404(job_id)
+    if job.status != "error":
+        return jsonify({"status": "error", "message": f"Job is {job.status}, only failed jobs can be retried."}), 409
+    job.status = "queued"
+    job.error = None
+    job.updated_at = datetime.utcnow()
+    db.session.commit()
+    # Completed stages are skipped, so the retry resumes at the failed stage
+    upload_runner.submit(process_upload_job, current_app._get_current_object(), job_id)
+    return jsonify({"status": "queued", "job_id": job_id}), 202
+
+@bp.route("/post_video_to_classroom/<video_id>", methods=["POST"])
+@login_required
+def post_video_to_classroom(video_id):
+    """
+    Announce a video in Google Classroom.
+
+    Posts to the ``course_ids`` given in the JSON body, or else to every
+    course linked to the video's class, as one batch of API calls.
+    """
+    try:
+        # 📂 Load video from DB
+        video = Video.query.filter_by(video_id=video_id).first()
+        if not video:
+            return jsonify({"status": "error", "message": "Video not found"}), 404
+
+        # 📘 Courses to post to
+        data = request.get_json(silent=True) or {}
+        course_ids = data.get("course_ids")
+        if not course_ids:
+            course_ids = [course_id for (course_id,) in db.session.query(GoogleClassroomCourse.course_id).filter(
+                GoogleClassroomCourse.class_id == video.class_id,
+                GoogleClassroomCourse.course_id.isnot(None)
+            )] if video.class_id else []
+        if not course_ids:
+            return jsonify({"status": "error", "message": "Class not linked to Classroom"}), 400
+
+        # 📢 Post to Classroom streams
+        from classroom_utils import post_announcements
+        video_url = f"https://www.youtube.com/watch?v={video.video_id}"
+        announcement = {
+            "text": f"📽️ Video: *{video.title}*\nWatch: {video_url}",
+            "materials": [{"youtubeVideo": {"id": video.video_id}}]
+        }
+        errors = post_announcements(course_ids, announcement)
+        failed = {course_id: str(e) for course_id, e in errors.items() if e is not None}
+        if len(failed) == len(course_ids):
+            return jsonify({"status": "error", "message": "; ".join(failed.values()), "failed": failed}), 502
+
+        # ✅ Update post status
+        video.classroom_posted = True
+        db.session.commit()
+        print("✅ Updating classroom_posted for:", video.id)
+
+        posted = len(course_ids) - len(failed)
+        return jsonify({
+            "status": "success",
+            "message": f"Posted to {posted} Classroom course(s) successfully.",
+            "failed": failed
+        })
+    except Exception as e:
+        db.session.rollback()
+        print("Classroom post error:", e)
+        return jsonify({"status": "error", "message": str(e)}), 500
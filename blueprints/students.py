@@ -0,0 +1,515 @@
+from datetime import datetime
+
+from flask import Blueprint, Response, render_template, request, jsonify
+from flask_login import login_required, current_user
+
+from database import upsert_insert
+from extensions import db
+from http_cache import conditional
+from models import Student, Parent, StudentClassAssignment, Attendance, Class
+from pagination import paginated_response
+from student_codes import allocate_student_codes
+from student_import import ImportFormatError, StudentImport, error_report_csv, iter_import_rows
+
+bp = Blueprint("students", __name__)
+
+
+# === STUDENT API ENDPOINTS ===
+STUDENTS_PER_PAGE = 50
+MAX_STUDENTS_PER_PAGE = 200
+
+
+@bp.route('/manage_students')
+@login_required
+def manage_students():
+    page = request.args.get('page', 1, type=int)
+    per_page = min(request.args.get('per_page', STUDENTS_PER_PAGE, type=int), MAX_STUDENTS_PER_PAGE)
+    # Fetch one page of students
+    pagination = Student.query.order_by(Student.id).paginate(page=page, per_page=per_page, error_out=False)
+    students = pagination.items
+    # Fetch the class assignments for the whole page in a single joined query
+    assignments_by_student = {}
+    if students:
+        rows = (
+            db.session.query(StudentClassAssignment.student_id, StudentClassAssignment.enrolled_from, Class.class_name)
+            .outerjoin(Class, Class.id == StudentClassAssignment.class_id)
+            .filter(StudentClassAssignment.student_id.in_([s.id for s in students]))
+            .order_by(StudentClassAssignment.id)
+            .all()
+        )
+        for student_id, enrolled_from, class_name in rows:
+            assignments_by_student.setdefault(student_id, []).append({
+                "class_name": class_name or "Unknown",
+                "enrolled_date": enrolled_from.isoformat() if enrolled_from else ""
+            })
+    # Build student data with class assignments
+    student_list = [
+        {
+            "id": s.id,
+            "student_id": s.student_code,
+            "first_name": s.first_name,
+            "last_name": s.last_name,
+            "gender": s.gender,
+            "status": s.status,
+            "class_assignments": assignments_by_student.get(s.id, [])
+        } for s in students
+    ]
+    # Build class list for dropdowns (only the columns the form needs)
+    class_dropdown = [
+        {"code": code, "class_name": name}
+        for code, name in db.session.query(Class.class_code, Class.class_name).order_by(Class.class_name)
+    ]
+    return render_template('manage_students.html', students=student_list, classes=class_dropdown, pagination=pagination)
+
+
+def serialize_student(s):
+    return {
+        'id': s.id,
+        'student_code': s.student_code,
+        'first_name': s.first_name,
+        'last_name': s.last_name,
+        'dob': s.dob.isoformat() if s.dob else None,
+        'gender': s.gender,
+        'contact_number': s.contact_number,
+        'grade_school': s.grade_school,
+        'student_email': s.student_email,
+        'address': s.address,
+        'notes': s.notes,
+        'status': s.status
+    }
+
+
+@bp.route('/api/students', methods=['GET'])
+@login_required
+@conditional('student')
+def get_students():
+    return paginated_response(
+        Student.query, Student, serialize_student,
+        filter_fields=('student_code', 'status', 'gender', 'grade_school', 'created_at'),
+        sort_fields=('student_code', 'first_name', 'last_name', 'created_at')
+    )
+
+
+@bp.route('/api/students/<int:student_id>', methods=['GET'])
+@login_required
+def get_student(student_id):
+    return jsonify(serialize_student(Student.query.get_or_404(student_id)))
+
+
+@bp.route('/api/students', methods=['POST'])
+@login_required
+def add_student():
+    data = request.json
+    # Generate unique student_code in format STU-YYYY-NNNN
+    student_code = allocate_student_codes(1)[0]
+    dob_val = data.get('dob')
+    dob_obj = None
+    if dob_val:
+        try:
+            dob_obj = datetime.strptime(dob_val, '%Y-%m-%d').date()
+        except Exception:
+            dob_obj = None
+    s = Student(
+        student_code=student_code,
+        first_name=data['first_name'],
+        last_name=data['last_name'],
+        dob=dob_obj,
+        gender=data.get('gender'),
+        contact_number=data.get('contact_number'),
+        grade_school=data.get('grade_school'),
+        student_email=data.get('student_email'),
+        address=data.get('address'),
+        notes=data.get('notes'),
+        status=data.get('status', 'active')
+    )
+    db.session.add(s)
+    db.session.commit()
+    return jsonify({'id': s.id, 'student_code': s.student_code}), 201
+
+
+@bp.route('/api/students/import', methods=['POST'])
+@login_required
+def import_students():
+    """
+    Import students (with an optional parent and class assignment per row)
+    from an uploaded CSV/XLSX ``file``. ``dry_run=true`` only validates;
+    ``format=csv`` returns the rejected rows as a CSV error report.
+    """
+    upload = request.files.get('file')
+    if not upload or not upload.filename:
+        return jsonify({'status': 'error', 'message': 'No file uploaded.'}), 400
+    dry_run = request.form.get('dry_run', '').lower() in ('1', 'true', 'yes', 'on')
+    importer = StudentImport(dry_run=dry_run, updated_by=current_user.id)
+    try:
+        report = importer.run(iter_import_rows(upload.stream, upload.filename))
+        if dry_run:
+            db.session.rollback()
+        else:
+            db.session.commit()
+    except ImportFormatError as e:
+        db.session.rollback()
+        return jsonify({'status': 'error', 'message': str(e)}), 400
+    except Exception as e:
+        db.session.rollback()
+        print("[STUDENT IMPORT ERROR]", e)
+        return jsonify({'status': 'error', 'message': f'Import failed, nothing was saved: {e}'}), 500
+
+    if request.args.get('format') == 'csv':
+        return Response(
+            error_report_csv(report), mimetype='text/csv',
+            headers={'Content-Disposition': 'attachment; filename=student_import_errors.csv'}
+        )
+    return jsonify(dict(report, status='success'))
+
+
+@bp.route('/api/students/<int:student_id>', methods=['PUT'])
+@login_required
+def update_student(student_id):
+    s = Student.query.get_or_404(student_id)
+    data = request.json
+    for field in ['first_name', 'last_name', 'dob', 'gender', 'contact_number', 'grade_school', 'student_email', 'address', 'notes', 'status']:
+        if field in data:
+            setattr(s, field, data[field])
+    db.session.commit()
+    return jsonify({'status': 'success'})
+
+
+@bp.route('/api/students/<int:student_id>', methods=['DELETE'])
+@login_required
+def delete_student(student_id):
+    s = Student.query.get_or_404(student_id)
+    db.session.delete(s)
+    db.session.commit()
+    return jsonify({'status': 'deleted'})
+
+
+# === UPDATED PARENT API ENDPOINTS ===
+def serialize_parent(p):
+    return {
+        'id': p.id,
+        'student_id': p.student_id,
+        'name': p.name,
+        'relationship': p.relationship,
+        'contact_number': p.contact_number,
+        'parent_email': p.parent_email
+    }
+
+@bp.route('/api/parents', methods=['GET'])
+@login_required
+@conditional('parent')
+def get_parents():
+    return paginated_response(
+        Parent.query, Parent, serialize_parent,
+        filter_fields=('student_id', 'relationship', 'parent_email'),
+        sort_fields=('name', 'student_id')
+    )
+
+@bp.route('/api/parents/<int:parent_id>', methods=['GET'])
+@login_required
+def get_parent(parent_id):
+    return jsonify(serialize_parent(Parent.query.get_or_404(parent_id)))
+
+@bp.route('/api/parents', methods=['POST'])
+@login_required
+def add_parent():
+    data = request.json
+    p = Parent(
+        student_id=data['student_id'],
+        name=data['name'],
+        relationship=data.get('relationship'),
+        contact_number=data.get('contact_number'),
+        parent_email=data.get('parent_email')
+    )
+    db.session.add(p)
+    db.session.commit()
+    return jsonify({'id': p.id}), 201
+
+@bp.route('/api/parents/<int:parent_id>', methods=['PUT'])
+@login_required
+def update_parent(parent_id):
+    p = Parent.query.get_or_404(parent_id)
+    data = request.json
+    for field in ['name', 'relationship', 'contact_number', 'parent_email']:
+        if field in data:
+            setattr(p, field, data[field])
+    db.session.commit()
+    return jsonify({'status': 'success'})
+
+@bp.route('/api/parents/<int:parent_id>', methods=['DELETE'])
+@login_required
+def delete_parent(parent_id):
+    p = Parent.query.get_or_404(parent_id)
+    db.session.delete(p)
+    db.session.commit()
+    return jsonify({'status': 'deleted'})
+
+
+# === UPDATED STUDENT CLASS ASSIGNMENT API ENDPOINTS ===
+def serialize_assignment(a):
+    return {
+        'id': a.id,
+        'student_id': a.student_id,
+        'class_id': a.class_id,
+        'enrolled_from': a.enrolled_from.isoformat() if a.enrolled_from else None,
+        'enrolled_to': a.enrolled_to.isoformat() if a.enrolled_to else None,
+        'is_primary': a.is_primary
+    }
+
+@bp.route('/api/assignments', methods=['GET'])
+@login_required
+@conditional('student_class_assignment')
+def get_assignments():
+    return paginated_response(
+        StudentClassAssignment.query, StudentClassAssignment, serialize_assignment,
+        filter_fields=('student_id', 'class_id', 'is_primary', 'enrolled_from', 'enrolled_to'),
+        sort_fields=('enrolled_from', 'enrolled_to', 'student_id', 'class_id')
+    )
+
+@bp.route('/api/assignments/<int:assignment_id>', methods=['GET'])
+@login_required
+def get_assignment(assignment_id):
+    return jsonify(serialize_assignment(StudentClassAssignment.query.get_or_404(assignment_id)))
+
+@bp.route('/api/assignments', methods=['POST'])
+@login_required
+def add_assignment():
+    data = request.json
+    enrolled_from = None
+    enrolled_to = None
+    if data.get('enrolled_from'):
+        try:
+            enrolled_from = datetime.strptime(data['enrolled_from'], '%Y-%m-%d').date()
+        except Exception:
+            enrolled_from = None
+    if data.get('enrolled_to'):
+        try:
+            enrolled_to = datetime.strptime(data['enrolled_to'], '%Y-%m-%d').date()
+        except Exception:
+            enrolled_to = None
+    a = StudentClassAssignment(
+        student_id=data['student_id'],
+        class_id=data['class_id'],
+        enrolled_from=enrolled_from,
+        enrolled_to=enrolled_to,
+        is_primary=data.get('is_primary', False)
+    )
+    db.session.add(a)
+    db.session.commit()
+    return jsonify({'id': a.id}), 201
+
+@bp.route('/api/assignments/<int:assignment_id>', methods=['PUT'])
+@login_required
+def update_assignment(assignment_id):
+    a = StudentClassAssignment.query.get_or_404(assignment_id)
+    data = request.json
+    for field in ['student_id', 'class_id', 'is_primary']:
+        if field in data:
+            setattr(a, field, data[field])
+    # Handle date fields
+    if 'enrolled_from' in data:
+        try:
+            a.enrolled_from = datetime.strptime(data['enrolled_from'], '%Y-%m-%d').date() if data['enrolled_from'] else None
+        except Exception:
+            a.enrolled_from = None
+    if 'enrolled_to' in data:
+        try:
+            a.enrolled_to = datetime.strptime(data['enrolled_to'], '%Y-%m-%d').date() if data['enrolled_to'] else None
+        except Exception:
+            a.enrolled_to = None
+    db.session.commit()
+    return jsonify({'status': 'success'})
+
+@bp.route('/api/assignments/<int:assignment_id>', methods=['DELETE'])
+@login_required
+def delete_assignment(assignment_id):
+    a = StudentClassAssignment.query.get_or_404(assignment_id)
+    db.session.delete(a)
+    db.session.commit()
+    return jsonify({'status': 'deleted'})
+
+
+# === ATTENDANCE API ENDPOINTS ===
+def serialize_attendance(a):
+    return {
+        'id': a.id,
+        'student_id': a.student_id,
+        'class_id': a.class_id,
+        'date': a.date.isoformat() if a.date else None,
+        'status': a.status,
+        'notes': a.notes
+    }
+
+@bp.route('/api/attendance', methods=['GET'])
+@login_required
+@conditional('attendance')
+def get_attendance():
+    return paginated_response(
+        Attendance.query, Attendance, serialize_attendance,
+        filter_fields=('student_id', 'class_id', 'date', 'status'),
+        sort_fields=('date', 'student_id', 'class_id')
+    )
+
+@bp.route('/api/attendance/<int:attendance_id>', methods=['GET'])
+@login_required
+def get_attendance_record(attendance_id):
+    return jsonify(serialize_attendance(Attendance.query.get_or_404(attendance_id)))
+
+MAX_ATTENDANCE_ENTRIES = 500
+
+
+def parse_attendance_date(value):
+    try:
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_class_id(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def upsert_attendance(class_id, on_date, entries):
+    """
+    Record ``entries`` (``{student_id, status, notes}``) for one class session.
+
+    Rows are written with a single INSERT .. ON CONFLICT statement keyed on
+    (student_id, class_id, date), so re-submitting a roll updates marks in
+    place. Returns one result per entry, in order; invalid entries are
+    reported and skipped. The caller commits.
+    """
+    student_ids = set()
+    for entry in entries:
+        try:
+            student_ids.add(int(entry.get('student_id')))
+        except (AttributeError, TypeError, ValueError):
+            pass
+    known = {sid for (sid,) in db.session.query(Student.id).filter(Student.id.in_(student_ids))}
+    existing = {
+        a.student_id: a for a in Attendance.query.filter(
+            Attendance.class_id == class_id,
+            Attendance.date == on_date,
+            Attendance.student_id.in_(student_ids)
+        )
+    }
+
+    now = datetime.utcnow()
+    results, rows = [], {}
+    for entry in entries:
+        try:
+            student_id = int(entry.get('student_id'))
+        except (AttributeError, TypeError, ValueError):
+            results.append({'student_id': None, 'result': 'error', 'message': 'student_id is required'})
+            continue
+        result = {'student_id': student_id}
+        results.append(result)
+        if student_id not in known:
+            result.update(result='error', message='Unknown student')
+        elif student_id in rows:
+            result.update(result='error', message='Duplicate entry for student')
+        elif not entry.get('status'):
+            result.update(result='error', message='status is required')
+        else:
+            current = existing.get(student_id)
+            notes = entry.get('notes')
+            if current is not None and current.status == entry['status'] and current.notes == notes:
+                result.update(result='unchanged', id=current.id)
+                continue
+            result['result'] = 'created' if current is None else 'updated'
+            rows[student_id] = {
+                'student_id': student_id,
+                'class_id': class_id,
+                'date': on_date,
+                'status': entry['status'],
+                'notes': notes,
+                'updated_by': current_user.id,
+                'updated_at': now
+            }
+
+    if rows:
+        stmt = upsert_insert(db.session, Attendance).values(list(rows.values()))
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['student_id', 'class_id', 'date'],
+            set_={col: stmt.excluded[col] for col in ('status', 'notes', 'updated_by', 'updated_at')}
+        ).returning(Attendance.id, Attendance.student_id)
+        ids = {sid: aid for aid, sid in db.session.execute(stmt)}
+        for result in results:
+            if result['result'] in ('created', 'updated'):
+                result['id'] = ids.get(result['student_id'])
+    return results
+
+
+@bp.route('/api/attendance', methods=['POST'])
+@login_required
+def add_attendance():
+    data = request.json
+    on_date = parse_attendance_date(data.get('date'))
+    class_id = parse_class_id(data.get('class_id'))
+    if not class_id or not on_date:
+        return jsonify({'status': 'error', 'message': 'class_id and date (YYYY-MM-DD) are required'}), 400
+    if not db.session.get(Class, class_id):
+        return jsonify({'status': 'error', 'message': 'Class not found'}), 404
+    result = upsert_attendance(class_id, on_date, [data])[0]
+    if result['result'] == 'error':
+        return jsonify({'status': 'error', 'message': result['message']}), 400
+    db.session.commit()
+    return jsonify({'id': result['id']}), 201 if result['result'] == 'created' else 200
+
+@bp.route('/api/attendance/bulk', methods=['POST'])
+@login_required
+def bulk_attendance():
+    """Mark a whole class session in one request: ``{class_id, date, entries: [...]}``."""
+    data = request.get_json(silent=True) or {}
+    on_date = parse_attendance_date(data.get('date'))
+    entries = data.get('entries')
+    class_id = parse_class_id(data.get('class_id'))
+    if not class_id or not on_date:
+        return jsonify({'status': 'error', 'message': 'class_id and date (YYYY-MM-DD) are required'}), 400
+    if not isinstance(entries, list) or not entries:
+        return jsonify({'status': 'error', 'message': 'entries must be a non-empty list'}), 400
+    if len(entries) > MAX_ATTENDANCE_ENTRIES:
+        return jsonify({'status': 'error', 'message': f'At most {MAX_ATTENDANCE_ENTRIES} entries per request'}), 400
+    if not db.session.get(Class, class_id):
+        return jsonify({'status': 'error', 'message': 'Class not found'}), 404
+    try:
+        results = upsert_attendance(class_id, on_date, entries)
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        print("[ATTENDANCE BULK ERROR]", e)
+        return jsonify({'status': 'error', 'message': str(e)}), 500
+    counts = {}
+    for result in results:
+        counts[result['result']] = counts.get(result['result'], 0) + 1
+    return jsonify({
+        'status': 'success',
+        'class_id': class_id,
+        'date': on_date.isoformat(),
+        'counts': counts,
+        'results': results
+    })
+
+@bp.route('/api/attendance/<int:attendance_id>', methods=['PUT'])
+@login_required
+def update_attendance(attendance_id):
+    a = Attendance.query.get_or_404(attendance_id)
+    data = request.json
+    for field in ['student_id', 'class_id', 'status', 'notes']:
+        if field in data:
+            setattr(a, field, data[field])
+    if 'date' in data:
+        a.date = parse_attendance_date(data['date'])
+    a.updated_by = current_user.id
+    a.updated_at = datetime.utcnow()
+    db.session.commit()
+    return jsonify({'status': 'success'})
+
+@bp.route('/api/attendance/<int:attendance_id>', methods=['DELETE'])
+@login_required
+def delete_attendance(attendance_id):
+    a = Attendance.query.get_or_404(attendance_id)
+    db.session.delete(a)
+    db.session.commit()
+    return jsonify({'status': 'deleted'})
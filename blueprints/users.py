@@ -0,0 +1,131 @@
+from flask import Blueprint, render_template, redirect, url_for, request, flash, jsonify
+from flask_login import login_user, logout_user, login_required
+
+from extensions import db, login_manager
+from models import UserAccount
+from reference_data import google_accounts
+from user_identity import load_identity
+
+bp = Blueprint("users", __name__)
+
+
+# --- User Management Routes ---
+@bp.route('/users')
+def users():
+    user_list = UserAccount.query.all()
+    return render_template('manage_users.html', users=user_list, google_accounts=google_accounts())
+
+@bp.route('/add_user', methods=['POST'])
+def add_user():
+    data = request.form
+    user = UserAccount(
+        username=data['username'],
+        email=data['email'],
+        role=data.get('role', 'user'),
+        active=True
+    )
+    user.set_password(data['password'])
+    db.session.add(user)
+    db.session.commit()
+    flash('User added successfully!', 'success')
+    return redirect(url_for('users.users'))
+
+@bp.route('/edit_user/<int:id>', methods=['POST'])
+def edit_user(id):
+    user = UserAccount.query.get_or_404(id)
+    data = request.form
+    user.username = data['username']
+    user.email = data['email']
+    user.role = data.get('role', user.role)
+    user.active = 'active' in data
+    db.session.commit()
+    flash('User updated successfully!', 'success')
+    return redirect(url_for('users.users'))
+
+@bp.route('/delete_user/<int:id>', methods=['POST'])
+def delete_user(id):
+    user = UserAccount.query.get_or_404(id)
+    user.active = False
+    db.session.commit()
+    flash('User deactivated.', 'info')
+    return redirect(url_for('users.users'))
+
+# Deactivate User Route
+@bp.route('/deactivate_user/<int:id>', methods=['POST'])
+def deactivate_user(id):
+    user = UserAccount.query.get_or_404(id)
+    user.active = False
+    db.session.commit()
+    flash('User deactivated.', 'info')
+    return redirect(url_for('users.users'))
+
+@bp.route('/change_password/<int:id>', methods=['POST'])
+def change_password(id):
+    user = UserAccount.query.get_or_404(id)
+    data = request.form
+    new_password = data['new_password']
+    user.set_password(new_password)
+    db.session.commit()
+    flash('Password changed successfully!', 'success')
+    return redirect(url_for('users.users'))
+
+# === Login Setup ===
+@login_manager.user_loader
+def load_user(user_id):
+    # Cached per worker (see user_identity.py); a deactivated user is logged out
+    identity = load_identity(int(user_id))
+    return identity if identity is not None and identity.is_active else None
+
+# === Routes ===
+
+@bp.app_errorhandler(401)
+def unauthorized(e):
+    if request.headers.get("X-Requested-With") == "XMLHttpRequest":
+        return jsonify({"status": "error", "message": "Unauthorized"}), 401
+    return redirect(url_for("users.login"))
+
+@bp.route("/")
+def home():
+    return redirect(url_for("users.login"))
+
+@bp.route("/login", methods=["GET", "POST"])
+def login():
+    error = None
+    if request.method == "POST":
+        try:
+            username = request.form.get("username")
+            password = request.form.get("password")
+            user = UserAccount.query.filter_by(username=username).first()
+            # Defensive checks for user existence, active status, and password hash
+            if user is not None and user.active and hasattr(user, 'password_hash') and user.password_hash:
+                if user.check_password(password):
+                    if user.password_needs_rehash():
+                        # Only now is the password at hand to re-hash with the current PASSWORD_HASH_METHOD
+                        user.set_password(password)
+                        db.session.commit()
+                    login_user(user)
+                    return redirect(url_for("users.dashboard"))
+                else:
+                    error = "Invalid username or password"
+            else:
+                error = "Invalid username or password"
+        except Exception as e:
+            print(f"[LOGIN ERROR] {e}")
+            error = "An unexpected error occurred. Please try again."
+    return render_template("login.html", error=error)
+
+@bp.route("/logout")
+@login_required
+def logout():
+    logout_user()
+    return redirect(url_for("users.login"))
+
+@bp.route("/dashboard")
+@login_required
+def dashboard():
+    return render_template("dashboard.html")
+
+@bp.route("/ping", methods=["GET"])
+def ping():
+    print("✅ Ping received")
+    return "pong"
@@ -2,7 +2,7 @@ import os
 import pickle
 from google.auth.transport.requests import Request
 from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
+from google_clients import get_service
 
 SCOPES = [
     "https://www.googleapis.com/auth/classroom.courses",
@@ -14,8 +14,8 @@ SCOPES = [
 CREDENTIALS_FILE = os.environ.get("GOOGLE_CREDENTIALS_FILE", "config/webportal_credentials.json")
 TOKEN_FILE = os.environ.get("CLASSROOM_TOKEN_FILE", "config/classroom_token.pickle")
 
-def get_classroom_service():
-    """Authenticate and return a Classroom API service instance."""
+def load_credentials():
+    """Load Classroom credentials from the token file, refreshing or re-authorising as needed."""
     creds = None
 
     # 🔄 Load and refresh token if available
@@ -41,4 +41,8 @@ def get_classroom_service():
         with open(TOKEN_FILE, "wb") as token:
             pickle.dump(creds, token)
 
-    return build("classroom", "v1", credentials=creds)
+    return creds
+
+def get_classroom_service():
+    """Return the process-wide Classroom API service instance."""
+    return get_service("classroom", "v1", TOKEN_FILE, load_credentials)
@@ -1,8 +1,7 @@
 from classroom_auth import get_classroom_service
+from google_batch import BatchQueue
 
 def create_google_course(course_name, section=None, room=None, ownerId=None):
-    service = get_classroom_service()
-
     course = {
         "name": course_name,
         "section": section,
@@ -12,15 +11,49 @@ def create_google_course(course_name, section=None, room=None, ownerId=None):
     if ownerId:
         course["ownerId"] = ownerId  # ✅ Required when using a service account
 
-    created = service.courses().create(body=course).execute()
+    result = create_google_courses([course])[0]
+    if isinstance(result, Exception):
+        raise result
+    return result
 
-    # Join code often isn't available immediately—fetch full object
-    full = service.courses().get(id=created["id"]).execute()
-    joinCode = full.get("enrollmentCode", "")
+def create_google_courses(courses):
+    """
+    Create several courses with one batch of creates and one batch of gets.
 
-    return {
-        "courseId": created["id"],
-        "joinCode": joinCode,
-        "name": created["name"]
-    }
+    Returns one item per input course, in order: the ``{"courseId", "joinCode",
+    "name"}`` dict, or the exception that stopped that course being created.
+    """
+    service = get_classroom_service()
+    results = [None] * len(courses)
+    creates = BatchQueue(service)
+    for index, course in enumerate(courses):
+        creates.add(service.courses().create(body=course), request_id=index)
 
+    gets = BatchQueue(service)
+    for request_id, (created, error) in creates.flush().items():
+        index = int(request_id)
+        if error is not None:
+            results[index] = error
+            continue
+        results[index] = {
+            "courseId": created["id"],
+            "joinCode": created.get("enrollmentCode", ""),
+            "name": created["name"]
+        }
+        if not results[index]["joinCode"]:
+            # Join code often isn't available immediately—fetch full object
+            gets.add(service.courses().get(id=created["id"], fields="enrollmentCode"), request_id=index)
+
+    for request_id, (full, error) in gets.flush().items():
+        if error is None:
+            results[int(request_id)]["joinCode"] = full.get("enrollmentCode", "")
+    return results
+
+def post_announcements(course_ids, announcement):
+    """Post the same announcement to every course in batches; returns ``{course_id: error or None}``."""
+    service = get_classroom_service()
+    queue = BatchQueue(service)
+    for course_id in course_ids:
+        queue.add(service.courses().announcements().create(courseId=course_id, body=announcement),
+                  request_id=course_id)
+    return {course_id: result.exception for course_id, result in queue.flush().items()}
@@ -16,6 +16,50 @@ class Config:
     # Database
     DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///SciMindMain.db")
 
+    # SQLite: pragmas applied to every new connection (see database.py)
+    SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "WAL")
+    SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")
+    SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", 15000))
+    SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", 256 * 1024 ** 2))
+
+    # PostgreSQL: QueuePool sizing, per process
+    DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", 5))
+    DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", 10))
+    DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", 30))
+    DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", 1800))
+    DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "True").lower() == "true"
+
+    # HTTP: conditional GETs and response compression (see http_cache.py)
+    ETAG_SALT = os.getenv("ETAG_SALT", os.getenv("RENDER_GIT_COMMIT", ""))
+    COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", 1024))
+    COMPRESS_LEVEL = int(os.getenv("COMPRESS_LEVEL", 6))
+    COMPRESS_BROTLI_QUALITY = int(os.getenv("COMPRESS_BROTLI_QUALITY", 5))
+    COMPRESS_MIMETYPES = {"application/json", "text/html", "text/css", "text/javascript", "text/csv"}
+
+    # Reference-data read cache (see read_cache.py); a TTL of 0 disables it.
+    # "database" shares invalidation through table_version, "file" through
+    # stamp files in READ_CACHE_DIR (one host), "local" not at all.
+    READ_CACHE_BACKEND = os.getenv("READ_CACHE_BACKEND", "database")
+    READ_CACHE_DIR = os.getenv(
+        "READ_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "cache_versions")
+    )
+    READ_CACHE_TTL = int(os.getenv("READ_CACHE_TTL", 300))
+    READ_CACHE_MAX_ENTRIES = int(os.getenv("READ_CACHE_MAX_ENTRIES", 256))
+    # Logged-in user and permissions (see user_identity.py). "file" costs no
+    # query per request and every worker on the host sees a demotion or
+    # deactivation at once; use "database" when workers span several hosts.
+    # "local" is only safe with a single worker: the others would keep
+    # serving the old role for up to USER_CACHE_TTL seconds.
+    USER_CACHE_BACKEND = os.getenv("USER_CACHE_BACKEND", "file")
+    USER_CACHE_TTL = int(os.getenv("USER_CACHE_TTL", 30))
+    USER_CACHE_MAX_ENTRIES = int(os.getenv("USER_CACHE_MAX_ENTRIES", 1024))
+
+    # Password hashing (see passwords.py): a Werkzeug method such as
+    # "scrypt:32768:8:1" (the default), "scrypt:16384:8:1" or
+    # "pbkdf2:sha256:600000". Hashes made with other settings are upgraded at
+    # the user's next login; bench_passwords.py compares logins/s per core.
+    PASSWORD_HASH_METHOD = os.getenv("PASSWORD_HASH_METHOD", "scrypt:32768:8:1")
+
     # Google API credentials
     GOOGLE_CLIENT_ID = os.getenv("GOOGLE_CLIENT_ID")
     GOOGLE_CLIENT_SECRET = os.getenv("GOOGLE_CLIENT_SECRET")
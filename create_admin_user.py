@@ -1,5 +1,9 @@
 
-from app import app, db, UserAccount
+from app import create_app
+from extensions import db
+from models import UserAccount
+
+app = create_app()
 
 def create_admin():
     username = "pobakara"
@@ -0,0 +1,10 @@
+from flask_login import LoginManager
+from flask_migrate import Migrate
+from flask_sqlalchemy import SQLAlchemy
+
+# Created unbound so models and blueprints can import them before an app
+# exists; create_app() attaches them with init_app().
+db = SQLAlchemy()
+migrate = Migrate()
+login_manager = LoginManager()
+login_manager.login_view = "users.login"
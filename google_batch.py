@@ -0,0 +1,105 @@
+import os
+import time
+from collections import namedtuple
+
+from google_quota import (QuotaExhausted, api_name, backoff_delay, charge, get_limiter, is_idempotent,
+                          is_retryable, record_failure)
+
+# Google's batch endpoints accept up to 1000 calls, but Classroom and YouTube
+# start rejecting or throttling well before that; 50 is the documented safe size.
+MAX_BATCH_SIZE = int(os.environ.get("GOOGLE_BATCH_SIZE", "50"))
+BATCH_RETRIES = int(os.environ.get("GOOGLE_BATCH_RETRIES", "3"))
+BATCH_BACKOFF_SECONDS = 1.0
+
+BatchResult = namedtuple("BatchResult", "response exception")
+
+
+class BatchQueue:
+    """
+    Collect ``googleapiclient`` requests for one service and send them as HTTP batches.
+
+    ``add(request, callback)`` only enqueues; ``flush()`` sends the queue in
+    batches of at most ``batch_size`` calls, then re-sends just the calls that
+    failed with a retryable error (see google_quota.is_retryable; creates are
+    only re-sent when throttled), with jittered exponential backoff, up to
+    ``retries`` times. Each call's ``callback(request_id, response, exception)``
+    fires once with its final outcome, and ``flush()`` returns
+    ``{request_id: BatchResult}`` for everything sent. Every call in a batch
+    is charged to its API's limiter in google_quota.py, as a single request is.
+    """
+
+    def __init__(self, service, batch_size=MAX_BATCH_SIZE, retries=BATCH_RETRIES,
+                 backoff=BATCH_BACKOFF_SECONDS, sleep=time.sleep):
+        self.service = service
+        self.batch_size = max(1, min(batch_size, 1000))
+        self.retries = retries
+        self.backoff = backoff
+        self.sleep = sleep
+        self.pending = []
+        self.counter = 0
+
+    def __len__(self):
+        return len(self.pending)
+
+    def add(self, request, callback=None, request_id=None):
+        """Enqueue ``request`` (an unexecuted HttpRequest) and return its request id."""
+        if request_id is None:
+            self.counter += 1
+            request_id = str(self.counter)
+        self.pending.append((str(request_id), request, callback))
+        return str(request_id)
+
+    def flush(self):
+        results = {}
+        pending, self.pending = self.pending, []
+        attempt = 0
+        while pending:
+            final = attempt >= self.retries
+            failed = []
+            for start in range(0, len(pending), self.batch_size):
+                failed.extend(self.send(pending[start:start + self.batch_size], results, final))
+            pending = failed
+            if pending:
+                attempt += 1
+                get_limiter(api_name(pending[0][1])).record_retry()
+                self.sleep(backoff_delay(attempt, self.backoff))
+        return results
+
+    def send(self, calls, results, final):
+        """Execute one batch; return the calls that should be sent again."""
+        outcomes = {}
+
+        def collect(request_id, response, exception):
+            outcomes[request_id] = (response, exception)
+
+        batch = self.service.new_batch_http_request(callback=collect)
+        sent = []
+        for request_id, request, _ in calls:
+            try:
+                charge(request)
+            except QuotaExhausted as e:
+                outcomes[request_id] = (None, e)
+                continue
+            batch.add(request, request_id=request_id)
+            sent.append(request_id)
+        if sent:
+            try:
+                batch.execute()
+            except Exception as e:
+                # The batch itself failed, so no call in it has an outcome yet
+                outcomes.update((request_id, (None, e)) for request_id in sent)
+
+        retry = []
+        for call in calls:
+            request_id, request, callback = call
+            response, exception = outcomes.get(request_id, (None, RuntimeError("No response in batch")))
+            if exception is not None:
+                record_failure(request, exception)
+            if exception is not None and not final and is_retryable(exception, is_idempotent(request)):
+                retry.append(call)
+                continue
+            results[request_id] = BatchResult(response, exception)
+            if callback:
+                callback(request_id, response, exception)
+        return retry
+
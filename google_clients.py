@@ -0,0 +1,87 @@
+import threading
+
+import google_auth_httplib2
+from google.auth.transport.requests import Request
+from googleapiclient.discovery import build
+from googleapiclient.http import build_http
+
+from google_quota import QuotaHttpRequest
+
+# Credentials and parsed discovery documents are shared by every thread in
+# the process. httplib2 connections are not thread-safe, so each API request
+# gets its own authorized transport instead of sharing one.
+_credentials = {}
+_services = {}
+_lock = threading.Lock()
+_refresh_locks = {}
+
+
+def get_credentials(credentials_key, loader):
+    """Return cached credentials for ``credentials_key``, loading them once with ``loader()``."""
+    creds = _credentials.get(credentials_key)
+    if creds is None:
+        with _lock:
+            creds = _credentials.get(credentials_key)
+            if creds is None:
+                creds = loader()
+                _credentials[credentials_key] = creds
+                _refresh_locks[credentials_key] = threading.Lock()
+    ensure_fresh(credentials_key, creds)
+    return creds
+
+
+def ensure_fresh(credentials_key, creds):
+    """Refresh expired credentials once, even when several threads notice together."""
+    if creds.valid or not getattr(creds, "refresh_token", None):
+        return
+    with _refresh_locks[credentials_key]:
+        if not creds.valid:
+            creds.refresh(Request())
+
+
+def get_service(api, version, credentials_key, loader):
+    """
+    Return a process-wide ``googleapiclient`` service for ``(api, version, credentials_key)``.
+
+    The discovery document is the static copy bundled with the client
+    library, so building never touches the network, and the built service is
+    reused for every later call.
+    """
+    key = (api, version, credentials_key)
+    service = _services.get(key)
+    if service is not None:
+        ensure_fresh(credentials_key, _credentials[credentials_key])
+        return service
+    creds = get_credentials(credentials_key, loader)
+    with _lock:
+        service = _services.get(key)
+        if service is None:
+            service = build(
+                api, version,
+                credentials=creds,
+                requestBuilder=_request_builder(credentials_key),
+                static_discovery=True,
+                cache_discovery=False
+            )
+            _services[key] = service
+    return service
+
+
+def _request_builder(credentials_key):
+    def build_request(http, *args, **kwargs):
+        creds = _credentials[credentials_key]
+        ensure_fresh(credentials_key, creds)
+        http = google_auth_httplib2.AuthorizedHttp(creds, http=build_http())
+        return QuotaHttpRequest(http, *args, **kwargs)
+    return build_request
+
+
+def clear_cache(credentials_key=None):
+    """Drop cached services/credentials, e.g. after a token file is replaced."""
+    with _lock:
+        for key in list(_services):
+            if credentials_key is None or key[2] == credentials_key:
+                del _services[key]
+        for key in list(_credentials):
+            if credentials_key is None or key == credentials_key:
+                del _credentials[key]
@@ -0,0 +1,271 @@
+import os
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from googleapiclient.errors import HttpError
+from googleapiclient.http import HttpRequest
+from httplib2 import HttpLib2Error
+
+# Daily quotas reset at midnight Pacific time
+QUOTA_TIMEZONE = ZoneInfo("America/Los_Angeles")
+# Per-process limits; with several gunicorn workers give each its share.
+# ``burst`` calls go out at once (one full batch), then ``requests_per_second``.
+API_LIMITS = {
+    "youtube": {
+        "daily_units": int(os.environ.get("YOUTUBE_DAILY_QUOTA_UNITS", "10000")),
+        "requests_per_second": float(os.environ.get("YOUTUBE_REQUESTS_PER_SECOND", "10")),
+        "burst": int(os.environ.get("YOUTUBE_REQUEST_BURST", "50")),
+    },
+    "classroom": {
+        "daily_units": int(os.environ.get("CLASSROOM_DAILY_QUOTA_UNITS", "0")),  # 0 = no unit budget
+        "requests_per_second": float(os.environ.get("CLASSROOM_REQUESTS_PER_SECOND", "10")),
+        "burst": int(os.environ.get("CLASSROOM_REQUEST_BURST", "50")),
+    },
+}
+# YouTube Data API unit costs; anything not listed costs 1
+QUOTA_COSTS = {
+    "youtube.videos.insert": 1600,
+    "youtube.videos.update": 50,
+    "youtube.videos.delete": 50,
+    "youtube.playlists.insert": 50,
+    "youtube.playlists.update": 50,
+    "youtube.playlists.delete": 50,
+    "youtube.playlistItems.insert": 50,
+    "youtube.playlistItems.update": 50,
+    "youtube.playlistItems.delete": 50,
+}
+API_RETRIES = int(os.environ.get("GOOGLE_API_RETRIES", "5"))
+BACKOFF_SECONDS = 1.0
+MAX_BACKOFF_SECONDS = 64.0
+THROTTLED_STATUS = 429
+THROTTLED_REASONS = {"rateLimitExceeded", "userRateLimitExceeded"}
+SERVER_ERROR_STATUS = {500, 502, 503, 504}
+SERVER_ERROR_REASONS = {"backendError"}
+EXHAUSTED_REASONS = {"quotaExceeded", "dailyLimitExceeded"}
+# Sending these twice has the same effect as once; a create (POST) would be duplicated
+IDEMPOTENT_METHODS = {"GET", "HEAD", "PUT", "DELETE"}
+
+
+class QuotaExhausted(Exception):
+    """Raised instead of calling Google when an API's daily unit budget is spent."""
+
+    def __init__(self, api, units, resets_at):
+        super().__init__(f"{api} API quota exhausted ({units} units needed); resets at {resets_at.isoformat()}")
+        self.api = api
+        self.units = units
+        self.resets_at = resets_at
+
+
+# --- ERROR CLASSIFICATION ---
+def error_reasons(exception):
+    return {d.get("reason") for d in exception.error_details or [] if isinstance(d, dict)}
+
+
+def is_quota_exhausted(exception):
+    return isinstance(exception, HttpError) and exception.resp.status == 403 and bool(
+        error_reasons(exception) & EXHAUSTED_REASONS
+    )
+
+
+def is_idempotent(request):
+    return request.method.upper() in IDEMPOTENT_METHODS
+
+
+def is_retryable(exception, idempotent=True):
+    """
+    True for failures that may succeed if sent again. Throttling always
+    qualifies: Google refused the call without running it. After a 5xx or a
+    transport failure the call may have run anyway, so only ``idempotent``
+    requests are sent again.
+    """
+    if isinstance(exception, HttpError):
+        status, reasons = exception.resp.status, error_reasons(exception)
+        if status == THROTTLED_STATUS or (status == 403 and reasons & THROTTLED_REASONS):
+            return True
+        server_error = status in SERVER_ERROR_STATUS or (status == 403 and bool(reasons & SERVER_ERROR_REASONS))
+        return idempotent and server_error
+    return idempotent and isinstance(exception, (HttpLib2Error, OSError))
+
+
+def backoff_delay(attempt, base=BACKOFF_SECONDS):
+    """Full-jitter exponential backoff for retry number ``attempt`` (1-based)."""
+    return random.uniform(0, min(MAX_BACKOFF_SECONDS, base * 2 ** attempt))
+
+
+# --- LIMITERS ---
+class TokenBucket:
+    """``rate`` tokens per second, holding at most ``capacity``; callers reserve and then sleep."""
+
+    def __init__(self, rate, capacity=None, clock=time.monotonic):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self.clock = clock
+        self.updated = clock()
+
+    def reserve(self, tokens=1):
+        """Take ``tokens`` now, going into debt if needed; return the seconds to wait before using them."""
+        now = self.clock()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= tokens
+        return max(0.0, -self.tokens / self.rate)
+
+
+class ApiLimiter:
+    """
+    Rate and quota accounting for one Google API.
+
+    Every call takes a token from a requests-per-second bucket, so bursts are
+    smoothed rather than rejected, and its unit cost is deducted from the
+    daily budget. When the budget is spent, or Google answers
+    ``quotaExceeded``, calls fail fast with QuotaExhausted until the next
+    Pacific-time midnight.
+    """
+
+    def __init__(self, api, daily_units=0, requests_per_second=10, burst=None, clock=time.monotonic,
+                 sleep=time.sleep, now=None):
+        self.api = api
+        self.daily_units = daily_units
+        self.bucket = TokenBucket(requests_per_second, burst, clock=clock) if requests_per_second else None
+        self.sleep = sleep
+        self.now = now or (lambda: datetime.now(QUOTA_TIMEZONE))
+        self.lock = threading.Lock()
+        self.resets_at = self.next_reset()
+        self.used_units = 0
+        self.counters = {"calls": 0, "throttled": 0, "throttled_seconds": 0.0, "retries": 0,
+                         "quota_errors": 0, "rejected": 0}
+
+    def next_reset(self):
+        tomorrow = self.now().date() + timedelta(days=1)
+        return datetime(tomorrow.year, tomorrow.month, tomorrow.day, tzinfo=QUOTA_TIMEZONE)
+
+    def roll_over(self):
+        if self.now() >= self.resets_at:
+            self.used_units = 0
+            self.resets_at = self.next_reset()
+
+    def acquire(self, units=1):
+        with self.lock:
+            self.roll_over()
+            if self.daily_units and self.used_units + units > self.daily_units:
+                self.counters["rejected"] += 1
+                raise QuotaExhausted(self.api, units, self.resets_at)
+            wait = self.bucket.reserve() if self.bucket else 0.0
+            self.used_units += units
+            self.counters["calls"] += 1
+            if wait:
+                self.counters["throttled"] += 1
+                self.counters["throttled_seconds"] += wait
+        if wait:
+            self.sleep(wait)
+
+    def exhaust(self):
+        """Google says the quota is spent, whatever our own count says."""
+        with self.lock:
+            self.roll_over()
+            self.counters["quota_errors"] += 1
+            if self.daily_units:
+                self.used_units = max(self.used_units, self.daily_units)
+
+    def record_retry(self):
+        with self.lock:
+            self.counters["retries"] += 1
+
+    def snapshot(self):
+        with self.lock:
+            self.roll_over()
+            return dict(
+                self.counters,
+                daily_units=self.daily_units or None,
+                used_units=self.used_units,
+                remaining_units=max(0, self.daily_units - self.used_units) if self.daily_units else None,
+                requests_per_second=self.bucket.rate if self.bucket else None,
+                resets_at=self.resets_at.isoformat()
+            )
+
+
+_limiters = {}
+_lock = threading.Lock()
+
+
+def get_limiter(api):
+    limiter = _limiters.get(api)
+    if limiter is None:
+        with _lock:
+            limiter = _limiters.get(api)
+            if limiter is None:
+                limiter = ApiLimiter(api, **API_LIMITS.get(api, {}))
+                _limiters[api] = limiter
+    return limiter
+
+
+def api_name(request):
+    return (request.methodId or "").split(".")[0]
+
+
+def quota_cost(method_id):
+    return QUOTA_COSTS.get(method_id or "", 1)
+
+
+def charge(request):
+    """Wait for rate budget and deduct the unit cost of ``request`` (an HttpRequest)."""
+    get_limiter(api_name(request)).acquire(quota_cost(request.methodId))
+
+
+def record_failure(request, exception):
+    """Drain the daily budget if ``exception`` says Google's quota is spent."""
+    if is_quota_exhausted(exception):
+        get_limiter(api_name(request)).exhaust()
+
+
+def quota_snapshot():
+    """Counters and remaining budget per API for this process."""
+    return {api: get_limiter(api).snapshot() for api in sorted(set(API_LIMITS) | set(_limiters))}
+
+
+def reset_limiters():
+    """Forget all accounting, e.g. after changing API_LIMITS."""
+    with _lock:
+        _limiters.clear()
+
+
+# --- REQUESTS ---
+class QuotaHttpRequest(HttpRequest):
+    """
+    HttpRequest that is charged against its API's limiter before being sent.
+
+    ``execute()`` retries throttling with jittered exponential backoff (each
+    attempt is charged again, as Google does), and 5xx and transport
+    failures too for idempotent methods, so a create is never sent twice.
+    Resumable uploads are charged once, when the upload session is opened,
+    and keep googleapiclient's own chunk retries.
+    """
+
+    def execute(self, http=None, num_retries=None):
+        retries = API_RETRIES if num_retries is None else num_retries
+        limiter = get_limiter(api_name(self))
+        attempt = 0
+        while True:
+            charge(self)
+            try:
+                return super().execute(http=http)
+            except Exception as e:
+                record_failure(self, e)
+                if attempt >= retries or not is_retryable(e, is_idempotent(self)):
+                    raise
+                attempt += 1
+                limiter.record_retry()
+                limiter.sleep(backoff_delay(attempt))
+
+    def next_chunk(self, http=None, num_retries=0):
+        if self.resumable_uri is None:
+            charge(self)
+        try:
+            return super().next_chunk(http=http, num_retries=num_retries)
+        except HttpError as e:
+            record_failure(self, e)
+            raise
@@ -0,0 +1,358 @@
+import json
+import os
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+import click
+from flask.cli import with_appcontext
+from sqlalchemy import delete, update
+
+from database import upsert_insert
+from extensions import db
+from job_queue import JobRunner
+from models import GoogleClassroomCourse, GoogleIntegrationAccount, SyncJob, Video, YouTubePlaylist
+
+COURSE_PAGE_SIZE = 100
+COURSE_FIELDS = "nextPageToken,courses(id,name,section,enrollmentCode)"
+# GoogleClassroomCourse column -> API course field, for the columns a sync keeps current
+SYNCED_COURSE_COLUMNS = {'name': 'name', 'section': 'section', 'join_code': 'enrollmentCode'}
+# Accounts synced in parallel within one job
+SYNC_ACCOUNT_WORKERS = int(os.environ.get("SYNC_ACCOUNT_WORKERS", "4"))
+sync_runner = JobRunner(max_workers=int(os.environ.get("SYNC_WORKERS", "1")), thread_name_prefix="sync")
+
+
+# === Google Classroom Courses ===
+def list_all_courses(service, teacher_email):
+    """Every active course taught by ``teacher_email``, across all result pages."""
+    courses, page_token = [], None
+    while True:
+        response = service.courses().list(
+            teacherId=teacher_email,
+            courseStates=['ACTIVE'],
+            pageSize=COURSE_PAGE_SIZE,
+            pageToken=page_token,
+            fields=COURSE_FIELDS
+        ).execute()
+        courses.extend(response.get('courses', []))
+        page_token = response.get('nextPageToken')
+        if not page_token:
+            return courses
+
+
+def upsert_courses(courses, account_id, created_by=None):
+    """
+    Bring GoogleClassroomCourse in line with ``courses`` from the API.
+
+    Existing rows are loaded with one query; new courses are inserted and
+    courses whose name, section or enrollment code changed are updated, each
+    as a single bulk statement. Unchanged rows are not written. A course
+    keeps the account that first synced it: a co-taught course listed by
+    several accounts, whose syncs run in parallel transactions, is upserted
+    on ``course_id`` instead of failing the second account's transaction.
+    The caller commits.
+    """
+    incoming = {c['id']: c for c in courses}
+    existing = {
+        row.course_id: row for row in db.session.query(
+            GoogleClassroomCourse.id, GoogleClassroomCourse.course_id,
+            *(getattr(GoogleClassroomCourse, column) for column in SYNCED_COURSE_COLUMNS)
+        ).filter(GoogleClassroomCourse.course_id.in_(list(incoming)))
+    }
+
+    now = datetime.utcnow()
+    new_rows, changed_rows = [], []
+    for course_id, course in incoming.items():
+        values = {column: course.get(field) for column, field in SYNCED_COURSE_COLUMNS.items()}
+        row = existing.get(course_id)
+        if row is None:
+            new_rows.append(dict(values, course_id=course_id, integration_account_id=account_id,
+                                 created_by=created_by, created_at=now))
+        elif any(getattr(row, column) != value for column, value in values.items()):
+            changed_rows.append(dict(values, id=row.id))
+    if new_rows:
+        stmt = upsert_insert(db.session, GoogleClassroomCourse)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[GoogleClassroomCourse.course_id],
+            set_={column: stmt.excluded[column] for column in SYNCED_COURSE_COLUMNS}
+        )
+        db.session.execute(stmt, new_rows)
+    if changed_rows:
+        db.session.execute(update(GoogleClassroomCourse), changed_rows)
+    return {
+        'fetched': len(incoming),
+        'added': len(new_rows),
+        'updated': len(changed_rows),
+        'unchanged': len(incoming) - len(new_rows) - len(changed_rows)
+    }
+
+
+def sync_account_courses(account_id, teacher_email, requested_by):
+    from classroom_auth import get_classroom_service
+    courses = list_all_courses(get_classroom_service(), teacher_email)
+    return upsert_courses(courses, account_id, created_by=requested_by)
+
+
+# === YouTube Playlists ===
+def upsert_playlists(playlists, account_id=None, prune=True):
+    """
+    Bring YouTubePlaylist in line with a full channel listing
+    ``[(playlist_id, title), ...]``.
+
+    One query preloads the stored rows; new playlists are upserted on
+    ``playlist_id`` and renamed ones updated in bulk, and every listed
+    playlist has ``synced_at`` stamped by a single UPDATE. A playlist keeps
+    the account it was first synced with; ``account_id`` is only filled in
+    where none is set. With ``prune``, playlists of this account (or of no
+    account) missing from the listing were deleted on YouTube and are
+    removed. The caller commits.
+    """
+    incoming = dict(playlists)
+    existing = {
+        row.playlist_id: row for row in db.session.query(
+            YouTubePlaylist.id, YouTubePlaylist.playlist_id, YouTubePlaylist.title,
+            YouTubePlaylist.integration_account_id
+        )
+    }
+
+    now = datetime.utcnow()
+    new_rows, changed_rows, unchanged_ids = [], [], []
+    for playlist_id, title in incoming.items():
+        row = existing.get(playlist_id)
+        if row is None:
+            new_rows.append({'playlist_id': playlist_id, 'title': title,
+                             'integration_account_id': account_id, 'synced_at': now})
+        elif row.title != title or (account_id is not None and row.integration_account_id is None):
+            changed_rows.append({'id': row.id, 'title': title, 'synced_at': now,
+                                 'integration_account_id': row.integration_account_id or account_id})
+        else:
+            unchanged_ids.append(row.id)
+    if new_rows:
+        stmt = upsert_insert(db.session, YouTubePlaylist)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[YouTubePlaylist.playlist_id],
+            set_={'title': stmt.excluded.title, 'synced_at': stmt.excluded.synced_at}
+        )
+        db.session.execute(stmt, new_rows)
+    if changed_rows:
+        db.session.execute(update(YouTubePlaylist), changed_rows)
+    if unchanged_ids:
+        db.session.execute(
+            update(YouTubePlaylist).where(YouTubePlaylist.id.in_(unchanged_ids)).values(synced_at=now),
+            execution_options={'synchronize_session': False}
+        )
+
+    removed = [
+        row.id for playlist_id, row in existing.items()
+        if playlist_id not in incoming and row.integration_account_id in (account_id, None)
+    ] if prune else []
+    if removed:
+        db.session.execute(
+            delete(YouTubePlaylist).where(YouTubePlaylist.id.in_(removed)),
+            execution_options={'synchronize_session': False}
+        )
+    return {
+        'fetched': len(incoming),
+        'added': len(new_rows),
+        'updated': len(changed_rows),
+        'unchanged': len(unchanged_ids),
+        'removed': len(removed)
+    }
+
+
+def sync_account_playlists(account_id, teacher_email, requested_by):
+    from youtube_uploader import get_authenticated_service, list_all_playlists
+    return upsert_playlists(list_all_playlists(get_authenticated_service()), account_id)
+
+
+def youtube_listing_key(teacher_email):
+    # Every account lists playlists through the one YouTube token, i.e. the same channel
+    from youtube_uploader import TOKEN_FILE
+    return TOKEN_FILE
+
+
+def refresh_video_metadata():
+    """
+    Re-read title and publish time for every stored video from YouTube.
+
+    All videos are fetched through batched ``videos.list`` calls and changed
+    rows are written with one bulk UPDATE. The caller commits.
+    """
+    from youtube_uploader import get_authenticated_service, fetch_video_metadata
+    stored = db.session.query(Video.id, Video.video_id, Video.title, Video.published_at).all()
+    metadata = fetch_video_metadata(get_authenticated_service(), [row.video_id for row in stored])
+
+    changed_rows = []
+    for row in stored:
+        found = metadata.get(row.video_id)
+        if not found:
+            continue
+        published_at = found['published_at'] and (
+            datetime.fromisoformat(found['published_at'].replace('Z', '+00:00')).replace(tzinfo=None)
+        )
+        if (row.title, row.published_at) != (found['title'], published_at):
+            changed_rows.append({'id': row.id, 'title': found['title'], 'published_at': published_at})
+    if changed_rows:
+        db.session.execute(update(Video), changed_rows)
+    return {
+        'videos': len(stored),
+        'found': len(metadata),
+        'updated': len(changed_rows),
+        'missing': len(stored) - len(metadata)
+    }
+
+
+@click.command("refresh-video-metadata")
+@with_appcontext
+def refresh_video_metadata_command():
+    """Update stored video titles and publish times from YouTube."""
+    result = refresh_video_metadata()
+    db.session.commit()
+    print(f"Checked {result['videos']} video(s): {result['updated']} updated, {result['missing']} not found on YouTube.")
+
+
+SYNC_KINDS = {
+    'classroom': sync_account_courses,
+    'youtube': sync_account_playlists,
+}
+# Kinds whose listing depends on the token used rather than the account:
+# accounts with the same key get the same listing, so it is fetched once
+SYNC_LISTING_KEYS = {
+    'youtube': youtube_listing_key,
+}
+
+
+# === Sync Jobs ===
+def sync_account(app, kind, account_id, teacher_email, requested_by, shared_ids=()):
+    """
+    Sync one integration account in its own app context and transaction.
+    ``shared_ids`` are accounts whose listing is the same as this one's;
+    they are marked synced along with it.
+    """
+    with app.app_context():
+        started = datetime.utcnow()
+        try:
+            result = SYNC_KINDS[kind](account_id, teacher_email, requested_by)
+            # Watermark: the accounts were fully in sync as of the start of this run
+            db.session.execute(
+                update(GoogleIntegrationAccount)
+                .where(GoogleIntegrationAccount.id.in_([account_id, *shared_ids]))
+                .values(last_synced=started)
+            )
+            db.session.commit()
+            return dict(result, status='success', last_synced=started.isoformat())
+        except Exception as e:
+            db.session.rollback()
+            print(f"[SYNC ERROR] {kind} account {account_id}: {e}")
+            return {'status': 'error', 'message': str(e)}
+        finally:
+            db.session.remove()
+
+
+def save_sync_job(job, ctx, **fields):
+    for field, value in fields.items():
+        setattr(job, field, value)
+    job.context = json.dumps(ctx)
+    job.updated_at = datetime.utcnow()
+    db.session.commit()
+
+
+def create_sync_job(kind, accounts, requested_by):
+    """Record a queued job for ``accounts`` (GoogleIntegrationAccount rows); the caller submits it."""
+    now = datetime.utcnow()
+    job = SyncJob(
+        id=str(uuid.uuid4()),
+        kind=kind,
+        status='queued',
+        context=json.dumps({'accounts': {str(a.id): a.google_email for a in accounts}, 'results': {}}),
+        requested_by=requested_by,
+        created_at=now,
+        updated_at=now
+    )
+    db.session.add(job)
+    db.session.commit()
+    return job
+
+
+def sync_groups(kind, accounts):
+    """
+    ``{account_id: (teacher_email, [shared account ids])}``: one entry per
+    distinct listing, keyed by the lowest account id that produces it.
+    """
+    listing_key = SYNC_LISTING_KEYS.get(kind)
+    groups, first_by_key = {}, {}
+    for account_id, email in sorted(accounts.items(), key=lambda item: int(item[0])):
+        key = listing_key(email) if listing_key else account_id
+        if key in first_by_key:
+            groups[first_by_key[key]][1].append(int(account_id))
+        else:
+            first_by_key[key] = account_id
+            groups[account_id] = (email, [])
+    return groups
+
+
+def process_sync_job(app, job_id):
+    """
+    Sync every account of a job concurrently, saving each account's result
+    as it finishes. Accounts sharing a listing (see SYNC_LISTING_KEYS) are
+    synced once; the others record ``synced_with`` that account.
+    """
+    with app.app_context():
+        job = db.session.get(SyncJob, job_id)
+        if not job:
+            return
+        ctx = json.loads(job.context)
+        accounts = ctx['accounts']
+        save_sync_job(job, ctx, status='running', error=None)
+        try:
+            workers = max(1, min(SYNC_ACCOUNT_WORKERS, len(accounts)))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sync-account") as pool:
+                futures = {
+                    pool.submit(sync_account, app, job.kind, int(account_id), email, job.requested_by, shared_ids):
+                        (account_id, shared_ids)
+                    for account_id, (email, shared_ids) in sync_groups(job.kind, accounts).items()
+                }
+                for future in as_completed(futures):
+                    account_id, shared_ids = futures[future]
+                    result = future.result()
+                    ctx['results'][account_id] = result
+                    for shared_id in shared_ids:
+                        shared = {'status': result['status'], 'synced_with': int(account_id)}
+                        if 'message' in result:
+                            shared['message'] = result['message']
+                        ctx['results'][str(shared_id)] = shared
+                    save_sync_job(job, ctx)
+            failed = [r['message'] for r in ctx['results'].values() if r['status'] == 'error']
+            if not failed:
+                save_sync_job(job, ctx, status='success', error=None)
+            else:
+                status = 'error' if len(failed) == len(accounts) else 'partial'
+                save_sync_job(job, ctx, status=status, error="; ".join(dict.fromkeys(failed)))
+        except Exception as e:
+            db.session.rollback()
+            print("[SYNC JOB ERROR]", e)
+            save_sync_job(job, ctx, status='error', error=f"Unexpected error: {e}")
+        finally:
+            db.session.remove()
+
+
+def serialize_sync_job(job):
+    ctx = json.loads(job.context) if job.context else {}
+    results = ctx.get('results', {})
+    totals = {}
+    for result in results.values():
+        for key in ('fetched', 'added', 'updated', 'unchanged', 'removed'):
+            totals[key] = totals.get(key, 0) + result.get(key, 0)
+    return {
+        'job_id': job.id,
+        'kind': job.kind,
+        'status': job.status,
+        'accounts': {
+            account_id: dict(results.get(account_id, {'status': 'pending'}), google_email=email)
+            for account_id, email in ctx.get('accounts', {}).items()
+        },
+        'totals': totals,
+        'message': job.error,
+        'created_at': job.created_at.isoformat() if job.created_at else None,
+        'updated_at': job.updated_at.isoformat() if job.updated_at else None
+    }
@@ -0,0 +1,21 @@
+# Load the app once in the master so workers share its memory copy-on-write.
+preload_app = True
+
+
+def when_ready(server):
+    from app import warmup
+    app = server.app.wsgi()
+    warmup(app)
+    # Connections must not cross fork(); each worker opens its own pool
+    from extensions import db
+    with app.app_context():
+        db.engine.dispose()
+
+
+def post_fork(server, worker):
+    from app import warmup
+    from extensions import db
+    app = server.app.wsgi()
+    with app.app_context():
+        db.engine.dispose(close=False)
+    warmup(app, google_clients=False)
@@ -0,0 +1,99 @@
+import gzip
+import hashlib
+from functools import wraps
+
+from flask import current_app, make_response, request
+from flask_login import current_user
+
+from extensions import db
+from table_versions import table_versions
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+ENCODING_SUFFIXES = ("", "-gzip", "-br")
+
+
+# --- CONDITIONAL GET ---
+def versioned_etag(tables):
+    """
+    Strong ETag for the current request built from the versions of ``tables``.
+
+    Responses of a ``@conditional`` view depend only on those tables, the
+    URL and the user, so the tag is known without running the view or
+    hashing its body. ETAG_SALT changes every tag when a deploy changes the
+    shape of the JSON.
+    """
+    versions = table_versions(db.session, tables)
+    user_id = current_user.get_id() if current_user.is_authenticated else ""
+    key = "|".join([current_app.config["ETAG_SALT"], request.full_path, str(user_id),
+                    ",".join(f"{t}:{v}" for t, v in zip(tables, versions))])
+    return hashlib.sha1(key.encode()).hexdigest()
+
+
+def conditional(*tables):
+    """
+    Decorator for GET views whose response is a function of ``tables``.
+
+    Answers ``If-None-Match`` with 304 before the view runs, otherwise tags
+    the response. ``no-cache`` makes browsers revalidate every fetch, which
+    then costs a 304 instead of the full body.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            etag = versioned_etag(tables)
+            for suffix in ENCODING_SUFFIXES:
+                if request.if_none_match.contains(etag + suffix):
+                    response = current_app.response_class(status=304)
+                    response.set_etag(etag + suffix)
+                    response.headers["Cache-Control"] = "private, no-cache"
+                    response.vary.add("Accept-Encoding")
+                    return response
+            response = make_response(view(*args, **kwargs))
+            if response.status_code == 200:
+                response.set_etag(etag)
+                response.headers["Cache-Control"] = "private, no-cache"
+            return response
+        return wrapper
+    return decorator
+
+
+# --- COMPRESSION ---
+def choose_encoding(accept_encodings):
+    if brotli is not None and accept_encodings["br"] > 0:
+        return "br"
+    if accept_encodings["gzip"] > 0:
+        return "gzip"
+    return None
+
+
+def compress_response(response):
+    """gzip or brotli a large text/JSON body, and retag it so each encoding has its own strong ETag."""
+    config = current_app.config
+    if (response.status_code != 200 or response.direct_passthrough or response.is_streamed
+            or "Content-Encoding" in response.headers
+            or response.mimetype not in config["COMPRESS_MIMETYPES"]):
+        return response
+    response.vary.add("Accept-Encoding")
+    encoding = choose_encoding(request.accept_encodings)
+    data = response.get_data()
+    if encoding is None or len(data) < config["COMPRESS_MIN_SIZE"]:
+        return response
+
+    if encoding == "br":
+        data = brotli.compress(data, quality=config["COMPRESS_BROTLI_QUALITY"])
+    else:
+        data = gzip.compress(data, compresslevel=config["COMPRESS_LEVEL"], mtime=0)
+    response.set_data(data)
+    response.headers["Content-Encoding"] = encoding
+    etag, weak = response.get_etag()
+    if etag:
+        response.set_etag(f"{etag}-{encoding}", weak)
+    return response
+
+
+def install_compression(app):
+    app.after_request(compress_response)
@@ -0,0 +1,90 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+class StageFailed(Exception):
+    """Raised when a required stage has exhausted its retries."""
+
+    def __init__(self, stage, error):
+        super().__init__(f"{stage} failed: {error}")
+        self.stage = stage
+        self.error = error
+
+
+class Stage:
+    """One retryable step of a pipeline. ``func(ctx)`` may read and update ``ctx``."""
+
+    def __init__(self, name, func, retries=3, backoff=2.0, required=True):
+        self.name = name
+        self.func = func
+        self.retries = retries
+        self.backoff = backoff
+        self.required = required
+
+
+def run_stages(stages, ctx, on_progress=None, sleep=time.sleep):
+    """
+    Run ``stages`` in order against the shared ``ctx`` dict.
+
+    Stages already listed in ``ctx["completed"]`` are skipped, so a failed job
+    can be re-run without repeating finished work. Each stage is retried with
+    jittered exponential backoff; a non-required stage that keeps failing
+    records its error in ``ctx["errors"]`` and the pipeline carries on.
+    ``on_progress(stage_name, ctx)`` is called before and after every stage.
+    """
+    completed = ctx.setdefault("completed", [])
+    timings = ctx.setdefault("timings", {})
+    errors = ctx.setdefault("errors", {})
+    for stage in stages:
+        if stage.name in completed:
+            continue
+        ctx["stage"] = stage.name
+        if on_progress:
+            on_progress(stage.name, ctx)
+        started = time.monotonic()
+        for attempt in range(1, stage.retries + 1):
+            try:
+                stage.func(ctx)
+                break
+            except Exception as e:
+                print(f"[JOB] {stage.name} attempt {attempt}/{stage.retries} failed: {e}")
+                if attempt == stage.retries:
+                    timings[stage.name] = round(time.monotonic() - started, 3)
+                    if stage.required:
+                        raise StageFailed(stage.name, e)
+                    errors[stage.name] = str(e)
+                    break
+                sleep(stage.backoff * (2 ** (attempt - 1)) * random.uniform(0.5, 1.5))
+        timings.setdefault(stage.name, round(time.monotonic() - started, 3))
+        completed.append(stage.name)
+        if on_progress:
+            on_progress(stage.name, ctx)
+    ctx["stage"] = None
+    return ctx
+
+
+class JobRunner:
+    """Thread pool for background jobs, created lazily so it is never forked."""
+
+    def __init__(self, max_workers=2, thread_name_prefix="job"):
+        self.max_workers = max_workers
+        self.thread_name_prefix = thread_name_prefix
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def submit(self, fn, *args, **kwargs):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix=self.thread_name_prefix
+                )
+        return self._executor.submit(fn, *args, **kwargs)
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=wait)
+                self._executor = None
@@ -1,5 +1,9 @@
 import json
-from app import app, db, Class
+from app import create_app
+from extensions import db
+from models import Class
+
+app = create_app()
 
 # Load old JSON data
 with open("data/classes.json") as f:
@@ -1,4 +1,8 @@
-from app import app, db, Video
+from app import create_app
+from extensions import db
+from models import Video
+
+app = create_app()
 import os
 import json
 
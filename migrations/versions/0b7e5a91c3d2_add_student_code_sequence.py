@@ -0,0 +1,29 @@
+"""add student_code_sequence table
+
+Revision ID: 0b7e5a91c3d2
+Revises: f3a9c1d27b64
+Create Date: 2026-10-18 16:30:48.552917
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0b7e5a91c3d2'
+down_revision = 'f3a9c1d27b64'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Counters are seeded from existing codes the first time a year is used
+    op.create_table('student_code_sequence',
+    sa.Column('year', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('last_value', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('year')
+    )
+
+
+def downgrade():
+    op.drop_table('student_code_sequence')
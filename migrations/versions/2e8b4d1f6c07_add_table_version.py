@@ -0,0 +1,28 @@
+"""add table_version change counters
+
+Revision ID: 2e8b4d1f6c07
+Revises: 9c4f2e6a8b13
+Create Date: 2026-10-18 19:12:44.208113
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '2e8b4d1f6c07'
+down_revision = '9c4f2e6a8b13'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('table_version',
+    sa.Column('table_name', sa.String(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('table_name')
+    )
+
+
+def downgrade():
+    op.drop_table('table_version')
@@ -0,0 +1,49 @@
+"""add foreign key and lookup indexes
+
+Revision ID: 3f1c2a7b9e40
+Revises: 8d82f3b6d49a
+Create Date: 2026-10-18 09:12:41.203118
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '3f1c2a7b9e40'
+down_revision = '8d82f3b6d49a'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ('ix_class_class_teacher', 'class', ['class_teacher']),
+    ('ix_video_class_id', 'video', ['class_id']),
+    ('ix_video_youtube_playlist_id', 'video', ['youtube_playlist_id']),
+    ('ix_video_integration_account_id', 'video', ['integration_account_id']),
+    ('ix_parent_student_id', 'parent', ['student_id']),
+    ('ix_student_class_assignment_student_id', 'student_class_assignment', ['student_id']),
+    ('ix_student_class_assignment_class_id', 'student_class_assignment', ['class_id']),
+    ('ix_student_fee_student_id', 'student_fee', ['student_id']),
+    ('ix_student_fee_class_id', 'student_fee', ['class_id']),
+    # (class_id, date) also serves plain class_id lookups
+    ('ix_attendance_class_id_date', 'attendance', ['class_id', 'date']),
+    ('ix_attendance_student_id_date', 'attendance', ['student_id', 'date']),
+    ('ix_payment_student_id', 'payment', ['student_id']),
+    ('ix_payment_fee_id', 'payment', ['fee_id']),
+    ('ix_google_integration_account_owner_user_id', 'google_integration_account', ['owner_user_id']),
+    ('ix_google_account_permissions_integration_account_id', 'google_account_permissions', ['integration_account_id']),
+    ('ix_google_account_permissions_user_id', 'google_account_permissions', ['user_id']),
+    # (class_id, created_at) serves the "latest course for a class" lookup
+    ('ix_google_classroom_course_class_id_created_at', 'google_classroom_course', ['class_id', 'created_at']),
+    ('ix_google_classroom_course_integration_account_id', 'google_classroom_course', ['integration_account_id']),
+]
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade():
+    for name, table, columns in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
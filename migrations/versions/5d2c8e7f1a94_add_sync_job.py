@@ -0,0 +1,37 @@
+"""add sync_job table
+
+Revision ID: 5d2c8e7f1a94
+Revises: 0b7e5a91c3d2
+Create Date: 2026-10-18 17:12:03.904126
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5d2c8e7f1a94'
+down_revision = '0b7e5a91c3d2'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('sync_job',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('kind', sa.String(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('context', sa.Text(), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('requested_by', sa.Integer(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['requested_by'], ['user_account.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_sync_job_requested_by', 'sync_job', ['requested_by'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_sync_job_requested_by', table_name='sync_job')
+    op.drop_table('sync_job')
@@ -0,0 +1,54 @@
+"""link youtube_playlist to integration accounts; move placeholder video rows
+
+Revision ID: 9c4f2e6a8b13
+Revises: 5d2c8e7f1a94
+Create Date: 2026-10-18 18:03:27.615480
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9c4f2e6a8b13'
+down_revision = '5d2c8e7f1a94'
+branch_labels = None
+depends_on = None
+
+# The old playlist sync stored each playlist as a video row with a random
+# uuid4 video_id; real YouTube video ids are 11 characters.
+PLACEHOLDER_VIDEO = """
+    youtube_playlist_id IS NOT NULL
+    AND length(video_id) = 36
+    AND video_id LIKE '________-____-4___-____-____________'
+"""
+
+
+def upgrade():
+    with op.batch_alter_table('youtube_playlist') as batch_op:
+        batch_op.add_column(sa.Column('integration_account_id', sa.Integer(), nullable=True))
+        batch_op.create_index('ix_youtube_playlist_integration_account_id', ['integration_account_id'], unique=False)
+        batch_op.create_foreign_key('fk_youtube_playlist_integration_account_id', 'google_integration_account',
+                                    ['integration_account_id'], ['id'])
+
+    op.execute(sa.text(f"""
+        INSERT INTO youtube_playlist (playlist_id, title, integration_account_id, synced_at)
+        SELECT youtube_playlist_id, MAX(title), MAX(integration_account_id), MAX(published_at)
+        FROM video
+        WHERE {PLACEHOLDER_VIDEO}
+          AND youtube_playlist_id NOT IN (SELECT playlist_id FROM youtube_playlist)
+        GROUP BY youtube_playlist_id
+    """))
+    op.execute(sa.text(f"""
+        DELETE FROM video
+        WHERE {PLACEHOLDER_VIDEO}
+          AND video_id NOT IN (SELECT video_id FROM video_content_hash)
+    """))
+
+
+def downgrade():
+    # Placeholder video rows are not recreated; the playlists stay in youtube_playlist
+    with op.batch_alter_table('youtube_playlist') as batch_op:
+        batch_op.drop_constraint('fk_youtube_playlist_integration_account_id', type_='foreignkey')
+        batch_op.drop_index('ix_youtube_playlist_integration_account_id')
+        batch_op.drop_column('integration_account_id')
@@ -0,0 +1,45 @@
+"""add upload_job table
+
+Revision ID: a7d41c9e2b15
+Revises: 3f1c2a7b9e40
+Create Date: 2026-10-18 11:40:07.518342
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7d41c9e2b15'
+down_revision = '3f1c2a7b9e40'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('upload_job',
+    sa.Column('id', sa.String(), nullable=False),
+    sa.Column('status', sa.String(), nullable=False),
+    sa.Column('stage', sa.String(), nullable=True),
+    sa.Column('file_path', sa.String(), nullable=False),
+    sa.Column('title', sa.String(), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('class_code', sa.String(), nullable=False),
+    sa.Column('class_name', sa.String(), nullable=True),
+    sa.Column('post_to_classroom', sa.Boolean(), nullable=True),
+    sa.Column('integration_account_id', sa.Integer(), nullable=False),
+    sa.Column('uploaded_by', sa.Integer(), nullable=True),
+    sa.Column('context', sa.Text(), nullable=True),
+    sa.Column('error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['integration_account_id'], ['google_integration_account.id'], ),
+    sa.ForeignKeyConstraint(['uploaded_by'], ['user_account.id'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_upload_job_uploaded_by', 'upload_job', ['uploaded_by'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_upload_job_uploaded_by', table_name='upload_job')
+    op.drop_table('upload_job')
@@ -0,0 +1,35 @@
+"""add video_content_hash table
+
+Revision ID: c52e8f03d1a6
+Revises: a7d41c9e2b15
+Create Date: 2026-10-18 13:05:22.840615
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c52e8f03d1a6'
+down_revision = 'a7d41c9e2b15'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('video_content_hash',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('sha256', sa.String(length=64), nullable=False),
+    sa.Column('video_id', sa.String(), nullable=False),
+    sa.Column('file_size', sa.BigInteger(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['video_id'], ['video.video_id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('sha256')
+    )
+    op.create_index('ix_video_content_hash_video_id', 'video_content_hash', ['video_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_video_content_hash_video_id', table_name='video_content_hash')
+    op.drop_table('video_content_hash')
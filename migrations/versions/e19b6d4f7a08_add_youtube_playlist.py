@@ -0,0 +1,33 @@
+"""add youtube_playlist table
+
+Revision ID: e19b6d4f7a08
+Revises: c52e8f03d1a6
+Create Date: 2026-10-18 14:21:56.107394
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e19b6d4f7a08'
+down_revision = 'c52e8f03d1a6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table('youtube_playlist',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('playlist_id', sa.String(), nullable=False),
+    sa.Column('title', sa.String(), nullable=True),
+    sa.Column('synced_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('playlist_id')
+    )
+    op.create_index('ix_youtube_playlist_title', 'youtube_playlist', ['title'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_youtube_playlist_title', table_name='youtube_playlist')
+    op.drop_table('youtube_playlist')
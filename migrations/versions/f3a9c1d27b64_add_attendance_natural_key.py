@@ -0,0 +1,35 @@
+"""add unique (student_id, class_id, date) index on attendance
+
+Revision ID: f3a9c1d27b64
+Revises: e19b6d4f7a08
+Create Date: 2026-10-18 15:42:10.318204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f3a9c1d27b64'
+down_revision = 'e19b6d4f7a08'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Keep the most recent mark when a student was recorded twice for the same class and day
+    op.execute(sa.text("""
+        DELETE FROM attendance
+        WHERE student_id IS NOT NULL AND class_id IS NOT NULL AND date IS NOT NULL
+          AND id NOT IN (
+              SELECT MAX(id) FROM attendance
+              WHERE student_id IS NOT NULL AND class_id IS NOT NULL AND date IS NOT NULL
+              GROUP BY student_id, class_id, date
+          )
+    """))
+    op.create_index('uq_attendance_student_class_date', 'attendance',
+                    ['student_id', 'class_id', 'date'], unique=True)
+
+
+def downgrade():
+    op.drop_index('uq_attendance_student_class_date', table_name='attendance')
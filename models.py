@@ -0,0 +1,327 @@
+from datetime import datetime
+
+from flask_login import UserMixin
+from sqlalchemy import func
+from sqlalchemy.orm import aliased
+
+from extensions import db
+from passwords import hash_password, needs_rehash, verify_password
+
+
+# === Updated Models from DBML ===
+class UserAccount(UserMixin, db.Model):
+    __tablename__ = 'user_account'
+    id = db.Column(db.Integer, primary_key=True)
+    username = db.Column(db.String, unique=True, nullable=False)
+    email = db.Column(db.String, unique=True, nullable=False)
+    password_hash = db.Column(db.String, nullable=False)
+    role = db.Column(db.String)
+    active = db.Column(db.Boolean, default=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    google_email = db.Column(db.String)
+    profile_picture_url = db.Column(db.Text)
+    # Relationships
+    classes_taught = db.relationship('Class', foreign_keys='Class.class_teacher', backref='teacher', lazy='dynamic')
+    classes_updated = db.relationship('Class', foreign_keys='Class.updated_by', backref='class_updated_by', lazy='dynamic')
+    videos_uploaded = db.relationship('Video', foreign_keys='Video.uploaded_by', backref='uploader', lazy='dynamic')
+    student_fees_updated = db.relationship('StudentFee', foreign_keys='StudentFee.updated_by', backref='fee_updated_by', lazy='dynamic')
+    attendances_updated = db.relationship('Attendance', foreign_keys='Attendance.updated_by', backref='attendance_updated_by', lazy='dynamic')
+    payments_updated = db.relationship('Payment', foreign_keys='Payment.updated_by', backref='payment_updated_by', lazy='dynamic')
+    google_accounts_owned = db.relationship('GoogleIntegrationAccount', foreign_keys='GoogleIntegrationAccount.owner_user_id', backref='owner', lazy='dynamic')
+    google_courses_created = db.relationship('GoogleClassroomCourse', foreign_keys='GoogleClassroomCourse.created_by', backref='course_creator', lazy='dynamic')
+
+    def set_password(self, password):
+        self.password_hash = hash_password(password)
+
+    def check_password(self, password):
+        return verify_password(self.password_hash, password)
+
+    def password_needs_rehash(self):
+        return needs_rehash(self.password_hash)
+
+class Class(db.Model):
+    __tablename__ = 'class'
+    id = db.Column(db.Integer, primary_key=True)
+    class_code = db.Column(db.String, unique=True, nullable=False)
+    class_status = db.Column(db.String)
+    class_name = db.Column(db.String)
+    subject = db.Column(db.String)
+    year_level = db.Column(db.String)
+    batch = db.Column(db.String)
+    sub_batch = db.Column(db.String)
+    class_type = db.Column(db.String)
+    description = db.Column(db.String)
+    playlist_id = db.Column(db.String)
+    class_created = db.Column(db.DateTime)
+    class_teacher = db.Column(db.Integer, db.ForeignKey('user_account.id'), index=True)
+    class_day = db.Column(db.String)
+    class_time = db.Column(db.String)
+    class_location = db.Column(db.String)
+    updated_by = db.Column(db.Integer, db.ForeignKey('user_account.id'))
+    updated_at = db.Column(db.DateTime)
+    # Relationships
+    videos = db.relationship('Video', backref='class_', lazy='dynamic')
+    assignments = db.relationship('StudentClassAssignment', backref='class_', lazy='dynamic')
+    fees = db.relationship('StudentFee', backref='class_', lazy='dynamic')
+    attendances = db.relationship('Attendance', backref='class_', lazy='dynamic')
+    google_courses = db.relationship('GoogleClassroomCourse', backref='class_', lazy='dynamic')
+
+class Video(db.Model):
+    __tablename__ = 'video'
+    id = db.Column(db.Integer, primary_key=True)
+    video_id = db.Column(db.String, unique=True, nullable=False)
+    title = db.Column(db.String)
+    class_id = db.Column(db.Integer, db.ForeignKey('class.id'), index=True)
+    youtube_playlist_id = db.Column(db.String, index=True)
+    classroom_posted = db.Column(db.Boolean)
+    integration_account_id = db.Column(db.Integer, db.ForeignKey('google_integration_account.id'), nullable=False, index=True)
+    uploaded_by = db.Column(db.Integer, db.ForeignKey('user_account.id'))
+    published_at = db.Column(db.DateTime)
+
+class Student(db.Model):
+    __tablename__ = 'student'
+    id = db.Column(db.Integer, primary_key=True)
+    student_code = db.Column(db.String, unique=True, nullable=False)
+    first_name = db.Column(db.String, nullable=False)
+    last_name = db.Column(db.String, nullable=False)
+    dob = db.Column(db.Date)
+    gender = db.Column(db.String)
+    contact_number = db.Column(db.String)
+    grade_school = db.Column(db.String)
+    student_email = db.Column(db.String)
+    address = db.Column(db.String)
+    notes = db.Column(db.Text)
+    status = db.Column(db.String)
+    created_at = db.Column(db.DateTime)
+    updated_by = db.Column(db.Integer, db.ForeignKey('user_account.id'))
+    updated_at = db.Column(db.DateTime)
+    # Relationships
+    parents = db.relationship('Parent', backref='student', lazy='dynamic')
+    assignments = db.relationship('StudentClassAssignment', backref='student', lazy='dynamic')
+    fees = db.relationship('StudentFee', backref='student', lazy='dynamic')
+    attendances = db.relationship('Attendance', backref='student', lazy='dynamic')
+    payments = db.relationship('Payment', backref='student', lazy='dynamic')
+
+class Parent(db.Model):
+    __tablename__ = 'parent'
+    id = db.Column(db.Integer, primary_key=True)
+    student_id = db.Column(db.Integer, db.ForeignKey('student.id'), index=True)
+    name = db.Column(db.String, nullable=False)
+    relationship = db.Column(db.String)
+    contact_number = db.Column(db.String)
+    parent_email = db.Column(db.String)
+
+class StudentClassAssignment(db.Model):
+    __tablename__ = 'student_class_assignment'
+    id = db.Column(db.Integer, primary_key=True)
+    student_id = db.Column(db.Integer, db.ForeignKey('student.id'), index=True)
+    class_id = db.Column(db.Integer, db.ForeignKey('class.id'), index=True)
+    enrolled_from = db.Column(db.Date)
+    enrolled_to = db.Column(db.Date)
+    is_primary = db.Column(db.Boolean)
+
+class StudentFee(db.Model):
+    __tablename__ = 'student_fee'
+    id = db.Column(db.Integer, primary_key=True)
+    student_id = db.Column(db.Integer, db.ForeignKey('student.id'), index=True)
+    class_id = db.Column(db.Integer, db.ForeignKey('class.id'), index=True)
+    fee_type = db.Column(db.String)
+    amount_due = db.Column(db.Float)
+    amount_paid = db.Column(db.Float)
+    discount = db.Column(db.Float)
+    due_date = db.Column(db.Date)
+    payment_status = db.Column(db.String)
+    notes = db.Column(db.Text)
+    updated_by = db.Column(db.Integer, db.ForeignKey('user_account.id'))
+    updated_at = db.Column(db.DateTime)
+
+class Attendance(db.Model):
+    __tablename__ = 'attendance'
+    __table_args__ = (
+        db.Index('ix_attendance_class_id_date', 'class_id', 'date'),
+        db.Index('ix_attendance_student_id_date', 'student_id', 'date'),
+        # Natural key: one mark per student, class and day (bulk upserts conflict on it)
+        db.Index('uq_attendance_student_class_date', 'student_id', 'class_id', 'date', unique=True),
+    )
+    id = db.Column(db.Integer, primary_key=True)
+    student_id = db.Column(db.Integer, db.ForeignKey('student.id'))
+    class_id = db.Column(db.Integer, db.ForeignKey('class.id'))
+    date = db.Column(db.Date)
+    status = db.Column(db.String)
+    notes = db.Column(db.Text)
+    updated_by = db.Column(db.Integer, db.ForeignKey('user_account.id'))
+    updated_at = db.Column(db.DateTime)
+
+class Payment(db.Model):
+    __tablename__ = 'payment'
+    id = db.Column(db.Integer, primary_key=True)
+    student_id = db.Column(db.Integer, db.ForeignKey('student.id'), index=True)
+    fee_id = db.Column(db.Integer, db.ForeignKey('student_fee.id'), index=True)
+    amount = db.Column(db.Float)
+    date = db.Column(db.DateTime)
+    method = db.Column(db.String)
+    reference = db.Column(db.String)
+    notes = db.Column(db.Text)
+    updated_by = db.Column(db.Integer, db.ForeignKey('user_account.id'))
+    updated_at = db.Column(db.DateTime)
+
+class GoogleIntegrationAccount(db.Model):
+    __tablename__ = 'google_integration_account'
+    id = db.Column(db.Integer, primary_key=True)
+    account_name = db.Column(db.String)
+    google_email = db.Column(db.String, unique=True, nullable=False)
+    access_token = db.Column(db.Text)
+    refresh_token = db.Column(db.Text)
+    owner_user_id = db.Column(db.Integer, db.ForeignKey('user_account.id'), nullable=False, index=True)
+    created_at = db.Column(db.DateTime)
+    last_synced = db.Column(db.DateTime)
+    # Relationships
+    videos = db.relationship('Video', backref='integration_account', lazy='dynamic')
+    permissions = db.relationship('GoogleAccountPermissions', backref='integration_account', lazy='dynamic')
+    classroom_courses = db.relationship('GoogleClassroomCourse', backref='integration_account', lazy='dynamic')
+
+class GoogleAccountPermissions(db.Model):
+    __tablename__ = 'google_account_permissions'
+    id = db.Column(db.Integer, primary_key=True)
+    integration_account_id = db.Column(db.Integer, db.ForeignKey('google_integration_account.id'), nullable=False, index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user_account.id'), nullable=False, index=True)
+    permission_level = db.Column(db.String)
+
+class GoogleClassroomCourse(db.Model):
+    __tablename__ = 'google_classroom_course'
+    __table_args__ = (
+        db.Index('ix_google_classroom_course_class_id_created_at', 'class_id', 'created_at'),
+    )
+    id = db.Column(db.Integer, primary_key=True)
+    course_id = db.Column(db.String, unique=True, nullable=False)
+    name = db.Column(db.String)
+    section = db.Column(db.String)
+    join_code = db.Column(db.String)
+    class_id = db.Column(db.Integer, db.ForeignKey('class.id'))
+    integration_account_id = db.Column(db.Integer, db.ForeignKey('google_integration_account.id'), nullable=False, index=True)
+    created_by = db.Column(db.Integer, db.ForeignKey('user_account.id'))
+    created_at = db.Column(db.DateTime)
+
+class UploadJob(db.Model):
+    __tablename__ = 'upload_job'
+    id = db.Column(db.String, primary_key=True)
+    status = db.Column(db.String, nullable=False, default='queued')
+    stage = db.Column(db.String)
+    file_path = db.Column(db.String, nullable=False)
+    title = db.Column(db.String, nullable=False)
+    description = db.Column(db.Text)
+    class_code = db.Column(db.String, nullable=False)
+    class_name = db.Column(db.String)
+    post_to_classroom = db.Column(db.Boolean, default=False)
+    integration_account_id = db.Column(db.Integer, db.ForeignKey('google_integration_account.id'), nullable=False)
+    uploaded_by = db.Column(db.Integer, db.ForeignKey('user_account.id'), index=True)
+    context = db.Column(db.Text)  # JSON: stage outputs, timings and errors
+    error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime)
+
+class SyncJob(db.Model):
+    __tablename__ = 'sync_job'
+    id = db.Column(db.String, primary_key=True)
+    kind = db.Column(db.String, nullable=False)  # see google_sync.SYNC_KINDS
+    status = db.Column(db.String, nullable=False, default='queued')
+    context = db.Column(db.Text)  # JSON: accounts to sync and per-account results
+    error = db.Column(db.Text)
+    requested_by = db.Column(db.Integer, db.ForeignKey('user_account.id'), index=True)
+    created_at = db.Column(db.DateTime)
+    updated_at = db.Column(db.DateTime)
+
+class YouTubePlaylist(db.Model):
+    __tablename__ = 'youtube_playlist'
+    id = db.Column(db.Integer, primary_key=True)
+    playlist_id = db.Column(db.String, unique=True, nullable=False)
+    title = db.Column(db.String, index=True)
+    integration_account_id = db.Column(db.Integer, db.ForeignKey('google_integration_account.id'), index=True)
+    synced_at = db.Column(db.DateTime)
+
+class VideoContentHash(db.Model):
+    __tablename__ = 'video_content_hash'
+    id = db.Column(db.Integer, primary_key=True)
+    sha256 = db.Column(db.String(64), unique=True, nullable=False)
+    video_id = db.Column(db.String, db.ForeignKey('video.video_id'), nullable=False, index=True)
+    file_size = db.Column(db.BigInteger)
+    created_at = db.Column(db.DateTime)
+
+class StudentCodeSequence(db.Model):
+    """Last STU-YYYY-NNNN number issued per year; advanced atomically by student_codes.py."""
+    __tablename__ = 'student_code_sequence'
+    year = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    last_value = db.Column(db.Integer, nullable=False, default=0)
+
+class TableVersion(db.Model):
+    """Change counter per table, bumped by every committed write (see table_versions.py)."""
+    __tablename__ = 'table_version'
+    table_name = db.Column(db.String, primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+# === Class Catalogue Queries ===
+def latest_course_per_class():
+    """Return an alias over GoogleClassroomCourse ranked newest-first per class.
+
+    Rows with ``rank == 1`` are the latest linked course for each class, so the
+    whole catalogue can be fetched with a single outer join instead of one
+    query per class.
+    """
+    ranked = db.session.query(
+        GoogleClassroomCourse,
+        func.row_number().over(
+            partition_by=GoogleClassroomCourse.class_id,
+            order_by=(GoogleClassroomCourse.created_at.desc(), GoogleClassroomCourse.id.desc())
+        ).label('rank')
+    ).subquery()
+    return aliased(GoogleClassroomCourse, ranked), ranked.c.rank
+
+
+def class_catalogue_query():
+    """Query yielding ``(Class, GoogleClassroomCourse | None)`` pairs in one statement."""
+    latest, rank = latest_course_per_class()
+    return (
+        db.session.query(Class, latest)
+        .outerjoin(latest, (latest.class_id == Class.id) & (rank == 1))
+        .order_by(Class.id)
+    )
+
+
+def serialize_class(c, gclass):
+    return {
+        "class_code": c.class_code,
+        "class_name": c.class_name,
+        "subject": c.subject,
+        "year_level": c.year_level,
+        "batch": c.batch,
+        "sub_batch": c.sub_batch,
+        "class_type": c.class_type,
+        "description": c.description,
+        "playlist_id": c.playlist_id,
+        "gclass_linked": bool(gclass),
+        "courseId": gclass.course_id if gclass else None,
+        "joinCode": gclass.join_code if gclass else None,
+        "classroom_name": gclass.name if gclass else None,
+        "classroom_section": gclass.section if gclass else None,
+        "last_updated": c.last_updated.isoformat() if getattr(c, 'last_updated', None) else None,
+        "updated_at": c.updated_at.isoformat() if c.updated_at else None,
+        "class_created": c.class_created.isoformat() if c.class_created else None,
+        "class_teacher": c.class_teacher,
+        "class_day": c.class_day,
+        "class_time": c.class_time,
+        "class_location": c.class_location,
+        "class_status": c.class_status
+    }
+
+
+def class_catalogue():
+    """Return every class keyed by class_code, with its latest Google Classroom link."""
+    return {c.class_code: serialize_class(c, gclass) for c, gclass in class_catalogue_query()}
+
+
+def latest_course_for_class(class_id):
+    return (
+        GoogleClassroomCourse.query.filter_by(class_id=class_id)
+        .order_by(GoogleClassroomCourse.created_at.desc())
+        .first()
+    )
@@ -0,0 +1,145 @@
+import base64
+import json
+from datetime import date, datetime
+
+from flask import jsonify, request
+from sqlalchemy import and_, or_
+
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+RANGE_SUFFIXES = {"__gte": "__ge__", "__lte": "__le__"}
+
+
+class PaginationError(ValueError):
+    """Raised for a malformed cursor, limit, sort or filter argument."""
+
+
+# --- CURSORS ---
+def encode_cursor(sort_value, last_id):
+    if isinstance(sort_value, (date, datetime)):
+        sort_value = sort_value.isoformat()
+    raw = json.dumps([sort_value, last_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor, column):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, last_id = json.loads(base64.urlsafe_b64decode(padded))
+        return coerce_value(column, sort_value), int(last_id)
+    except (ValueError, TypeError) as e:
+        raise PaginationError(f"Invalid cursor: {e}")
+
+
+def coerce_value(column, value):
+    """Convert a query-string/cursor value to the Python type of ``column``."""
+    if value is None or value == "":
+        return None
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        return value
+    if python_type is bool:
+        return str(value).lower() in ("1", "true", "yes")
+    try:
+        if python_type is datetime:
+            return datetime.fromisoformat(value)
+        if python_type is date:
+            return date.fromisoformat(value)
+        return python_type(value)
+    except (ValueError, TypeError):
+        raise PaginationError(f"Invalid value for {column.key}: {value!r}")
+
+
+# --- QUERY BUILDING ---
+def apply_filters(query, model, args, filter_fields):
+    """Apply ``field=value``, ``field__gte=value`` and ``field__lte=value`` filters."""
+    for field in filter_fields:
+        column = getattr(model, field)
+        if field in args:
+            value = coerce_value(column, args[field])
+            query = query.filter(column.is_(None) if value is None else column == value)
+        for suffix, op in RANGE_SUFFIXES.items():
+            if field + suffix in args:
+                query = query.filter(getattr(column, op)(coerce_value(column, args[field + suffix])))
+    return query
+
+
+def keyset_condition(column, id_column, sort_value, last_id, descending):
+    """Rows strictly after ``(sort_value, last_id)`` in the (nulls last) sort order."""
+    if column is id_column:
+        return id_column < last_id if descending else id_column > last_id
+    if sort_value is None:
+        return and_(column.is_(None), id_column < last_id if descending else id_column > last_id)
+    beyond = column < sort_value if descending else column > sort_value
+    tie = and_(column == sort_value, id_column < last_id if descending else id_column > last_id)
+    return or_(beyond, tie, column.is_(None))
+
+
+def keyset_page(query, model, serialize, filter_fields=(), sort_fields=("id",), row_model=None,
+                with_total=False):
+    """
+    Return one page of ``query`` as a JSON-ready envelope.
+
+    Pages are addressed by an opaque ``cursor`` over ``(sort column, id)``
+    rather than an offset, so fetching page N costs the same as page 1.
+    Query args: ``limit``, ``cursor``, ``sort`` (``field`` or ``-field``) and
+    any of ``filter_fields`` (with optional ``__gte``/``__lte`` suffixes).
+
+    When ``query`` selects more than one entity, ``row_model(row)`` picks the
+    ``model`` instance out of each row; ``serialize`` still gets the whole
+    row. With ``with_total``, the first page also reports the match count.
+    """
+    args = request.args
+    try:
+        limit = int(args.get("limit", DEFAULT_LIMIT))
+    except ValueError:
+        raise PaginationError("limit must be an integer")
+    limit = max(1, min(limit, MAX_LIMIT))
+
+    sort = args.get("sort", "id")
+    descending = sort.startswith("-")
+    sort_field = sort.lstrip("-")
+    if sort_field != "id" and sort_field not in sort_fields:
+        raise PaginationError(f"Cannot sort by {sort_field!r}")
+    id_column = model.id
+    column = getattr(model, sort_field)
+
+    query = apply_filters(query, model, args, filter_fields)
+    total = query.order_by(None).count() if with_total and not args.get("cursor") else None
+    if args.get("cursor"):
+        sort_value, last_id = decode_cursor(args["cursor"], column)
+        query = query.filter(keyset_condition(column, id_column, sort_value, last_id, descending))
+
+    if column is id_column:
+        order = [id_column.desc() if descending else id_column.asc()]
+    else:
+        order = [
+            column.is_(None),
+            column.desc() if descending else column.asc(),
+            id_column.desc() if descending else id_column.asc(),
+        ]
+    rows = query.order_by(*order).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = row_model(rows[-1]) if row_model else rows[-1]
+        next_cursor = encode_cursor(getattr(last, sort_field), last.id)
+    page = {
+        "items": [serialize(row) for row in rows],
+        "next_cursor": next_cursor,
+        "limit": limit,
+        "sort": sort,
+    }
+    if total is not None:
+        page["total"] = total
+    return page
+
+
+def paginated_response(query, model, serialize, filter_fields=(), sort_fields=("id",), row_model=None,
+                       with_total=False):
+    try:
+        return jsonify(keyset_page(query, model, serialize, filter_fields, sort_fields, row_model, with_total))
+    except PaginationError as e:
+        return jsonify({"status": "error", "message": str(e)}), 400
@@ -0,0 +1,66 @@
+import sys
+
+from flask import current_app, has_app_context
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS, check_password_hash, generate_password_hash
+
+from config import Config
+
+
+# --- HASH PARAMETERS ---
+def canonical_method(method):
+    """
+    ``method`` spelled the way Werkzeug records it at the start of a hash,
+    e.g. ``scrypt`` -> ``scrypt:32768:8:1``, so stored hashes can be compared
+    with the setting. Raises ValueError for an unsupported method.
+    """
+    name, *args = method.split(":")
+    if name == "scrypt":
+        if len(args) not in (0, 3):
+            raise ValueError(f"Invalid PASSWORD_HASH_METHOD {method!r}: use scrypt:N:r:p")
+        return "scrypt:{}:{}:{}".format(*(map(int, args) if args else (2 ** 15, 8, 1)))
+    if name == "pbkdf2":
+        if len(args) > 2:
+            raise ValueError(f"Invalid PASSWORD_HASH_METHOD {method!r}: use pbkdf2:hash:iterations")
+        hash_name = args[0] if args else "sha256"
+        iterations = int(args[1]) if len(args) == 2 else DEFAULT_PBKDF2_ITERATIONS
+        return f"pbkdf2:{hash_name}:{iterations}"
+    raise ValueError(f"Invalid PASSWORD_HASH_METHOD {method!r}: use scrypt or pbkdf2")
+
+
+def hash_method():
+    method = current_app.config["PASSWORD_HASH_METHOD"] if has_app_context() else Config.PASSWORD_HASH_METHOD
+    return canonical_method(method)
+
+
+def needs_rehash(password_hash):
+    """True if ``password_hash`` was made with other settings than PASSWORD_HASH_METHOD."""
+    return password_hash.split("$", 1)[0] != hash_method()
+
+
+# --- HASHING ---
+def off_request_thread(fn, *args):
+    """
+    Run CPU-heavy ``fn`` in a native thread when the worker is async.
+
+    Under gevent or eventlet every request shares one OS thread, and a
+    100 ms hash would stall all of them; hashlib releases the GIL, so in a
+    real thread it runs alongside the event loop. Sync and gthread workers
+    already give each request its own thread and call ``fn`` directly.
+    """
+    if "gevent" in sys.modules:
+        from gevent import get_hub, monkey
+        if monkey.is_module_patched("socket"):
+            return get_hub().threadpool.apply(fn, args)
+    if "eventlet" in sys.modules:
+        from eventlet import patcher, tpool
+        if patcher.is_monkey_patched("socket"):
+            return tpool.execute(fn, *args)
+    return fn(*args)
+
+
+def hash_password(password):
+    return off_request_thread(generate_password_hash, password, hash_method())
+
+
+def verify_password(password_hash, password):
+    return off_request_thread(check_password_hash, password_hash, password)
@@ -0,0 +1,222 @@
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict, namedtuple
+from functools import wraps
+
+from flask import current_app, has_app_context
+
+from extensions import db
+from table_versions import changed_tables, on_tables_committed, table_versions
+
+CacheEntry = namedtuple("CacheEntry", "versions expires_at value")
+
+
+# --- VERSION BACKENDS ---
+class DatabaseVersions:
+    """
+    Versions from the ``table_version`` table, which table_versions.py bumps
+    inside every writing transaction. Shared by every worker and host on the
+    database, at the cost of one primary-key query per cache lookup.
+    """
+    name = "database"
+
+    def current(self, tables):
+        return table_versions(db.session, tables)
+
+    def bump(self, tables):
+        pass  # already committed with the data
+
+
+class FileVersions:
+    """
+    One stamp file per table in ``directory``, rewritten after each commit
+    that touched the table. Workers on the same host see each other's writes
+    without a database round trip; writes from other hosts or from outside
+    the app are only picked up when entries expire.
+    """
+    name = "file"
+
+    def __init__(self, directory):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, table):
+        return os.path.join(self.directory, f"{table}.version")
+
+    def current(self, tables):
+        versions = []
+        for table in tables:
+            try:
+                with open(self.path(table)) as f:
+                    versions.append(f.read())
+            except FileNotFoundError:
+                versions.append("")
+        return tuple(versions)
+
+    def bump(self, tables):
+        for table in tables:
+            # Write then rename, so readers never see a half-written stamp
+            tmp = f"{self.path(table)}.{os.getpid()}.{threading.get_ident()}"
+            with open(tmp, "w") as f:
+                f.write(uuid.uuid4().hex)
+            os.replace(tmp, self.path(table))
+
+
+class LocalVersions:
+    """In-process counters: for a single worker, or tests. Other processes' writes wait for the TTL."""
+    name = "local"
+
+    def __init__(self):
+        self.versions = {}
+        self.lock = threading.Lock()
+
+    def current(self, tables):
+        return tuple(self.versions.get(table, 0) for table in tables)
+
+    def bump(self, tables):
+        with self.lock:
+            for table in tables:
+                self.versions[table] = self.versions.get(table, 0) + 1
+
+
+VERSION_BACKENDS = {
+    "database": lambda config: DatabaseVersions(),
+    "file": lambda config: FileVersions(config["READ_CACHE_DIR"]),
+    "local": lambda config: LocalVersions(),
+}
+
+
+# --- CACHE ---
+class ReadCache:
+    """
+    Bounded LRU cache of query results, each stored with the versions of the
+    tables it was read from.
+
+    A lookup reads the current versions first and is a hit only if they
+    still match and the entry is younger than ``ttl`` seconds; otherwise the
+    loader runs and its result replaces the entry. Reading the versions
+    before loading means a concurrent write can only make an entry stale
+    early, never keep it alive. ``ttl`` 0 turns caching off. Cached values
+    are shared between requests and must not be mutated.
+    """
+
+    def __init__(self, backend, max_entries=256, ttl=300, clock=time.monotonic):
+        self.backend = backend
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.clock = clock
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.stats = {}
+        self.evictions = 0
+
+    def counters(self, name):
+        return self.stats.setdefault(name, {"hits": 0, "misses": 0, "stale": 0, "expired": 0})
+
+    def get_or_load(self, name, key, tables, load, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        if not ttl:
+            return load()
+        versions = self.backend.current(tables)
+        now = self.clock()
+        with self.lock:
+            counters = self.counters(name)
+            entry = self.entries.get((name, key))
+            if entry is not None and entry.versions == versions and entry.expires_at > now:
+                self.entries.move_to_end((name, key))
+                counters["hits"] += 1
+                return entry.value
+            counters["misses"] += 1
+            if entry is not None:
+                counters["stale" if entry.versions != versions else "expired"] += 1
+
+        value = load()
+        with self.lock:
+            self.entries[(name, key)] = CacheEntry(versions, now + ttl, value)
+            self.entries.move_to_end((name, key))
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+        return value
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def snapshot(self):
+        with self.lock:
+            caches = {}
+            for name, counters in sorted(self.stats.items()):
+                lookups = counters["hits"] + counters["misses"]
+                caches[name] = dict(counters, hit_ratio=round(counters["hits"] / lookups, 3) if lookups else None)
+            return {
+                "backend": self.backend.name,
+                "entries": len(self.entries),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "evictions": self.evictions,
+                "caches": caches,
+            }
+
+
+# app.extensions key -> config prefix
+CACHES = {
+    "read_cache": "READ_CACHE",
+    "identity_cache": "USER_CACHE",
+}
+
+
+def get_read_cache(cache="read_cache"):
+    return current_app.extensions[cache]
+
+
+def cached(*tables, ttl=None, cache="read_cache"):
+    """
+    Decorator caching a function of hashable arguments whose result depends
+    only on ``tables``. The result must be plain data (dicts, lists, tuples),
+    not ORM objects, which belong to the session that loaded them.
+    """
+    def decorator(fn):
+        name = fn.__name__
+
+        @wraps(fn)
+        def wrapper(*args):
+            if changed_tables(db.session) & set(tables):
+                # Uncommitted writes of this transaction are in no cached entry
+                return fn(*args)
+            return get_read_cache(cache).get_or_load(name, args, tables, lambda: fn(*args), ttl)
+        wrapper.uncached = fn
+        return wrapper
+    return decorator
+
+
+def cache_snapshots():
+    return {cache: current_app.extensions[cache].snapshot() for cache in CACHES}
+
+
+def bump_committed_tables(tables):
+    if has_app_context():
+        backends = {id(cache.backend): cache.backend
+                    for cache in map(current_app.extensions.get, CACHES) if cache is not None}
+        for backend in backends.values():
+            backend.bump(tables)
+
+
+def install_read_cache(app):
+    """
+    Give ``app`` its own caches, configured from READ_CACHE_* and USER_CACHE_*.
+
+    The caches live in the worker process; only the version backend is
+    shared, so workers invalidate each other without sharing entries.
+    """
+    backends = {}
+    for cache, prefix in CACHES.items():
+        name = app.config[f"{prefix}_BACKEND"]
+        if name not in backends:
+            backends[name] = VERSION_BACKENDS[name](app.config)
+        app.extensions[cache] = ReadCache(
+            backends[name], max_entries=app.config[f"{prefix}_MAX_ENTRIES"], ttl=app.config[f"{prefix}_TTL"]
+        )
+    on_tables_committed(bump_committed_tables)
@@ -0,0 +1,68 @@
+from extensions import db
+from models import (Class, GoogleClassroomCourse, GoogleIntegrationAccount, YouTubePlaylist,
+                    class_catalogue as build_class_catalogue)
+from read_cache import cached
+
+# Reference data read on most pages. Each function names the tables its
+# result is built from; a commit writing any of them, from any worker,
+# invalidates the cached result (see read_cache.py).
+CLASS_OPTION_FIELDS = ('subject', 'year_level', 'batch')
+
+
+@cached('class', 'google_classroom_course')
+def class_catalogue():
+    """Every class keyed by class_code, with its latest Google Classroom link."""
+    return build_class_catalogue()
+
+
+@cached('class')
+def class_filter_options():
+    """Distinct non-empty subject, year level and batch values, for the class filters."""
+    return {
+        field: [value for (value,) in db.session.query(getattr(Class, field)).filter(
+            getattr(Class, field).isnot(None), getattr(Class, field) != ""
+        ).distinct().order_by(getattr(Class, field))]
+        for field in CLASS_OPTION_FIELDS
+    }
+
+
+@cached('google_classroom_course')
+def classroom_courses():
+    return [
+        {
+            'id': c.id,
+            'course_id': c.course_id,
+            'name': c.name,
+            'section': c.section,
+            'join_code': c.join_code,
+            'class_id': c.class_id
+        } for c in GoogleClassroomCourse.query.all()
+    ]
+
+
+@cached('youtube_playlist')
+def youtube_playlists():
+    playlists = db.session.query(
+        YouTubePlaylist.playlist_id, YouTubePlaylist.title, YouTubePlaylist.integration_account_id
+    ).order_by(YouTubePlaylist.title).all()
+    return [
+        {
+            'id': pid,
+            'playlist_id': pid,
+            'title': title,
+            'integration_account_id': account_id
+        } for pid, title, account_id in playlists
+    ]
+
+
+@cached('google_integration_account')
+def google_accounts():
+    """id, name and email of every integration account; tokens are never cached."""
+    return [
+        {'id': acc_id, 'account_name': name, 'google_email': email}
+        for acc_id, name, email in db.session.query(
+            GoogleIntegrationAccount.id, GoogleIntegrationAccount.account_name,
+            GoogleIntegrationAccount.google_email
+        ).order_by(GoogleIntegrationAccount.id)
+    ]
+
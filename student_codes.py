@@ -0,0 +1,54 @@
+from datetime import datetime
+
+from extensions import db
+from database import upsert_insert
+from models import Student, StudentCodeSequence
+
+sequence = StudentCodeSequence.__table__
+
+
+def format_student_code(year, number):
+    return f"STU-{year}-{str(number).zfill(4)}"
+
+
+def highest_issued_number(year):
+    """Highest NNNN among existing STU-YYYY-NNNN codes; only used to seed a year's counter."""
+    prefix = f"STU-{year}-"
+    highest = 0
+    for (code,) in db.session.query(Student.student_code).filter(Student.student_code.like(f"{prefix}%")):
+        try:
+            highest = max(highest, int(code[len(prefix):]))
+        except ValueError:
+            pass
+    return highest
+
+
+def reserve_student_numbers(count, year):
+    """
+    Advance the year's counter by ``count`` and return the last number reserved.
+
+    The single UPDATE .. RETURNING is atomic, so concurrent workers always get
+    disjoint ranges. It runs in the caller's transaction: the counter row stays
+    locked until the students are committed, and a rollback hands the numbers
+    back, so codes stay gap-free.
+    """
+    advance = (
+        sequence.update()
+        .where(sequence.c.year == year)
+        .values(last_value=sequence.c.last_value + count)
+        .returning(sequence.c.last_value)
+    )
+    last = db.session.execute(advance).scalar()
+    if last is None:
+        # First code of the year: create the counter, then advance it as usual
+        seed = upsert_insert(db.session, StudentCodeSequence).values(year=year, last_value=highest_issued_number(year))
+        db.session.execute(seed.on_conflict_do_nothing(index_elements=['year']))
+        last = db.session.execute(advance).scalar()
+    return last
+
+
+def allocate_student_codes(count, year=None):
+    """Reserve ``count`` consecutive STU-YYYY-NNNN codes with one counter update."""
+    year = year or datetime.now().year
+    last = reserve_student_numbers(count, year)
+    return [format_student_code(year, n) for n in range(last - count + 1, last + 1)]
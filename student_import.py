@@ -0,0 +1,253 @@
+import codecs
+import csv
+import io
+import re
+from datetime import date, datetime
+
+from sqlalchemy import insert
+
+from extensions import db
+from models import Class, Parent, Student, StudentClassAssignment
+from student_codes import allocate_student_codes
+
+IMPORT_BATCH_SIZE = 500
+MAX_IMPORT_ROWS = 10000
+STUDENT_FIELDS = ('first_name', 'last_name', 'dob', 'gender', 'contact_number', 'grade_school',
+                  'student_email', 'address', 'notes', 'status')
+PARENT_FIELDS = {'parent_name': 'name', 'parent_relationship': 'relationship',
+                 'parent_contact_number': 'contact_number', 'parent_email': 'parent_email'}
+HEADER_ALIASES = {'email': 'student_email', 'date_of_birth': 'dob', 'class': 'class_code',
+                  'enrolled_date': 'enrolled_from', 'relationship': 'parent_relationship'}
+EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+
+class ImportFormatError(ValueError):
+    """Raised when an import file cannot be read as a student sheet at all."""
+
+
+# --- READING ---
+def normalize_header(name):
+    key = re.sub(r"\s+", "_", str(name or "").strip().lower())
+    return HEADER_ALIASES.get(key, key)
+
+
+def rows_to_dicts(rows):
+    """Yield ``(row_number, {column: value})`` for each non-blank row after the header."""
+    header = next(rows, None)
+    if not header:
+        raise ImportFormatError("The file is empty.")
+    columns = [normalize_header(h) for h in header]
+    missing = {'first_name', 'last_name'} - set(columns)
+    if missing:
+        raise ImportFormatError(f"Missing required column(s): {', '.join(sorted(missing))}")
+    for number, values in enumerate(rows, start=2):
+        if number - 1 > MAX_IMPORT_ROWS:
+            raise ImportFormatError(f"Imports are limited to {MAX_IMPORT_ROWS} rows per file.")
+        if not any(v not in (None, "") for v in values):
+            continue
+        yield number, {col: value for col, value in zip(columns, values) if col}
+
+
+def iter_csv_rows(stream):
+    reader = csv.reader(codecs.getreader("utf-8-sig")(stream))
+    try:
+        yield from rows_to_dicts(reader)
+    except UnicodeDecodeError:
+        raise ImportFormatError("CSV files must be UTF-8 encoded.")
+
+
+def iter_xlsx_rows(stream):
+    # openpyxl is only needed for imports, so it is not loaded at startup
+    from openpyxl import load_workbook
+    try:
+        workbook = load_workbook(stream, read_only=True, data_only=True)
+    except Exception as e:
+        raise ImportFormatError(f"Could not read the workbook: {e}")
+    try:
+        yield from rows_to_dicts(workbook.active.iter_rows(values_only=True))
+    finally:
+        workbook.close()
+
+
+def iter_import_rows(stream, filename):
+    """Stream rows from a CSV or XLSX upload without loading the whole sheet."""
+    extension = filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
+    if extension == "csv":
+        return iter_csv_rows(stream)
+    if extension == "xlsx":
+        return iter_xlsx_rows(stream)
+    raise ImportFormatError("Upload a .csv or .xlsx file.")
+
+
+# --- VALIDATION ---
+def clean(value):
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = value.strip()
+        return value or None
+    if isinstance(value, float) and value.is_integer():
+        # Spreadsheet cells hold phone numbers and the like as floats
+        value = int(value)
+    return str(value)
+
+
+def parse_date(value):
+    if value in (None, ""):
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return datetime.strptime(str(value).strip(), '%Y-%m-%d').date()
+
+
+def validate_row(raw, class_ids):
+    """Return ``(record, errors)`` for one sheet row; ``record`` is None when invalid."""
+    errors = []
+    student = {}
+    for field in STUDENT_FIELDS:
+        if field == 'dob':
+            try:
+                student['dob'] = parse_date(raw.get('dob'))
+            except ValueError:
+                errors.append("dob must be a date (YYYY-MM-DD)")
+        else:
+            student[field] = clean(raw.get(field))
+    for field in ('first_name', 'last_name'):
+        if not student[field]:
+            errors.append(f"{field} is required")
+    if student['student_email'] and not EMAIL_RE.match(student['student_email']):
+        errors.append("student_email is not a valid email address")
+    student['status'] = student['status'] or 'active'
+
+    parent = {target: clean(raw.get(source)) for source, target in PARENT_FIELDS.items()}
+    if parent['parent_email'] and not EMAIL_RE.match(parent['parent_email']):
+        errors.append("parent_email is not a valid email address")
+    if not parent['name']:
+        if any(parent.values()):
+            errors.append("parent_name is required when other parent columns are filled")
+        parent = None
+
+    assignments = []
+    try:
+        enrolled_from = parse_date(raw.get('enrolled_from'))
+    except ValueError:
+        errors.append("enrolled_from must be a date (YYYY-MM-DD)")
+        enrolled_from = None
+    # Listing a class twice enrols the student once
+    codes = list(dict.fromkeys(c.strip() for c in (clean(raw.get('class_code')) or "").split(";") if c.strip()))
+    for code in codes:
+        if code not in class_ids:
+            errors.append(f"Unknown class_code {code!r}")
+        else:
+            assignments.append({
+                'class_id': class_ids[code],
+                'enrolled_from': enrolled_from,
+                'is_primary': not assignments
+            })
+
+    if errors:
+        return None, errors
+    return {'student': student, 'parent': parent, 'assignments': assignments}, []
+
+
+# --- IMPORT ---
+class StudentImport:
+    """
+    Validate and insert students from ``iter_import_rows`` in batches.
+
+    Each batch allocates its student codes as one block and inserts its
+    Student, Parent and StudentClassAssignment rows with one statement per
+    table. Invalid rows are collected in ``report["errors"]`` and skipped. With
+    ``dry_run`` nothing is written. The caller commits or rolls back.
+    """
+
+    def __init__(self, dry_run=False, updated_by=None, batch_size=IMPORT_BATCH_SIZE):
+        self.dry_run = dry_run
+        self.updated_by = updated_by
+        self.batch_size = batch_size
+        self.class_ids = dict(db.session.query(Class.class_code, Class.id))
+        self.seen_emails = set()
+        self.report = {'dry_run': dry_run, 'rows': 0, 'valid': 0, 'imported': 0,
+                       'rejected': 0, 'errors': [], 'students': []}
+
+    def run(self, rows):
+        batch = []
+        for number, raw in rows:
+            self.report['rows'] += 1
+            record, errors = validate_row(raw, self.class_ids)
+            email = record and record['student']['student_email']
+            if email and email.lower() in self.seen_emails:
+                record, errors = None, ["student_email appears more than once in the file"]
+            if record is None:
+                self.reject(number, raw, errors)
+                continue
+            if email:
+                self.seen_emails.add(email.lower())
+            batch.append((number, raw, record))
+            if len(batch) >= self.batch_size:
+                self.flush(batch)
+                batch = []
+        if batch:
+            self.flush(batch)
+        self.report['errors'].sort(key=lambda e: e['row'])
+        return self.report
+
+    def reject(self, number, raw, errors):
+        self.report['rejected'] += 1
+        self.report['errors'].append({
+            'row': number,
+            'errors': errors,
+            'values': {k: v if isinstance(v, (str, int, float)) or v is None else str(v) for k, v in raw.items()}
+        })
+
+    def flush(self, batch):
+        emails = {r['student']['student_email'] for _, _, r in batch if r['student']['student_email']}
+        registered = set()
+        if emails:
+            registered = {e for (e,) in db.session.query(Student.student_email).filter(Student.student_email.in_(emails))}
+        accepted = []
+        for number, raw, record in batch:
+            if record['student']['student_email'] in registered:
+                self.reject(number, raw, ["student_email is already registered"])
+            else:
+                accepted.append((number, record))
+        self.report['valid'] += len(accepted)
+        if self.dry_run or not accepted:
+            return
+
+        now = datetime.utcnow()
+        codes = allocate_student_codes(len(accepted))
+        student_rows = [
+            dict(record['student'], student_code=code, created_at=now, updated_at=now, updated_by=self.updated_by)
+            for (_, record), code in zip(accepted, codes)
+        ]
+        ids = db.session.scalars(
+            insert(Student).returning(Student.id, sort_by_parameter_order=True), student_rows
+        ).all()
+
+        parents, assignments = [], []
+        for (number, record), student_id, code in zip(accepted, ids, codes):
+            if record['parent']:
+                parents.append(dict(record['parent'], student_id=student_id))
+            assignments.extend(dict(a, student_id=student_id) for a in record['assignments'])
+            self.report['students'].append({'row': number, 'id': student_id, 'student_code': code})
+        if parents:
+            db.session.execute(insert(Parent), parents)
+        if assignments:
+            db.session.execute(insert(StudentClassAssignment), assignments)
+        self.report['imported'] += len(accepted)
+
+
+def error_report_csv(report):
+    """Rejected rows as CSV (row number, errors, then the original columns) for fixing and re-upload."""
+    columns = []
+    for error in report['errors']:
+        columns.extend(c for c in error['values'] if c not in columns)
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(['row', 'errors'] + columns)
+    for error in report['errors']:
+        writer.writerow([error['row'], "; ".join(error['errors'])] + [error['values'].get(c) for c in columns])
+    return out.getvalue()
@@ -0,0 +1,97 @@
+from itertools import chain
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from database import upsert_insert
+from models import TableVersion
+
+VERSION_TABLE = TableVersion.__tablename__
+commit_listeners = []
+
+
+# --- RECORDING CHANGES ---
+def changed_tables(session):
+    return session.info.setdefault("changed_tables", set())
+
+
+def record_flush(session, flush_context):
+    tables = changed_tables(session)
+    for obj in chain(session.new, session.dirty, session.deleted):
+        table = getattr(obj, "__table__", None)
+        if table is not None and table.name != VERSION_TABLE:
+            tables.add(table.name)
+
+
+def record_bulk_statement(orm_execute_state):
+    # insert()/update()/delete() run through session.execute() never reach a flush
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, "table", None)
+        if table is not None and table.name != VERSION_TABLE:
+            changed_tables(orm_execute_state.session).add(table.name)
+
+
+def bump_before_commit(session):
+    # Flush first so pending objects are counted; bumping last keeps the
+    # version rows locked for as short a time as possible
+    session.flush()
+    tables = session.info.pop("changed_tables", None)
+    if tables:
+        session.info["committed_tables"] = tables
+        stmt = upsert_insert(session, TableVersion).values(
+            [{"table_name": name, "version": 1} for name in sorted(tables)]
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[TableVersion.table_name],
+            set_={"version": TableVersion.version + 1}
+        )
+        # On the connection, so the bump is not itself recorded as a change
+        session.connection().execute(stmt)
+
+
+def announce_commit(session):
+    tables = session.info.pop("committed_tables", None)
+    if tables:
+        for listener in commit_listeners:
+            listener(tables)
+
+
+def forget_changes(session, transaction):
+    if transaction.parent is None:
+        session.info.pop("changed_tables", None)
+        session.info.pop("committed_tables", None)
+
+
+def on_tables_committed(listener):
+    """Call ``listener(tables)`` after each commit that wrote to ``tables``."""
+    if listener not in commit_listeners:
+        commit_listeners.append(listener)
+
+
+def install_table_versions():
+    """
+    Bump ``table_version`` for every table a transaction wrote to, inside
+    that transaction, just before it commits.
+
+    Flushed objects and bulk insert/update/delete statements are both
+    counted. Because the counters are committed with the data, every
+    process sees the same versions, and a rolled-back write bumps nothing.
+    Listeners added with on_tables_committed() hear about each commit once
+    it has succeeded.
+    """
+    if event.contains(Session, "before_commit", bump_before_commit):
+        return
+    event.listen(Session, "after_flush", record_flush)
+    event.listen(Session, "do_orm_execute", record_bulk_statement)
+    event.listen(Session, "before_commit", bump_before_commit)
+    event.listen(Session, "after_commit", announce_commit)
+    event.listen(Session, "after_transaction_end", forget_changes)
+
+
+# --- READING ---
+def table_versions(session, tables):
+    """Current version of each of ``tables``, in order; 0 for tables never written."""
+    rows = dict(session.execute(
+        select(TableVersion.table_name, TableVersion.version).where(TableVersion.table_name.in_(tables))
+    ).all())
+    return tuple(rows.get(name, 0) for name in tables)
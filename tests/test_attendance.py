@@ -0,0 +1,49 @@
+import pytest
+
+from extensions import db
+from models import Attendance, Class, Student, UserAccount
+
+
+@pytest.fixture
+def client(app):
+    db.session.add(UserAccount(username="teacher", email="teacher@example.com", role="admin", password_hash="x"))
+    db.session.add(Class(class_code="C1", class_name="Physics"))
+    db.session.add(Student(student_code="STU-2026-0001", first_name="Ada", last_name="Lovelace"))
+    db.session.commit()
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session["_user_id"] = "1"
+    return client
+
+
+def add(client, class_id):
+    return client.post("/api/attendance", json={"class_id": class_id, "date": "2026-10-18",
+                                                "student_id": 1, "status": "present"})
+
+
+def bulk(client, class_id):
+    return client.post("/api/attendance/bulk", json={"class_id": class_id, "date": "2026-10-18",
+                                                     "entries": [{"student_id": 1, "status": "present"}]})
+
+
+@pytest.mark.parametrize("post", [add, bulk])
+@pytest.mark.parametrize("class_id", [{"id": 1}, [1], "one", None])
+def test_malformed_class_id_is_a_400(client, post, class_id):
+    response = post(client, class_id)
+    assert response.status_code == 400
+    assert response.json["status"] == "error"
+
+
+@pytest.mark.parametrize("post", [add, bulk])
+def test_unknown_class_is_a_404(client, post):
+    response = post(client, 99)
+    assert response.status_code == 404
+    assert Attendance.query.count() == 0
+
+
+def test_class_id_may_be_sent_as_a_string(client):
+    assert add(client, "1").status_code == 201
+    response = bulk(client, "1")
+    assert response.status_code == 200
+    assert response.json["class_id"] == 1 and response.json["counts"] == {"unchanged": 1}
+    assert Attendance.query.one().class_id == 1
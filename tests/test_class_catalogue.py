@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta
+
+from extensions import db
+from models import Class, GoogleClassroomCourse, GoogleIntegrationAccount, UserAccount, class_catalogue
+
+
+def add_classes(count):
+    user = UserAccount(username="admin", email="admin@example.com", role="admin", password_hash="x")
+    db.session.add(user)
+    db.session.flush()
+    account = GoogleIntegrationAccount(google_email="teacher@example.com", owner_user_id=user.id)
+    db.session.add(account)
+    db.session.flush()
+    now = datetime.utcnow()
+    for i in range(count):
+        cls = Class(class_code=f"C{i:03}", class_name=f"Class {i}", subject="Science")
+        db.session.add(cls)
+        db.session.flush()
+        # Two courses per class: the catalogue must pick the newest
+        for age, suffix in ((1, "old"), (0, "new")):
+            db.session.add(GoogleClassroomCourse(
+                course_id=f"G{i}-{suffix}", class_id=cls.id, integration_account_id=account.id,
+                created_at=now - timedelta(days=age)
+            ))
+    db.session.commit()
+
+
+def catalogue_queries(count_queries):
+    db.session.expire_all()
+    with count_queries() as queries:
+        catalogue = class_catalogue()
+    return catalogue, len(queries)
+
+
+def test_catalogue_query_count_does_not_grow_with_classes(app, count_queries):
+    add_classes(1)
+    catalogue, one_class = catalogue_queries(count_queries)
+    assert catalogue["C000"]["courseId"] == "G0-new"
+
+    for i in range(1, 50):
+        cls = Class(class_code=f"C{i:03}", class_name=f"Class {i}", subject="Science")
+        db.session.add(cls)
+        db.session.flush()
+        db.session.add(GoogleClassroomCourse(course_id=f"G{i}", class_id=cls.id, integration_account_id=1,
+                                             created_at=datetime.utcnow()))
+    db.session.commit()
+    catalogue, fifty_classes = catalogue_queries(count_queries)
+
+    assert len(catalogue) == 50
+    assert all(c["gclass_linked"] for c in catalogue.values())
+    assert fifty_classes == one_class == 1
+
+
+def test_api_classes_query_count_does_not_grow_with_classes(app, count_queries):
+    add_classes(1)
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session["_user_id"] = "1"
+    client.get("/api/classes")  # loads the logged-in user into the identity cache
+    with count_queries() as one_class:
+        assert client.get("/api/classes").status_code == 200
+
+    for i in range(1, 50):
+        db.session.add(Class(class_code=f"C{i:03}", class_name=f"Class {i}"))
+    db.session.commit()
+    with count_queries() as fifty_classes:
+        response = client.get("/api/classes")
+    assert len(response.json) == 50
+    assert len(fifty_classes) == len(one_class)
@@ -0,0 +1,93 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from extensions import db
+from models import Class, GoogleClassroomCourse, GoogleIntegrationAccount, UserAccount
+
+# (class_code, class_name, subject, class_status)
+CLASSES = [
+    ("PHY-11A", "Physics 11A", "Physics", "active"),
+    ("PHY-11B", "Physics 11B", "Physics", None),
+    ("PHY-12A", "Physics 12A", "Physics", "archived"),
+    ("CHE-11A", "Chemistry 11A", "Chemistry", "active"),
+    ("CHE-11B", "Chemistry 11B", "Chemistry", None),
+    ("BIO-11A", "Biology 11A", "Biology", "active"),
+    ("MAT-11A", "Maths 11A", "Maths", "active"),
+    ("MAT-11B", "Maths Extension", "Maths", "archived"),
+    ("PHY-10A", "Physics 10A", "Physics", "active"),
+    ("ENG-11A", "English", "English", None),
+]
+
+
+@pytest.fixture
+def client(app):
+    user = UserAccount(username="teacher", email="teacher@example.com", role="admin", password_hash="x")
+    db.session.add(user)
+    db.session.flush()
+    account = GoogleIntegrationAccount(google_email="teacher@example.com", owner_user_id=user.id)
+    db.session.add(account)
+    for code, name, subject, status in CLASSES:
+        db.session.add(Class(class_code=code, class_name=name, subject=subject, class_status=status))
+    db.session.flush()
+    now = datetime.utcnow()
+    for age, course_id in ((1, "G-old"), (0, "G-new")):
+        db.session.add(GoogleClassroomCourse(course_id=course_id, class_id=1, integration_account_id=account.id,
+                                             created_at=now - timedelta(days=age)))
+    db.session.commit()
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session["_user_id"] = str(user.id)
+    return client
+
+
+def search(client, **params):
+    response = client.get("/api/classes/search", query_string=params)
+    assert response.status_code == 200, response.json
+    return response.json
+
+
+def codes(page):
+    return [item["class_code"] for item in page["items"]]
+
+
+def test_status_active_includes_classes_without_a_status(client):
+    page = search(client, status="active")
+    assert codes(page) == [c for c, _, _, status in CLASSES if status in ("active", None)]
+    assert codes(search(client, status="archived")) == ["PHY-12A", "MAT-11B"]
+
+
+def test_q_matches_code_name_or_subject_case_insensitively(client):
+    assert codes(search(client, q="phy")) == ["PHY-11A", "PHY-11B", "PHY-12A", "PHY-10A"]
+    assert codes(search(client, q="extension")) == ["MAT-11B"]
+    assert codes(search(client, q="  CHEMISTRY ")) == ["CHE-11A", "CHE-11B"]
+    empty = search(client, q="nothing like it")
+    assert (empty["items"], empty["total"], empty["next_cursor"]) == ([], 0, None)
+
+
+def test_total_counts_every_match_on_the_first_page_only(client):
+    first = search(client, limit=2, q="11")
+    assert first["total"] == 8 and len(first["items"]) == 2
+    assert "total" not in search(client, limit=2, q="11", cursor=first["next_cursor"])
+
+
+def test_cursor_paging_keeps_the_filters(client):
+    params = {"status": "active", "subject": "Physics", "sort": "-class_name", "limit": 1}
+    first = search(client, **params)
+    seen, page = codes(first), first
+    while page["next_cursor"]:
+        page = search(client, cursor=page["next_cursor"], **params)
+        seen += codes(page)
+    assert seen == ["PHY-11B", "PHY-11A", "PHY-10A"]
+    assert first["total"] == len(seen)
+
+
+def test_items_carry_the_latest_classroom_course(client):
+    items = {item["class_code"]: item for item in search(client, q="PHY-11")["items"]}
+    assert items["PHY-11A"]["courseId"] == "G-new" and items["PHY-11A"]["gclass_linked"]
+    assert items["PHY-11B"]["courseId"] is None
+
+
+def test_unknown_sort_is_a_400(client):
+    response = client.get("/api/classes/search", query_string={"sort": "description"})
+    assert response.status_code == 400
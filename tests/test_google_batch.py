@@ -0,0 +1,119 @@
+import json
+
+import httplib2
+import pytest
+from googleapiclient.errors import HttpError
+
+import google_quota
+from google_batch import BatchQueue
+from google_quota import ApiLimiter, QuotaExhausted
+
+
+class FakeRequest:
+    def __init__(self, name, method="POST", method_id="classroom.courses.announcements.create"):
+        self.name = name
+        self.method = method
+        self.methodId = method_id
+
+
+def http_error(status, reason):
+    content = {"error": {"code": status, "message": reason, "errors": [{"reason": reason}]}}
+    return HttpError(httplib2.Response({"status": str(status)}), json.dumps(content).encode())
+
+
+class FakeService:
+    """
+    Hands out fake BatchHttpRequests. ``outcomes[name]`` lists what each send
+    of that request gets: a response, or an exception.
+    """
+
+    def __init__(self, outcomes):
+        self.outcomes = {name: list(results) for name, results in outcomes.items()}
+        self.batches = []
+
+    def new_batch_http_request(self, callback):
+        service = self
+
+        class FakeBatch:
+            def __init__(self):
+                self.calls = []
+
+            def add(self, request, request_id):
+                self.calls.append((request_id, request))
+
+            def execute(self):
+                service.batches.append([request.name for _, request in self.calls])
+                for request_id, request in self.calls:
+                    outcome = service.outcomes[request.name].pop(0)
+                    if isinstance(outcome, Exception):
+                        callback(request_id, None, outcome)
+                    else:
+                        callback(request_id, outcome, None)
+        return FakeBatch()
+
+
+@pytest.fixture
+def limiter(monkeypatch):
+    limiter = ApiLimiter("classroom", daily_units=0, requests_per_second=0)
+    monkeypatch.setattr(google_quota, "_limiters", {"classroom": limiter})
+    return limiter
+
+
+def run(service, requests, **kwargs):
+    sleeps, callbacks = [], []
+    queue = BatchQueue(service, sleep=sleeps.append, **kwargs)
+    for request in requests:
+        queue.add(request, callback=lambda *outcome: callbacks.append(outcome))
+    return queue.flush(), callbacks, sleeps
+
+
+def test_throttled_item_is_resent_alone(limiter):
+    service = FakeService({"a": [{"id": "a"}], "b": [http_error(429, "rateLimitExceeded"), {"id": "b"}],
+                           "c": [{"id": "c"}]})
+    results, callbacks, sleeps = run(service, [FakeRequest("a"), FakeRequest("b"), FakeRequest("c")])
+
+    assert service.batches == [["a", "b", "c"], ["b"]]
+    assert {request_id: result.response for request_id, result in results.items()} == {
+        "1": {"id": "a"}, "2": {"id": "b"}, "3": {"id": "c"}
+    }
+    # Each callback fires once, with the final outcome
+    assert sorted(callbacks, key=lambda c: c[0]) == [("1", {"id": "a"}, None), ("2", {"id": "b"}, None),
+                                                     ("3", {"id": "c"}, None)]
+    assert len(sleeps) == 1
+    assert limiter.snapshot()["calls"] == 4 and limiter.snapshot()["retries"] == 1
+
+
+def test_server_error_resends_reads_but_not_creates(limiter):
+    service = FakeService({"create": [http_error(503, "backendError"), {"id": "dup"}],
+                           "read": [http_error(503, "backendError"), {"id": "read"}]})
+    results, callbacks, _ = run(service, [FakeRequest("create"), FakeRequest("read", method="GET",
+                                                                              method_id="classroom.courses.get")])
+    assert service.batches == [["create", "read"], ["read"]]
+    assert results["1"].exception.resp.status == 503
+    assert results["2"].response == {"id": "read"}
+    assert len(callbacks) == 2
+
+
+def test_retries_give_up_with_the_last_error(limiter):
+    service = FakeService({"a": [http_error(429, "rateLimitExceeded")] * 3})
+    results, callbacks, sleeps = run(service, [FakeRequest("a")], retries=2)
+    assert len(service.batches) == 3 and len(sleeps) == 2
+    assert results["1"].exception.resp.status == 429
+    assert callbacks == [("1", None, results["1"].exception)]
+
+
+def test_queue_is_split_into_batches(limiter):
+    service = FakeService({name: [{"id": name}] for name in "abcde"})
+    results, _, _ = run(service, [FakeRequest(name) for name in "abcde"], batch_size=2)
+    assert service.batches == [["a", "b"], ["c", "d"], ["e"]]
+    assert len(results) == 5
+
+
+def test_calls_over_the_daily_budget_are_not_sent(monkeypatch):
+    limiter = ApiLimiter("classroom", daily_units=1, requests_per_second=0)
+    monkeypatch.setattr(google_quota, "_limiters", {"classroom": limiter})
+    service = FakeService({"a": [{"id": "a"}], "b": [{"id": "b"}]})
+    results, callbacks, sleeps = run(service, [FakeRequest("a"), FakeRequest("b")])
+    assert service.batches == [["a"]]
+    assert isinstance(results["2"].exception, QuotaExhausted)
+    assert sleeps == [] and len(callbacks) == 2
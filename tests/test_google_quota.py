@@ -0,0 +1,132 @@
+import json
+from datetime import datetime
+
+import httplib2
+import pytest
+from googleapiclient.errors import HttpError
+from googleapiclient.model import JsonModel
+
+import google_quota
+from google_quota import ApiLimiter, QuotaExhausted, QuotaHttpRequest, TokenBucket, backoff_delay
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakeHttp:
+    """Answers each request with the next of ``responses``: a ``(status, reason)`` pair or an exception."""
+
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.calls = []
+
+    def request(self, uri, method="GET", body=None, headers=None, **kwargs):
+        self.calls.append(method)
+        response = self.responses.pop(0)
+        if isinstance(response, Exception):
+            raise response
+        status, reason = response
+        if status == 200:
+            return httplib2.Response({"status": "200"}), b'{"id": "ok"}'
+        error = {"error": {"code": status, "message": reason, "errors": [{"reason": reason}]}}
+        return httplib2.Response({"status": str(status)}), json.dumps(error).encode()
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Install a youtube limiter without rate limiting whose sleeps are recorded instead of taken."""
+    slept = []
+    limiter = ApiLimiter("youtube", daily_units=1000, requests_per_second=0, sleep=slept.append)
+    monkeypatch.setattr(google_quota, "_limiters", {"youtube": limiter})
+    return slept
+
+
+def call(http, method="GET", method_id="youtube.playlists.list"):
+    request = QuotaHttpRequest(http, JsonModel().response, "https://example.invalid/youtube/v3/playlists",
+                               method=method, methodId=method_id)
+    return request.execute(num_retries=3)
+
+
+def test_token_bucket_allows_a_burst_then_the_rate():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, capacity=3, clock=clock)
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.reserve() == 0.5
+    assert bucket.reserve() == 1.0
+    clock.now += 1.5  # pays back the debt and refills one token
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.5
+
+
+def test_limiter_sleeps_when_throttled_and_rejects_over_budget():
+    clock, slept = FakeClock(), []
+    now = datetime(2026, 10, 18, 12, tzinfo=google_quota.QUOTA_TIMEZONE)
+    limiter = ApiLimiter("youtube", daily_units=100, requests_per_second=4, burst=1, clock=clock,
+                         sleep=slept.append, now=lambda: now)
+    limiter.acquire(50)
+    limiter.acquire(50)
+    assert slept == [0.25]
+    with pytest.raises(QuotaExhausted) as exc:
+        limiter.acquire(1)
+    assert exc.value.resets_at == datetime(2026, 10, 19, tzinfo=google_quota.QUOTA_TIMEZONE)
+    assert limiter.snapshot()["rejected"] == 1
+
+    now = datetime(2026, 10, 19, 0, 1, tzinfo=google_quota.QUOTA_TIMEZONE)
+    limiter.acquire(1)
+    assert limiter.snapshot()["used_units"] == 1
+
+
+def test_backoff_delay_is_jittered_and_capped(monkeypatch):
+    monkeypatch.setattr(google_quota.random, "uniform", lambda low, high: high)
+    assert [backoff_delay(attempt) for attempt in (1, 2, 3)] == [2.0, 4.0, 8.0]
+    assert backoff_delay(10) == google_quota.MAX_BACKOFF_SECONDS
+    monkeypatch.setattr(google_quota.random, "uniform", lambda low, high: low)
+    assert backoff_delay(3) == 0
+
+
+def test_get_is_retried_after_server_and_transport_errors(sleeps):
+    http = FakeHttp((503, "backendError"), ConnectionResetError(), (200, None))
+    assert call(http) == {"id": "ok"}
+    assert http.calls == ["GET"] * 3
+    assert len(sleeps) == 2
+    assert google_quota.get_limiter("youtube").snapshot()["calls"] == 3
+
+
+@pytest.mark.parametrize("failure", [(500, "backendError"), (503, "backendError"), ConnectionResetError()])
+def test_create_is_not_resent_after_it_may_have_run(sleeps, failure):
+    http = FakeHttp(failure, (200, None))
+    with pytest.raises((HttpError, OSError)):
+        call(http, "POST", "youtube.playlists.insert")
+    assert http.calls == ["POST"]
+    assert sleeps == []
+
+
+@pytest.mark.parametrize("throttled", [(429, "rateLimitExceeded"), (403, "userRateLimitExceeded")])
+def test_throttled_create_is_retried(sleeps, throttled):
+    http = FakeHttp(throttled, (200, None))
+    assert call(http, "POST", "youtube.playlists.insert") == {"id": "ok"}
+    assert http.calls == ["POST", "POST"]
+    assert len(sleeps) == 1
+
+
+def test_client_errors_are_not_retried(sleeps):
+    http = FakeHttp((404, "notFound"))
+    with pytest.raises(HttpError):
+        call(http)
+    assert http.calls == ["GET"]
+    assert sleeps == []
+
+
+def test_quota_exceeded_fails_fast_until_reset(sleeps):
+    http = FakeHttp((403, "quotaExceeded"))
+    with pytest.raises(HttpError):
+        call(http)
+    with pytest.raises(QuotaExhausted):
+        call(http)
+    assert http.calls == ["GET"]
+    assert google_quota.get_limiter("youtube").snapshot()["remaining_units"] == 0
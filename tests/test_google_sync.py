@@ -0,0 +1,163 @@
+import pytest
+from sqlalchemy import event
+
+import google_sync
+from app import create_app
+from extensions import db
+from google_sync import create_sync_job, process_sync_job, upsert_courses, upsert_playlists
+from models import GoogleClassroomCourse, GoogleIntegrationAccount, SyncJob, UserAccount, YouTubePlaylist
+
+
+@pytest.fixture
+def file_app(tmp_path):
+    # Sync jobs write from several threads, so they need a real database file
+    app = create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'sync.db'}", "TESTING": True,
+                      "READ_CACHE_DIR": str(tmp_path / "cache_versions")})
+    with app.app_context():
+        db.create_all()
+        user = UserAccount(username="admin", email="admin@example.com", role="admin", password_hash="x")
+        db.session.add(user)
+        db.session.flush()
+        db.session.add_all(GoogleIntegrationAccount(google_email=f"teacher{i}@example.com", owner_user_id=user.id)
+                           for i in (1, 2, 3))
+        db.session.commit()
+        yield app
+        db.session.remove()
+
+
+def course(course_id, name):
+    return {"id": course_id, "name": name, "section": "A", "enrollmentCode": "abc"}
+
+
+def test_course_inserted_by_a_concurrent_sync_is_upserted(file_app):
+    upsert_courses([course("shared", "Physics"), course("solo-1", "Maths")], 1)
+    db.session.commit()
+    db.session.execute(db.delete(GoogleClassroomCourse).where(GoogleClassroomCourse.course_id == "shared"))
+    db.session.commit()
+
+    # Account 1's sync commits "shared" right after account 2 has looked for existing rows
+    fired = []
+
+    def concurrent_insert(conn, cursor, statement, parameters, context, executemany):
+        if not fired and statement.lstrip().startswith("SELECT") and "google_classroom_course" in statement:
+            fired.append(statement)
+            with db.engine.begin() as other:
+                other.execute(db.insert(GoogleClassroomCourse).values(
+                    course_id="shared", name="Physics", integration_account_id=1))
+    event.listen(db.engine, "after_cursor_execute", concurrent_insert)
+    try:
+        result = upsert_courses([course("shared", "Physics (co-taught)"), course("solo-2", "Biology")], 2)
+        db.session.commit()
+    finally:
+        event.remove(db.engine, "after_cursor_execute", concurrent_insert)
+    assert fired
+
+    rows = {c.course_id: c for c in GoogleClassroomCourse.query.all()}
+    assert result["added"] == 2
+    assert set(rows) == {"shared", "solo-1", "solo-2"}
+    assert rows["shared"].name == "Physics (co-taught)"
+    assert rows["shared"].integration_account_id == 1  # keeps the account that first synced it
+    assert rows["solo-2"].integration_account_id == 2
+
+
+def test_co_taught_course_does_not_fail_either_account(file_app, monkeypatch):
+    listings = {
+        "teacher1@example.com": [course("shared", "Physics"), course("t1", "Maths")],
+        "teacher2@example.com": [course("shared", "Physics"), course("t2", "Biology")],
+        "teacher3@example.com": [course("t3", "Chemistry")],
+    }
+    monkeypatch.setattr(google_sync, "SYNC_KINDS", dict(
+        google_sync.SYNC_KINDS,
+        classroom=lambda account_id, email, requested_by: upsert_courses(listings[email], account_id, requested_by)
+    ))
+    job = create_sync_job("classroom", GoogleIntegrationAccount.query.all(), 1)
+    process_sync_job(file_app, job.id)
+    db.session.expire_all()
+
+    job = db.session.get(SyncJob, job.id)
+    assert job.status == "success", job.error
+    assert {c.course_id for c in GoogleClassroomCourse.query.all()} == {"shared", "t1", "t2", "t3"}
+    assert all(a.last_synced for a in GoogleIntegrationAccount.query.all())
+
+
+def test_job_with_some_failed_accounts_is_partial(file_app, monkeypatch):
+    def sync(account_id, email, requested_by):
+        if account_id == 2:
+            raise RuntimeError("token revoked")
+        return upsert_courses([course(f"c{account_id}", "Course")], account_id, requested_by)
+    monkeypatch.setattr(google_sync, "SYNC_KINDS", dict(google_sync.SYNC_KINDS, classroom=sync))
+
+    job = create_sync_job("classroom", GoogleIntegrationAccount.query.all(), 1)
+    process_sync_job(file_app, job.id)
+    db.session.expire_all()
+    job = db.session.get(SyncJob, job.id)
+    assert job.status == "partial"
+    assert "token revoked" in job.error
+
+    monkeypatch.setattr(google_sync, "SYNC_KINDS", dict(
+        google_sync.SYNC_KINDS, classroom=lambda *args: (_ for _ in ()).throw(RuntimeError("down"))
+    ))
+    job = create_sync_job("classroom", GoogleIntegrationAccount.query.all(), 1)
+    process_sync_job(file_app, job.id)
+    db.session.expire_all()
+    assert db.session.get(SyncJob, job.id).status == "error"
+
+
+def test_youtube_channel_is_synced_once_for_all_accounts(file_app, monkeypatch):
+    listings = []
+
+    def list_all_playlists(youtube):
+        listings.append(youtube)
+        return [("PL1", "Lectures"), ("PL2", "Labs")]
+    monkeypatch.setattr("youtube_uploader.get_authenticated_service", lambda: "service")
+    monkeypatch.setattr("youtube_uploader.list_all_playlists", list_all_playlists)
+
+    job = create_sync_job("youtube", GoogleIntegrationAccount.query.all(), 1)
+    process_sync_job(file_app, job.id)
+    db.session.expire_all()
+
+    job = db.session.get(SyncJob, job.id)
+    assert job.status == "success", job.error
+    assert len(listings) == 1
+    totals = google_sync.serialize_sync_job(job)["totals"]
+    assert totals["fetched"] == 2 and totals["added"] == 2
+    assert {p.playlist_id: p.integration_account_id for p in YouTubePlaylist.query.all()} == {"PL1": 1, "PL2": 1}
+    assert all(a.last_synced for a in GoogleIntegrationAccount.query.all())
+
+
+def test_playlist_inserted_by_a_concurrent_sync_is_upserted(file_app):
+    fired = []
+
+    def concurrent_insert(conn, cursor, statement, parameters, context, executemany):
+        if not fired and statement.lstrip().startswith("SELECT") and "youtube_playlist" in statement:
+            fired.append(statement)
+            with db.engine.begin() as other:
+                other.execute(db.insert(YouTubePlaylist).values(
+                    playlist_id="PL1", title="Lectures", integration_account_id=1))
+    event.listen(db.engine, "after_cursor_execute", concurrent_insert)
+    try:
+        upsert_playlists([("PL1", "Lectures 2026"), ("PL2", "Labs")], 2)
+        db.session.commit()
+    finally:
+        event.remove(db.engine, "after_cursor_execute", concurrent_insert)
+    assert fired
+
+    rows = {p.playlist_id: p for p in YouTubePlaylist.query.all()}
+    assert rows["PL1"].title == "Lectures 2026"
+    assert rows["PL1"].integration_account_id == 1  # keeps the account that first synced it
+    assert rows["PL2"].integration_account_id == 2
+
+    upsert_playlists([("PL1", "Lectures 2026"), ("PL2", "Labs")], 3)
+    db.session.commit()
+    assert {p.integration_account_id for p in YouTubePlaylist.query.all()} == {1, 2}
+
+
+def test_only_changed_courses_are_updated(file_app):
+    upsert_courses([course("c1", "Physics"), course("c2", "Maths")], 1)
+    db.session.commit()
+    moved = dict(course("c2", "Maths"), section="B")
+    result = upsert_courses([course("c1", "Physics"), moved, course("c3", "Biology")], 1)
+    db.session.commit()
+
+    assert result == {"fetched": 3, "added": 1, "updated": 1, "unchanged": 1}
+    assert {c.course_id: c.section for c in GoogleClassroomCourse.query.all()} == {"c1": "A", "c2": "B", "c3": "A"}
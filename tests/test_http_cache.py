@@ -0,0 +1,95 @@
+import gzip
+import json
+
+import pytest
+
+import http_cache
+from extensions import db
+from models import GoogleIntegrationAccount, UserAccount
+
+URL = "/api/google_accounts"
+
+
+@pytest.fixture
+def client(app):
+    db.session.add(UserAccount(username="admin", email="admin@example.com", role="admin", password_hash="x"))
+    db.session.commit()
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session["_user_id"] = "1"
+    return client
+
+
+def add_accounts(count):
+    start = GoogleIntegrationAccount.query.count()
+    db.session.add_all(GoogleIntegrationAccount(account_name=f"Account {i}", google_email=f"teacher{i}@example.com",
+                                                owner_user_id=1) for i in range(start, start + count))
+    db.session.commit()
+
+
+def test_matching_etag_is_a_304_without_a_body(client):
+    add_accounts(1)
+    response = client.get(URL)
+    etag = response.headers["ETag"]
+    assert response.status_code == 200 and response.headers["Cache-Control"] == "private, no-cache"
+
+    response = client.get(URL, headers={"If-None-Match": etag})
+    assert response.status_code == 304
+    assert response.data == b""
+    assert response.headers["ETag"] == etag
+
+
+def test_etag_changes_after_a_write_to_the_table(client):
+    add_accounts(1)
+    etag = client.get(URL).headers["ETag"]
+    assert client.get(URL).headers["ETag"] == etag
+
+    add_accounts(1)
+    response = client.get(URL, headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["ETag"] != etag
+    assert len(response.json["items"]) == 2
+
+
+def test_etag_depends_on_the_url(client):
+    add_accounts(1)
+    assert client.get(URL).headers["ETag"] != client.get(URL + "?limit=5").headers["ETag"]
+
+
+def test_small_responses_are_not_compressed(client):
+    add_accounts(1)
+    response = client.get(URL, headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in response.headers
+    assert "Accept-Encoding" in response.headers["Vary"]
+
+
+def test_large_responses_are_gzipped_when_accepted(client, monkeypatch):
+    monkeypatch.setattr(http_cache, "brotli", None)
+    add_accounts(50)
+    plain = client.get(URL)
+    assert "Content-Encoding" not in plain.headers
+    assert len(plain.data) > 1024
+
+    response = client.get(URL, headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert json.loads(gzip.decompress(response.data)) == plain.json
+    assert response.headers["ETag"] == plain.headers["ETag"][:-1] + '-gzip"'
+
+    # The compressed variant revalidates with its own tag
+    revalidated = client.get(URL, headers={"Accept-Encoding": "gzip", "If-None-Match": response.headers["ETag"]})
+    assert revalidated.status_code == 304
+
+
+def test_refused_encodings_are_not_used(client, monkeypatch):
+    monkeypatch.setattr(http_cache, "brotli", None)
+    add_accounts(50)
+    response = client.get(URL, headers={"Accept-Encoding": "gzip;q=0, identity"})
+    assert "Content-Encoding" not in response.headers
+
+
+@pytest.mark.skipif(http_cache.brotli is None, reason="brotli is not installed")
+def test_brotli_is_preferred_when_available(client):
+    add_accounts(50)
+    response = client.get(URL, headers={"Accept-Encoding": "gzip, br"})
+    assert response.headers["Content-Encoding"] == "br"
+    assert json.loads(http_cache.brotli.decompress(response.data)) == client.get(URL).json
@@ -0,0 +1,86 @@
+import importlib.util
+import os
+import uuid
+from datetime import date
+
+import pytest
+from sqlalchemy import create_engine, select
+
+from extensions import db
+from models import (Attendance, Class, GoogleAccountPermissions, GoogleClassroomCourse, GoogleIntegrationAccount,
+                    Payment, StudentClassAssignment, StudentFee, Video)
+
+MIGRATION = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                         "migrations", "versions", "3f1c2a7b9e40_add_lookup_indexes.py")
+
+# (statement, index it must use)
+LOOKUPS = [
+    (select(Class).where(Class.class_teacher == 1), "ix_class_class_teacher"),
+    (select(Video).where(Video.class_id == 1), "ix_video_class_id"),
+    (select(Video).where(Video.youtube_playlist_id == "PL1"), "ix_video_youtube_playlist_id"),
+    (select(StudentClassAssignment).where(StudentClassAssignment.class_id == 1),
+     "ix_student_class_assignment_class_id"),
+    (select(StudentClassAssignment).where(StudentClassAssignment.student_id == 1),
+     "ix_student_class_assignment_student_id"),
+    (select(StudentFee).where(StudentFee.student_id == 1), "ix_student_fee_student_id"),
+    (select(Attendance).where(Attendance.class_id == 1, Attendance.date == date(2026, 1, 5)),
+     "ix_attendance_class_id_date"),
+    (select(Attendance).where(Attendance.student_id == 1), "ix_attendance_student_id_date"),
+    (select(Payment).where(Payment.fee_id == 1), "ix_payment_fee_id"),
+    (select(GoogleAccountPermissions).where(GoogleAccountPermissions.user_id == 1),
+     "ix_google_account_permissions_user_id"),
+    (select(GoogleIntegrationAccount).where(GoogleIntegrationAccount.owner_user_id == 1),
+     "ix_google_integration_account_owner_user_id"),
+    (select(GoogleClassroomCourse).where(GoogleClassroomCourse.class_id == 1)
+     .order_by(GoogleClassroomCourse.created_at.desc()).limit(1),
+     "ix_google_classroom_course_class_id_created_at"),
+]
+
+
+def migration_indexes():
+    spec = importlib.util.spec_from_file_location("lookup_indexes", MIGRATION)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return {name for name, table, columns in module.INDEXES}
+
+
+def literal_sql(statement, dialect):
+    return str(statement.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+
+
+def test_models_declare_every_migration_index(app):
+    declared = {index.name for table in db.metadata.tables.values() for index in table.indexes}
+    assert migration_indexes() <= declared
+
+
+def test_lookups_use_indexes_on_sqlite(app):
+    assert {index for _, index in LOOKUPS} <= migration_indexes()
+    with db.engine.connect() as conn:
+        for statement, index in LOOKUPS:
+            sql = literal_sql(statement, db.engine.dialect)
+            plan = " ".join(row[-1] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}"))
+            assert index in plan, f"{sql!r} does not use {index}: {plan}"
+
+
+@pytest.mark.skipif(not os.environ.get("TEST_POSTGRES_URL"), reason="set TEST_POSTGRES_URL to check PostgreSQL plans")
+def test_lookups_use_indexes_on_postgresql():
+    # Build the tables in a throwaway schema so the database's own tables are never touched
+    schema = f"test_lookup_indexes_{uuid.uuid4().hex}"
+    admin = create_engine(os.environ["TEST_POSTGRES_URL"])
+    with admin.begin() as conn:
+        conn.exec_driver_sql(f'CREATE SCHEMA "{schema}"')
+    engine = create_engine(os.environ["TEST_POSTGRES_URL"], connect_args={"options": f"-csearch_path={schema}"})
+    try:
+        db.metadata.create_all(engine)
+        with engine.connect() as conn:
+            # Empty tables would always be scanned; ask whether the index is usable at all
+            conn.exec_driver_sql("SET enable_seqscan = off")
+            for statement, index in LOOKUPS:
+                sql = literal_sql(statement, engine.dialect)
+                plan = " ".join(row[0] for row in conn.exec_driver_sql(f"EXPLAIN {sql}"))
+                assert index in plan, f"{sql!r} does not use {index}: {plan}"
+    finally:
+        engine.dispose()
+        with admin.begin() as conn:
+            conn.exec_driver_sql(f'DROP SCHEMA "{schema}" CASCADE')
+        admin.dispose()
@@ -0,0 +1,88 @@
+from datetime import datetime
+
+import pytest
+
+from extensions import db
+from models import GoogleIntegrationAccount, UserAccount
+from pagination import decode_cursor, encode_cursor
+
+# account_name per account: ties and NULLs on both sides of page boundaries
+NAMES = ["beta", None, "alpha", "beta", None, "gamma", "alpha"]
+# ids by account_name then id, in the same direction; NULL names last either way
+BY_NAME = [3, 7, 1, 4, 6, 2, 5]
+BY_NAME_DESC = [6, 4, 1, 7, 3, 5, 2]
+
+
+@pytest.fixture
+def client(app):
+    admin = UserAccount(username="admin", email="admin@example.com", role="admin", password_hash="x")
+    other = UserAccount(username="other", email="other@example.com", role="user", password_hash="x")
+    db.session.add_all([admin, other])
+    db.session.flush()
+    for i, name in enumerate(NAMES):
+        db.session.add(GoogleIntegrationAccount(
+            account_name=name, google_email=f"teacher{i}@example.com",
+            owner_user_id=(admin, other)[i % 2].id, created_at=datetime(2026, 1, i + 1)
+        ))
+    db.session.commit()
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session["_user_id"] = str(admin.id)
+    return client
+
+
+def all_pages(client, **params):
+    """ids of every page, following next_cursor; also returns the number of requests."""
+    ids, cursor, requests = [], None, 0
+    while True:
+        args = dict(params, cursor=cursor) if cursor else params
+        response = client.get("/api/google_accounts", query_string=args)
+        assert response.status_code == 200, response.json
+        requests += 1
+        ids += [item["id"] for item in response.json["items"]]
+        cursor = response.json["next_cursor"]
+        if cursor is None:
+            return ids, requests
+
+
+def test_cursor_round_trip():
+    created = datetime(2026, 3, 4, 5, 6)
+    column = GoogleIntegrationAccount.created_at
+    assert decode_cursor(encode_cursor(created, 42), column) == (created, 42)
+    assert decode_cursor(encode_cursor(None, 7), column) == (None, 7)
+
+
+def test_pages_by_id_cover_every_row_once(client):
+    ids, requests = all_pages(client, limit=3)
+    assert ids == list(range(1, len(NAMES) + 1))
+    assert requests == 3
+    ids, _ = all_pages(client, limit=3, sort="-id")
+    assert ids == list(range(len(NAMES), 0, -1))
+
+
+@pytest.mark.parametrize("limit", [1, 2, 3, 100])
+def test_nulls_sort_last_in_both_directions(client, limit):
+    assert all_pages(client, limit=limit, sort="account_name")[0] == BY_NAME
+    assert all_pages(client, limit=limit, sort="-account_name")[0] == BY_NAME_DESC
+
+
+def test_filters_apply_across_pages(client):
+    ids, _ = all_pages(client, limit=1, owner_user_id=2, sort="account_name")
+    assert ids == [4, 6, 2]
+    ids, _ = all_pages(client, limit=2, created_at__gte="2026-01-03", created_at__lte="2026-01-05")
+    assert ids == [3, 4, 5]
+    # Fields outside the allow-list are not filters
+    ids, _ = all_pages(client, account_name="alpha")
+    assert len(ids) == len(NAMES)
+
+
+@pytest.mark.parametrize("params, message", [
+    ({"cursor": "not-a-cursor"}, "Invalid cursor"),
+    ({"sort": "owner_user_id"}, "Cannot sort by"),
+    ({"limit": "many"}, "limit must be an integer"),
+    ({"owner_user_id": "abc"}, "Invalid value for owner_user_id"),
+])
+def test_bad_arguments_are_a_400(client, params, message):
+    response = client.get("/api/google_accounts", query_string=params)
+    assert response.status_code == 400
+    assert response.json["status"] == "error" and message in response.json["message"]
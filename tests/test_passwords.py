@@ -0,0 +1,85 @@
+import pytest
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS, check_password_hash, generate_password_hash
+
+from app import create_app
+from extensions import db
+from models import UserAccount
+from passwords import canonical_method, needs_rehash
+
+PASSWORD = "correct horse battery staple"
+OLD_METHOD = "pbkdf2:sha256:1000"
+NEW_METHOD = "pbkdf2:sha256:2000"
+
+
+@pytest.mark.parametrize("method, canonical", [
+    ("scrypt", "scrypt:32768:8:1"),
+    ("scrypt:16384:8:2", "scrypt:16384:8:2"),
+    ("pbkdf2", f"pbkdf2:sha256:{DEFAULT_PBKDF2_ITERATIONS}"),
+    ("pbkdf2:sha512", f"pbkdf2:sha512:{DEFAULT_PBKDF2_ITERATIONS}"),
+    ("pbkdf2:sha256:600000", "pbkdf2:sha256:600000"),
+])
+def test_canonical_method_matches_the_hash_prefix(method, canonical):
+    assert canonical_method(method) == canonical
+    assert generate_password_hash("x", method).startswith(f"{canonical}$")
+
+
+@pytest.mark.parametrize("method", ["md5", "scrypt:16384:8", "scrypt:big:8:1", "pbkdf2:sha256:1000:1", "plain"])
+def test_unsupported_methods_are_rejected(method):
+    with pytest.raises(ValueError):
+        canonical_method(method)
+
+
+def test_app_refuses_to_start_with_a_bad_method():
+    with pytest.raises(ValueError, match="Invalid PASSWORD_HASH_METHOD"):
+        create_app({"SQLALCHEMY_DATABASE_URI": "sqlite://", "PASSWORD_HASH_METHOD": "md5"})
+
+
+def test_needs_rehash_compares_with_the_configured_method(monkeypatch):
+    stored = generate_password_hash(PASSWORD, OLD_METHOD)
+    monkeypatch.setattr("config.Config.PASSWORD_HASH_METHOD", OLD_METHOD)
+    assert not needs_rehash(stored)
+    monkeypatch.setattr("config.Config.PASSWORD_HASH_METHOD", NEW_METHOD)
+    assert needs_rehash(stored)
+    # Spelled differently, same parameters
+    monkeypatch.setattr("config.Config.PASSWORD_HASH_METHOD", "pbkdf2")
+    assert not needs_rehash(generate_password_hash(PASSWORD, f"pbkdf2:sha256:{DEFAULT_PBKDF2_ITERATIONS}"))
+
+
+@pytest.fixture
+def login(tmp_path):
+    """Store a hash made with OLD_METHOD, then log in to an app configured with ``method``."""
+    def login(password, method=NEW_METHOD):
+        app = create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'users.db'}", "TESTING": True,
+                          "PASSWORD_HASH_METHOD": method, "READ_CACHE_DIR": str(tmp_path / "cache_versions")})
+        with app.app_context():
+            db.create_all()
+            if not UserAccount.query.filter_by(username="teacher").first():
+                db.session.add(UserAccount(username="teacher", email="teacher@example.com", role="user",
+                                           active=True, password_hash=generate_password_hash(PASSWORD, OLD_METHOD)))
+                db.session.commit()
+            before = UserAccount.query.filter_by(username="teacher").one().password_hash
+            response = app.test_client().post("/login", data={"username": "teacher", "password": password})
+            db.session.expire_all()
+            after = UserAccount.query.filter_by(username="teacher").one().password_hash
+            db.session.remove()
+        return response, before, after
+    return login
+
+
+def test_successful_login_rehashes_with_the_new_method(login):
+    response, before, after = login(PASSWORD)
+    assert response.status_code == 302 and "dashboard" in response.location
+    assert before.startswith(f"{OLD_METHOD}$") and after.startswith(f"{NEW_METHOD}$")
+    assert check_password_hash(after, PASSWORD)
+
+
+def test_failed_login_leaves_the_hash_alone(login):
+    response, before, after = login("wrong password")
+    assert response.status_code == 200
+    assert after == before
+
+
+def test_login_with_current_parameters_does_not_rewrite_the_hash(login):
+    response, before, after = login(PASSWORD, method=OLD_METHOD)
+    assert response.status_code == 302
+    assert after == before
@@ -0,0 +1,143 @@
+import pytest
+
+from app import create_app
+from extensions import db
+from models import Class, UserAccount
+from read_cache import LocalVersions, ReadCache
+from reference_data import class_filter_options
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def counting_loader(value="value"):
+    calls = []
+
+    def load():
+        calls.append(value)
+        return value
+    return load, calls
+
+
+def test_entries_are_hits_until_a_table_version_changes_or_they_expire():
+    clock, backend = FakeClock(), LocalVersions()
+    cache = ReadCache(backend, ttl=60, clock=clock)
+    load, calls = counting_loader()
+
+    for _ in range(3):
+        assert cache.get_or_load("options", (), ("class",), load) == "value"
+    assert len(calls) == 1
+
+    backend.bump({"student"})
+    cache.get_or_load("options", (), ("class",), load)
+    assert len(calls) == 1  # another table
+
+    backend.bump({"class"})
+    cache.get_or_load("options", (), ("class",), load)
+    assert len(calls) == 2
+
+    clock.now = 61
+    cache.get_or_load("options", (), ("class",), load)
+    assert len(calls) == 3
+    assert cache.snapshot()["caches"]["options"] == {
+        "hits": 3, "misses": 3, "stale": 1, "expired": 1, "hit_ratio": 0.5
+    }
+
+
+def test_least_recently_used_entries_are_evicted():
+    cache = ReadCache(LocalVersions(), max_entries=2)
+    load, calls = counting_loader()
+    for key in ("a", "b", "a", "c", "a", "b"):
+        cache.get_or_load("lookup", key, ("class",), load)
+    assert calls == ["value"] * 4  # a, b, c, then b again after c evicted it
+    assert cache.snapshot()["evictions"] == 2
+
+
+def test_ttl_zero_disables_caching():
+    cache = ReadCache(LocalVersions(), ttl=0)
+    load, calls = counting_loader()
+    cache.get_or_load("lookup", (), ("class",), load)
+    cache.get_or_load("lookup", (), ("class",), load)
+    assert len(calls) == 2
+    assert cache.snapshot()["caches"] == {}
+
+
+def worker(tmp_path, backend):
+    # Each create_app() stands in for one worker process: its own caches, shared database and stamp files
+    return create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'app.db'}", "TESTING": True,
+                       "READ_CACHE_BACKEND": backend, "READ_CACHE_DIR": str(tmp_path / "cache_versions")})
+
+
+def add_class(code, subject):
+    db.session.add(Class(class_code=code, class_name=code, subject=subject))
+    db.session.commit()
+
+
+@pytest.mark.parametrize("backend", ["database", "file", "local"])
+def test_a_write_invalidates_cached_reference_data(tmp_path, backend):
+    app = worker(tmp_path, backend)
+    with app.app_context():
+        db.create_all()
+        add_class("C1", "Physics")
+        assert class_filter_options()["subject"] == ["Physics"]
+        assert class_filter_options()["subject"] == ["Physics"]
+
+        add_class("C2", "Chemistry")
+        assert class_filter_options()["subject"] == ["Chemistry", "Physics"]
+        counters = app.extensions["read_cache"].snapshot()["caches"]["class_filter_options"]
+        assert (counters["hits"], counters["misses"], counters["stale"]) == (1, 2, 1)
+        db.session.remove()
+
+
+def test_uncommitted_writes_are_read_through(tmp_path):
+    app = worker(tmp_path, "local")
+    with app.app_context():
+        db.create_all()
+        add_class("C1", "Physics")
+        class_filter_options()
+        db.session.add(Class(class_code="C2", class_name="C2", subject="Chemistry"))
+        db.session.flush()
+        assert class_filter_options()["subject"] == ["Chemistry", "Physics"]
+        db.session.rollback()
+        assert class_filter_options()["subject"] == ["Physics"]
+        db.session.remove()
+
+
+@pytest.mark.parametrize("backend", ["database", "file"])
+def test_other_workers_see_a_write_at_once(tmp_path, backend):
+    first, second = worker(tmp_path, backend), worker(tmp_path, backend)
+    with first.app_context():
+        db.create_all()
+        add_class("C1", "Physics")
+    with second.app_context():
+        assert class_filter_options()["subject"] == ["Physics"]
+        assert class_filter_options()["subject"] == ["Physics"]
+    with first.app_context():
+        add_class("C2", "Chemistry")
+    with second.app_context():
+        assert class_filter_options()["subject"] == ["Chemistry", "Physics"]
+        db.session.remove()
+
+
+def test_cache_stats_endpoint_reports_hits_and_misses(tmp_path):
+    app = worker(tmp_path, "local")
+    with app.app_context():
+        db.create_all()
+        db.session.add(UserAccount(username="admin", email="admin@example.com", role="admin", password_hash="x"))
+        db.session.commit()
+        class_filter_options()
+        class_filter_options()
+        db.session.remove()
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session["_user_id"] = "1"
+    stats = client.get("/api/read_cache").json
+    assert stats["read_cache"]["backend"] == "local"
+    assert stats["read_cache"]["caches"]["class_filter_options"]["hits"] == 1
+    assert stats["read_cache"]["caches"]["class_filter_options"]["hit_ratio"] == 0.5
+    assert stats["identity_cache"]["caches"]["load_identity"]["misses"] >= 1
@@ -0,0 +1,152 @@
+import json
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from googleapiclient.discovery import build_from_document
+from googleapiclient.discovery_cache import get_static_doc
+from googleapiclient.errors import HttpError
+from googleapiclient.http import build_http
+
+import youtube_uploader
+from google_quota import QuotaHttpRequest, get_limiter, reset_limiters
+
+CHUNK = youtube_uploader.CHUNK_GRANULARITY
+SIZE = 4 * CHUNK + 1000
+
+
+class FakeYouTube(ThreadingHTTPServer):
+    """Local stand-in for YouTube's resumable upload endpoint."""
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), FakeUploadHandler)
+        self.sessions = {}      # session id -> bytearray of stored bytes
+        self.sessions_opened = 0
+        self.bytes_received = 0
+        self.fail_chunk = None  # store this chunk number, then answer 503 as if it was lost
+        self.chunks = 0
+        self.expired = set()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class FakeUploadHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def reply(self, status, headers=(), body=b""):
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        server = self.server
+        server.sessions_opened += 1
+        session_id = str(server.sessions_opened)
+        server.sessions[session_id] = bytearray()
+        self.reply(200, [("Location", f"{server.url}/session/{session_id}")])
+
+    def do_PUT(self):
+        server = self.server
+        session_id = self.path.rsplit("/", 1)[1]
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        if session_id in server.expired:
+            return self.reply(404, [("Content-Type", "application/json")], b'{"error": {"code": 404}}')
+        stored = server.sessions[session_id]
+        match = re.match(r"bytes (\d+)-(\d+)/(\d+)", self.headers.get("Content-Range", ""))
+        if match:
+            start, total = int(match.group(1)), int(match.group(3))
+            assert start == len(stored), "client resent or skipped bytes"
+            stored.extend(body)
+            server.bytes_received += len(body)
+            server.chunks += 1
+            if server.chunks == server.fail_chunk:
+                return self.reply(503, [("Content-Type", "application/json")], b'{"error": {"code": 503}}')
+        else:
+            total = int(self.headers["Content-Range"].rsplit("/", 1)[1])
+        if len(stored) == total:
+            video = json.dumps({"id": f"video-{session_id}", "size": len(stored)}).encode()
+            return self.reply(200, [("Content-Type", "application/json")], video)
+        headers = [("Range", f"bytes=0-{len(stored) - 1}")] if stored else []
+        self.reply(308, headers)
+
+
+@pytest.fixture
+def fake_youtube(monkeypatch, tmp_path):
+    server = FakeYouTube()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    doc = json.loads(get_static_doc("youtube", "v3"))
+    doc["rootUrl"] = server.url + "/"
+    service = build_from_document(doc, http=build_http(), requestBuilder=QuotaHttpRequest)
+    monkeypatch.setattr(youtube_uploader, "get_authenticated_service", lambda: service)
+    monkeypatch.setattr(youtube_uploader, "UPLOAD_NUM_RETRIES", 0)
+    reset_limiters()
+    video = tmp_path / "lesson.mp4"
+    video.write_bytes(bytes(range(256)) * (SIZE // 256) + b"x" * (SIZE % 256))
+    yield server, str(video)
+    server.shutdown()
+    server.server_close()
+    reset_limiters()
+
+
+def upload(path, **kwargs):
+    return youtube_uploader.upload_video_to_youtube(path, "Lesson", "", chunk_size=CHUNK, **kwargs)
+
+
+def test_upload_sends_every_chunk_once(fake_youtube):
+    server, path = fake_youtube
+    progress = []
+    assert upload(path, progress_callback=lambda sent, total: progress.append(sent)) == "video-1"
+    assert server.sessions["1"] == open(path, "rb").read()
+    assert server.bytes_received == SIZE
+    assert progress[-1] == SIZE
+
+
+def test_interrupted_upload_resumes_from_last_stored_byte(fake_youtube):
+    server, path = fake_youtube
+    saved = []
+    server.fail_chunk = 3
+    with pytest.raises(HttpError):
+        upload(path, on_session=saved.append)
+    assert saved == [f"{server.url}/session/1"]
+    assert len(server.sessions["1"]) == 3 * CHUNK
+
+    progress = []
+    video_id = upload(path, session_uri=saved[-1], on_session=saved.append,
+                      progress_callback=lambda sent, total: progress.append(sent))
+    assert video_id == "video-1"
+    assert server.sessions_opened == 1
+    assert server.sessions["1"] == open(path, "rb").read()
+    # Only the bytes the server had not stored were sent again
+    assert server.bytes_received == SIZE
+    assert progress[0] == 3 * CHUNK
+
+
+def test_resume_of_finished_upload_sends_nothing(fake_youtube):
+    server, path = fake_youtube
+    upload(path)
+    limiter = get_limiter("youtube")
+    before = limiter.snapshot()
+    assert upload(path, session_uri=f"{server.url}/session/1") == "video-1"
+    assert server.bytes_received == SIZE
+    # The status query goes through the limiter without spending units
+    after = limiter.snapshot()
+    assert after["calls"] == before["calls"] + 1
+    assert after["used_units"] == before["used_units"]
+
+
+def test_expired_session_restarts_upload(fake_youtube):
+    server, path = fake_youtube
+    server.sessions["old"] = bytearray()
+    server.expired.add("old")
+    saved = []
+    assert upload(path, session_uri=f"{server.url}/session/old", on_session=saved.append) == "video-1"
+    assert saved == [None, f"{server.url}/session/1"]
+    assert server.sessions["1"] == open(path, "rb").read()
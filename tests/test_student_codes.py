@@ -0,0 +1,59 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from app import create_app
+from extensions import db
+from models import Student, StudentCodeSequence
+from student_codes import allocate_student_codes
+
+
+def add_student(code):
+    db.session.add(Student(student_code=code, first_name="First", last_name="Last"))
+
+
+def test_codes_are_sequential_across_allocations(app):
+    assert allocate_student_codes(1, year=2026) == ["STU-2026-0001"]
+    assert allocate_student_codes(3, year=2026) == ["STU-2026-0002", "STU-2026-0003", "STU-2026-0004"]
+    db.session.commit()
+    assert allocate_student_codes(2, year=2026) == ["STU-2026-0005", "STU-2026-0006"]
+    assert db.session.get(StudentCodeSequence, 2026).last_value == 6
+
+
+def test_counter_is_seeded_from_existing_codes(app):
+    for code in ("STU-2026-0007", "STU-2026-0012", "STU-2026-legacy", "STU-2025-0099"):
+        add_student(code)
+    db.session.commit()
+    assert allocate_student_codes(2, year=2026) == ["STU-2026-0013", "STU-2026-0014"]
+
+
+def test_new_year_starts_a_new_counter(app):
+    assert allocate_student_codes(2, year=2026) == ["STU-2026-0001", "STU-2026-0002"]
+    assert allocate_student_codes(1, year=2027) == ["STU-2027-0001"]
+    assert allocate_student_codes(1, year=2026) == ["STU-2026-0003"]
+    assert {row.year: row.last_value for row in StudentCodeSequence.query} == {2026: 3, 2027: 1}
+
+
+def test_rolled_back_codes_are_reissued(app):
+    allocate_student_codes(1, year=2026)
+    db.session.commit()
+    allocate_student_codes(5, year=2026)
+    db.session.rollback()
+    assert allocate_student_codes(1, year=2026) == ["STU-2026-0002"]
+
+
+def test_concurrent_allocations_get_disjoint_ranges(tmp_path):
+    app = create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'codes.db'}", "TESTING": True,
+                      "READ_CACHE_DIR": str(tmp_path / "cache_versions")})
+    with app.app_context():
+        db.create_all()
+
+    def allocate(_):
+        with app.app_context():
+            codes = allocate_student_codes(3, year=2026)
+            for code in codes:
+                add_student(code)
+            db.session.commit()
+            return codes
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        codes = [code for batch in pool.map(allocate, range(20)) for code in batch]
+    assert sorted(codes) == [f"STU-2026-{n:04}" for n in range(1, 61)]
@@ -0,0 +1,119 @@
+import csv
+import functools
+import io
+
+import pytest
+from openpyxl import Workbook
+
+import student_import
+from blueprints import students
+from extensions import db
+from models import Class, Parent, Student, StudentClassAssignment, UserAccount
+
+HEADER = ["First Name", "Last Name", "Email", "Class", "Parent Name", "DOB"]
+ROWS = [
+    ["Ada", "Lovelace", "ada@example.com", "C1;C1", "Anne", "2010-12-10"],
+    ["Alan", "", "alan@example.com", "C1", "", ""],
+    ["Grace", "Hopper", "not-an-email", "C9", "", "yesterday"],
+    ["Emmy", "Noether", "emmy@example.com", "C2;C1", "", ""],
+]
+
+
+@pytest.fixture
+def client(app):
+    db.session.add(UserAccount(username="admin", email="admin@example.com", role="admin", password_hash="x"))
+    db.session.add_all([Class(class_code="C1", class_name="Physics"), Class(class_code="C2", class_name="Maths")])
+    db.session.commit()
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session["_user_id"] = "1"
+    return client
+
+
+def csv_file(rows, header=HEADER):
+    out = io.StringIO()
+    csv.writer(out).writerows([header] + rows)
+    return io.BytesIO(out.getvalue().encode()), "students.csv"
+
+
+def xlsx_file(rows, header=HEADER):
+    workbook = Workbook()
+    for row in [header] + rows:
+        workbook.active.append(row)
+    out = io.BytesIO()
+    workbook.save(out)
+    out.seek(0)
+    return out, "students.xlsx"
+
+
+def post(client, upload, dry_run=False, query=""):
+    return client.post(f"/api/students/import{query}", content_type="multipart/form-data",
+                       data={"file": upload, "dry_run": "true" if dry_run else ""})
+
+
+@pytest.mark.parametrize("make_file", [csv_file, xlsx_file])
+def test_import_reports_rejected_rows_and_saves_the_rest(client, make_file):
+    response = post(client, make_file(ROWS))
+    assert response.status_code == 200, response.json
+    report = response.json
+    assert (report["rows"], report["imported"], report["rejected"]) == (4, 2, 2)
+    assert [e["row"] for e in report["errors"]] == [3, 4]
+    assert report["errors"][0]["errors"] == ["last_name is required"]
+    assert set(report["errors"][1]["errors"]) == {
+        "dob must be a date (YYYY-MM-DD)", "student_email is not a valid email address", "Unknown class_code 'C9'"
+    }
+
+    ada = Student.query.filter_by(first_name="Ada").one()
+    assert ada.dob.isoformat() == "2010-12-10"
+    assert Parent.query.filter_by(student_id=ada.id).one().name == "Anne"
+    # "C1;C1" enrols once
+    assert [a.class_id for a in StudentClassAssignment.query.filter_by(student_id=ada.id)] == [1]
+    emmy = Student.query.filter_by(first_name="Emmy").one()
+    enrolments = StudentClassAssignment.query.filter_by(student_id=emmy.id).order_by(StudentClassAssignment.id)
+    assert [(a.class_id, a.is_primary) for a in enrolments] == [(2, True), (1, False)]
+    assert [s["student_code"] for s in report["students"]] == [ada.student_code, emmy.student_code]
+
+
+def test_dry_run_validates_without_saving(client):
+    report = post(client, csv_file(ROWS), dry_run=True).json
+    assert (report["dry_run"], report["valid"], report["imported"], report["rejected"]) == (True, 2, 0, 2)
+    assert Student.query.count() == StudentClassAssignment.query.count() == 0
+
+
+def test_error_report_csv_lists_each_rejected_row(client):
+    response = post(client, csv_file(ROWS), dry_run=True, query="?format=csv")
+    assert response.mimetype == "text/csv"
+    rows = list(csv.reader(io.StringIO(response.get_data(as_text=True))))
+    assert rows[0][:2] == ["row", "errors"] and "student_email" in rows[0]
+    assert [(row[0], row[1]) for row in rows[1:]] == [("3", "last_name is required"), ("4", rows[2][1])]
+    assert rows[2][rows[0].index("first_name")] == "Grace"
+
+
+def test_failed_batch_rolls_back_the_whole_import(client, monkeypatch):
+    allocate = student_import.allocate_student_codes
+    batches = []
+
+    def failing_second_batch(count):
+        batches.append(count)
+        if len(batches) == 2:
+            raise RuntimeError("database went away")
+        return allocate(count)
+    monkeypatch.setattr(student_import, "allocate_student_codes", failing_second_batch)
+    monkeypatch.setattr(students, "StudentImport", functools.partial(student_import.StudentImport, batch_size=1))
+
+    response = post(client, csv_file([ROWS[0], ROWS[3]]))
+    assert response.status_code == 500
+    assert "nothing was saved" in response.json["message"]
+    assert batches == [1, 1]
+    assert Student.query.count() == StudentClassAssignment.query.count() == Parent.query.count() == 0
+
+
+@pytest.mark.parametrize("upload, message", [
+    ((io.BytesIO(b"first_name,last_name\n"), "students.txt"), "Upload a .csv or .xlsx file."),
+    (csv_file([["Ada"]], header=["first_name"]), "Missing required column(s): last_name"),
+    ((io.BytesIO(b""), "students.csv"), "The file is empty."),
+])
+def test_unreadable_files_are_a_400(client, upload, message):
+    response = post(client, upload)
+    assert response.status_code == 400
+    assert response.json["message"] == message
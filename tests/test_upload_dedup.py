@@ -0,0 +1,88 @@
+import hashlib
+import io
+
+import pytest
+
+import youtube_uploader
+from app import create_app
+from blueprints import google_integration
+from extensions import db
+from models import (Class, GoogleAccountPermissions, GoogleIntegrationAccount, UploadJob, UserAccount, Video,
+                    VideoContentHash)
+
+RECORDING = b"lecture recording"
+
+
+@pytest.fixture
+def upload_app(tmp_path, monkeypatch):
+    # The pipeline runs in its own app context, so it needs a real database file
+    app = create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'upload.db'}", "TESTING": True,
+                      "UPLOAD_SPOOL_DIR": str(tmp_path / "spool"),
+                      "READ_CACHE_DIR": str(tmp_path / "cache_versions")})
+    with app.app_context():
+        db.create_all()
+        user = UserAccount(username="teacher", email="teacher@example.com", role="admin", password_hash="x")
+        db.session.add(user)
+        db.session.flush()
+        account = GoogleIntegrationAccount(google_email="teacher@example.com", owner_user_id=user.id)
+        db.session.add(account)
+        db.session.flush()
+        db.session.add(GoogleAccountPermissions(integration_account_id=account.id, user_id=user.id))
+        old = Class(class_code="OLD", class_name="Old class", playlist_id="PL-OLD")
+        new = Class(class_code="NEW", class_name="New class", playlist_id="PL-NEW")
+        db.session.add_all([old, new])
+        db.session.flush()
+        db.session.add(Video(video_id="vid-1", title="Lecture", class_id=old.id, youtube_playlist_id="PL-OLD",
+                             classroom_posted=True, integration_account_id=account.id))
+        db.session.flush()
+        db.session.add(VideoContentHash(sha256=hashlib.sha256(RECORDING).hexdigest(), video_id="vid-1"))
+        db.session.commit()
+
+        # Run jobs inline, against a YouTube that records what it was asked to do
+        monkeypatch.setattr(google_integration.upload_runner, "submit", lambda fn, *args: fn(*args))
+        app.youtube_calls = []
+        monkeypatch.setattr(youtube_uploader, "get_authenticated_service", lambda: "youtube")
+        monkeypatch.setattr(youtube_uploader, "upload_video_to_youtube",
+                            lambda *args, **kwargs: app.youtube_calls.append("upload") or "vid-2")
+        monkeypatch.setattr(youtube_uploader, "add_video_to_playlist",
+                            lambda youtube, playlist_id, video_id: app.youtube_calls.append((playlist_id, video_id)))
+        yield app
+        db.session.remove()
+
+
+def upload(app, data, class_code="NEW"):
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session["_user_id"] = "1"
+    response = client.post("/api/upload_video", content_type="multipart/form-data", data={
+        "file": (io.BytesIO(data), "lecture.mp4"), "class_selected": class_code, "title": "Lecture"
+    })
+    assert response.status_code == 202, response.json
+    db.session.expire_all()
+    job = db.session.get(UploadJob, response.json["job_id"])
+    assert job.status == "success", job.error
+    return response.json
+
+
+def test_duplicate_skips_youtube_upload_and_moves_to_the_class(upload_app):
+    assert upload(upload_app, RECORDING)["deduplicated"]
+    assert upload_app.youtube_calls == [("PL-NEW", "vid-1")]
+
+    video = Video.query.filter_by(video_id="vid-1").one()
+    assert video.class_id == Class.query.filter_by(class_code="NEW").one().id
+    assert video.youtube_playlist_id == "PL-NEW"
+    assert not video.classroom_posted
+    assert Video.query.count() == VideoContentHash.query.count() == 1
+
+
+def test_duplicate_already_in_the_playlist_is_not_added_again(upload_app):
+    upload(upload_app, RECORDING)
+    upload(upload_app, RECORDING)
+    assert upload_app.youtube_calls == [("PL-NEW", "vid-1")]
+
+
+def test_new_file_is_uploaded_and_its_hash_recorded(upload_app):
+    assert not upload(upload_app, b"another recording")["deduplicated"]
+    assert upload_app.youtube_calls == ["upload", ("PL-NEW", "vid-2")]
+    known = VideoContentHash.query.filter_by(sha256=hashlib.sha256(b"another recording").hexdigest()).one()
+    assert known.video_id == "vid-2"
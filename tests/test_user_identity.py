@@ -0,0 +1,35 @@
+from app import create_app
+from extensions import db
+from models import UserAccount
+from user_identity import load_identity
+
+
+def worker(tmp_path):
+    # Each create_app() stands in for one worker process: its own caches, shared database and stamp files
+    return create_app({"SQLALCHEMY_DATABASE_URI": f"sqlite:///{tmp_path / 'app.db'}", "TESTING": True,
+                       "READ_CACHE_DIR": str(tmp_path / "cache_versions")})
+
+
+def test_deactivation_reaches_other_workers_at_once(tmp_path):
+    first, second = worker(tmp_path), worker(tmp_path)
+    with first.app_context():
+        db.create_all()
+        user = UserAccount(username="admin", email="admin@example.com", role="admin", password_hash="x")
+        db.session.add(user)
+        db.session.commit()
+        user_id = user.id
+
+    with second.app_context():
+        assert load_identity(user_id).role == "admin"
+        assert second.extensions["identity_cache"].snapshot()["caches"]["load_identity"]["misses"] == 1
+        assert load_identity(user_id).is_active
+
+    with first.app_context():
+        user = db.session.get(UserAccount, user_id)
+        user.role, user.active = "user", False
+        db.session.commit()
+
+    with second.app_context():
+        identity = load_identity(user_id)
+        assert identity.role == "user" and not identity.is_active
+        db.session.remove()
@@ -0,0 +1,87 @@
+import hashlib
+import os
+import tempfile
+
+from flask import Request, current_app
+from werkzeug.exceptions import RequestEntityTooLarge
+
+
+class SpooledUpload:
+    """
+    Writable file that multipart parsing streams an upload straight into.
+
+    The bytes land in a uniquely named ``.part`` file in the spool directory
+    while a SHA-256 is computed on the way, so the upload is written to disk
+    once and concurrent uploads with the same client filename never collide.
+    """
+
+    def __init__(self, directory, max_size=None):
+        os.makedirs(directory, exist_ok=True)
+        fd, self.path = tempfile.mkstemp(dir=directory, suffix=".part")
+        self._file = os.fdopen(fd, "w+b")
+        self._hash = hashlib.sha256()
+        self.size = 0
+        self.max_size = max_size
+        self.claimed = False
+
+    def write(self, data):
+        self.size += len(data)
+        if self.max_size and self.size > self.max_size:
+            raise RequestEntityTooLarge(f"Upload exceeds the {self.max_size} byte limit.")
+        self._hash.update(data)
+        return self._file.write(data)
+
+    @property
+    def sha256(self):
+        return self._hash.hexdigest()
+
+    def claim(self, filename=None):
+        """Close the spool file and keep it, optionally renaming it; returns the path."""
+        self._file.close()
+        if filename:
+            final_path = os.path.join(os.path.dirname(self.path), filename)
+            os.replace(self.path, final_path)
+            self.path = final_path
+        self.claimed = True
+        return self.path
+
+    def discard(self):
+        self._file.close()
+        remove_quietly(self.path)
+
+    def __getattr__(self, name):
+        return getattr(self._file, name)
+
+
+def remove_quietly(path):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class SpoolingRequest(Request):
+    """Request that spools file uploads for ``SPOOLED_UPLOAD_ENDPOINTS`` via SpooledUpload."""
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        if self.endpoint not in current_app.config.get("SPOOLED_UPLOAD_ENDPOINTS", ()):
+            return super()._get_file_stream(total_content_length, content_type, filename, content_length)
+        spool = SpooledUpload(
+            current_app.config["UPLOAD_SPOOL_DIR"],
+            current_app.config.get("MAX_VIDEO_UPLOAD_BYTES")
+        )
+        self.spooled_uploads.append(spool)
+        return spool
+
+    @property
+    def spooled_uploads(self):
+        if "spooled_uploads" not in self.__dict__:
+            self.__dict__["spooled_uploads"] = []
+        return self.__dict__["spooled_uploads"]
+
+
+def discard_unclaimed_spools(request):
+    """Delete spool files a request created but did not hand off (errors, rejections)."""
+    for spool in getattr(request, "spooled_uploads", ()):
+        if not spool.claimed:
+            spool.discard()
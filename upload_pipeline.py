@@ -0,0 +1,245 @@
+import json
+import os
+from datetime import datetime, timedelta
+
+try:
+    from zoneinfo import ZoneInfo
+except ImportError:
+    from pytz import timezone as ZoneInfo
+
+import click
+from flask import current_app
+from flask.cli import with_appcontext
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+
+from extensions import db
+from google_sync import upsert_playlists
+from job_queue import JobRunner, Stage, StageFailed, run_stages
+from models import Class, Video, UploadJob, YouTubePlaylist, VideoContentHash, latest_course_for_class
+from upload_ingest import remove_quietly
+
+
+# === Background Video Upload Pipeline ===
+PLAYLIST_INDEX_TTL = int(os.environ.get("PLAYLIST_INDEX_TTL_SECONDS", 6 * 3600))
+upload_runner = JobRunner(max_workers=int(os.environ.get("UPLOAD_WORKERS", "2")), thread_name_prefix="upload")
+
+
+def upload_stage_youtube(job, ctx):
+    from youtube_uploader import upload_video_to_youtube
+
+    def on_session(uri):
+        # Persist the session so a restarted worker continues the same upload
+        ctx["upload_session_uri"] = uri
+        save_upload_job(job, ctx)
+
+    def on_progress(sent, total):
+        ctx["upload_bytes"] = [sent, total]
+        save_upload_job(job, ctx)
+
+    ctx["video_id"] = upload_video_to_youtube(
+        job.file_path, job.title, job.description or "",
+        progress_callback=on_progress,
+        session_uri=ctx.get("upload_session_uri"),
+        on_session=on_session
+    )
+    ctx.pop("upload_session_uri", None)
+    ctx["video_url"] = f"https://www.youtube.com/watch?v={ctx['video_id']}"
+
+
+class PlaylistIndex:
+    """Title -> playlist id lookups served from the youtube_playlist table."""
+
+    def __init__(self, ttl=None, account_id=None):
+        self.ttl = timedelta(seconds=ttl if ttl is not None else PLAYLIST_INDEX_TTL)
+        self.account_id = account_id
+
+    def get(self, title):
+        row = YouTubePlaylist.query.filter_by(title=title).order_by(YouTubePlaylist.id).first()
+        return row.playlist_id if row else None
+
+    def is_stale(self):
+        last_sync = db.session.query(func.max(YouTubePlaylist.synced_at)).scalar()
+        return last_sync is None or datetime.utcnow() - last_sync > self.ttl
+
+    def refresh(self, playlists):
+        """Replace the index with the full channel listing ``[(playlist_id, title), ...]``."""
+        upsert_playlists(playlists, self.account_id)
+        db.session.commit()
+
+    def put(self, playlist_id, title):
+        if not YouTubePlaylist.query.filter_by(playlist_id=playlist_id).first():
+            db.session.add(YouTubePlaylist(
+                playlist_id=playlist_id, title=title,
+                integration_account_id=self.account_id, synced_at=datetime.utcnow()
+            ))
+            db.session.commit()
+
+
+def upload_stage_playlist(job, ctx):
+    from youtube_uploader import get_authenticated_service, create_playlist_if_missing, add_video_to_playlist
+
+    youtube = get_authenticated_service()
+    if not ctx.get("playlist_id"):
+        # Classes that already have a playlist never need a lookup
+        cls = Class.query.filter_by(class_code=job.class_code).first()
+        ctx["playlist_id"] = (cls.playlist_id if cls else None) or create_playlist_if_missing(
+            youtube, job.class_name or job.class_code, index=PlaylistIndex(account_id=job.integration_account_id)
+        )
+    already_listed = ctx.get("deduplicated") and Video.query.filter_by(
+        video_id=ctx["video_id"], youtube_playlist_id=ctx["playlist_id"]
+    ).first()
+    if not already_listed:
+        add_video_to_playlist(youtube, ctx["playlist_id"], ctx["video_id"])
+
+
+def upload_stage_database(job, ctx):
+    cls = Class.query.filter_by(class_code=job.class_code).first()
+    if cls:
+        cls.playlist_id = ctx["playlist_id"]
+        try:
+            cls.updated_at = datetime.now(ZoneInfo('Australia/Melbourne'))
+        except Exception:
+            cls.updated_at = datetime.utcnow()
+    # Retries must not insert the same video twice
+    video = Video.query.filter_by(video_id=ctx["video_id"]).first()
+    if not video:
+        video = Video(
+            video_id=ctx["video_id"],
+            title=job.title,
+            class_id=cls.id if cls else None,
+            youtube_playlist_id=ctx["playlist_id"],
+            classroom_posted=False,
+            integration_account_id=job.integration_account_id,
+            uploaded_by=job.uploaded_by,
+            published_at=datetime.utcnow()
+        )
+        db.session.add(video)
+    elif cls and video.class_id != cls.id:
+        # A re-uploaded file reuses the existing video: attach it to the target class
+        video.class_id = cls.id
+        video.youtube_playlist_id = ctx["playlist_id"]
+        video.classroom_posted = False
+    if ctx.get("sha256") and not ctx.get("deduplicated"):
+        try:
+            with db.session.begin_nested():
+                db.session.add(VideoContentHash(
+                    sha256=ctx["sha256"],
+                    video_id=ctx["video_id"],
+                    file_size=ctx.get("file_size"),
+                    created_at=datetime.utcnow()
+                ))
+        except IntegrityError:
+            pass  # A concurrent upload of the same file recorded it first
+    db.session.commit()
+    ctx["class_id"] = cls.id if cls else None
+
+
+def upload_stage_classroom(job, ctx):
+    ctx["classroom_status"] = "Not posted to Classroom"
+    if not job.post_to_classroom:
+        return
+    gclass = latest_course_for_class(ctx["class_id"]) if ctx.get("class_id") else None
+    if not (gclass and gclass.course_id):
+        ctx["classroom_status"] = "Class not linked to Google Classroom"
+        return
+    from classroom_auth import get_classroom_service
+    service = get_classroom_service()
+    announcement = {
+        "text": job.description or "",
+        "materials": [
+            {"youtubeVideo": {"id": ctx["video_id"]}}
+        ]
+    }
+    service.courses().announcements().create(courseId=gclass.course_id, body=announcement).execute()
+    Video.query.filter_by(video_id=ctx["video_id"]).update({"classroom_posted": True})
+    db.session.commit()
+    ctx["classroom_status"] = "Posted to Google Classroom ✅"
+
+
+UPLOAD_STAGES = [
+    ("youtube_upload", upload_stage_youtube, True),
+    ("playlist_insert", upload_stage_playlist, True),
+    ("database_write", upload_stage_database, True),
+    ("classroom_post", upload_stage_classroom, False),
+]
+
+
+def save_upload_job(job, ctx, **fields):
+    for field, value in fields.items():
+        setattr(job, field, value)
+    job.stage = ctx.get("stage")
+    job.context = json.dumps(ctx)
+    job.updated_at = datetime.utcnow()
+    db.session.commit()
+
+
+def process_upload_job(app, job_id):
+    """Run the upload pipeline for one job inside the worker thread."""
+    with app.app_context():
+        job = db.session.get(UploadJob, job_id)
+        if not job:
+            return
+        ctx = json.loads(job.context) if job.context else {}
+        stages = [
+            Stage(name, lambda c, f=func: f(job, c), required=required)
+            for name, func, required in UPLOAD_STAGES
+        ]
+        save_upload_job(job, ctx, status="running", error=None)
+        try:
+            run_stages(stages, ctx, on_progress=lambda stage, c: save_upload_job(job, c))
+            save_upload_job(job, ctx, status="success")
+            # Failed jobs keep their file so they can be retried
+            remove_quietly(job.file_path)
+        except StageFailed as e:
+            db.session.rollback()
+            print("[UPLOAD JOB ERROR]", e)
+            save_upload_job(job, ctx, status="error", error=str(e))
+        except Exception as e:
+            db.session.rollback()
+            print("[UPLOAD JOB ERROR]", e)
+            save_upload_job(job, ctx, status="error", error=f"Unexpected error: {e}")
+        finally:
+            db.session.remove()
+
+
+def serialize_upload_job(job):
+    ctx = json.loads(job.context) if job.context else {}
+    completed = ctx.get("completed", [])
+    errors = ctx.get("errors", {})
+    done = len(completed)
+    sent, total = ctx.get("upload_bytes", [0, 0])
+    if job.stage == "youtube_upload" and total:
+        done += sent / total
+    classroom_status = ctx.get("classroom_status")
+    if "classroom_post" in errors:
+        classroom_status = f"Failed to post to Classroom: {errors['classroom_post']}"
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "stage": job.stage,
+        "progress": round(100 * done / len(UPLOAD_STAGES)),
+        "upload_bytes_sent": sent,
+        "upload_bytes_total": total,
+        "stages_completed": completed,
+        "stage_timings": ctx.get("timings", {}),
+        "stage_errors": errors,
+        "deduplicated": bool(ctx.get("deduplicated")),
+        "title": job.title,
+        "video_url": ctx.get("video_url"),
+        "classroom_status": classroom_status,
+        "message": job.error,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "updated_at": job.updated_at.isoformat() if job.updated_at else None
+    }
+
+
+@click.command("resume-uploads")
+@with_appcontext
+def resume_uploads_command():
+    """Re-run upload jobs left queued or running by a stopped process."""
+    job_ids = [j.id for j in UploadJob.query.filter(UploadJob.status.in_(["queued", "running"]))]
+    for job_id in job_ids:
+        print(f"Resuming upload job {job_id}")
+        process_upload_job(current_app._get_current_object(), job_id)
+    print(f"Resumed {len(job_ids)} upload job(s).")
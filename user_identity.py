@@ -0,0 +1,42 @@
+from collections import namedtuple
+
+from flask_login import UserMixin
+
+from extensions import db
+from models import GoogleAccountPermissions, UserAccount
+from read_cache import cached
+
+IDENTITY_FIELDS = ("id", "username", "email", "role", "active", "google_email", "profile_picture_url")
+
+
+class UserIdentity(namedtuple("UserIdentity", IDENTITY_FIELDS + ("permissions",)), UserMixin):
+    """
+    Read-only snapshot of a UserAccount row, used as ``current_user``.
+
+    ``permissions`` holds ``(integration_account_id, permission_level)`` for
+    each GoogleAccountPermissions row of the user, oldest first. Routes that
+    change the user should load the UserAccount itself.
+    """
+    __slots__ = ()
+
+    @property
+    def is_active(self):
+        return bool(self.active)
+
+    @property
+    def integration_account_id(self):
+        """The integration account the user uploads through, or None."""
+        return self.permissions[0][0] if self.permissions else None
+
+
+@cached('user_account', 'google_account_permissions', cache="identity_cache")
+def load_identity(user_id):
+    row = db.session.query(*(getattr(UserAccount, field) for field in IDENTITY_FIELDS)).filter(
+        UserAccount.id == user_id
+    ).first()
+    if row is None:
+        return None
+    permissions = db.session.query(
+        GoogleAccountPermissions.integration_account_id, GoogleAccountPermissions.permission_level
+    ).filter(GoogleAccountPermissions.user_id == user_id).order_by(GoogleAccountPermissions.id).all()
+    return UserIdentity(*row, permissions=tuple(map(tuple, permissions)))
@@ -1,7 +1,11 @@
+import json
 import os
 import pickle
 from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
+from google_batch import BatchQueue
+from google_clients import get_service
+from google_quota import get_limiter
+from googleapiclient.errors import HttpError
 from googleapiclient.http import MediaFileUpload
 
 # --- CONFIGURATION ---
@@ -11,10 +15,15 @@ SCOPES = [
 ]
 CREDENTIALS_FILE = os.environ.get("GOOGLE_CREDENTIALS_FILE", "config/webportal_credentials.json")
 TOKEN_FILE = os.environ.get("YOUTUBE_TOKEN_FILE", "config/token.pickle")
+# Resumable uploads send the file in chunks; YouTube requires multiples of 256 KiB
+CHUNK_GRANULARITY = 256 * 1024
+UPLOAD_CHUNK_SIZE = int(os.environ.get("YOUTUBE_UPLOAD_CHUNK_SIZE", 8 * 1024 * 1024))
+UPLOAD_NUM_RETRIES = int(os.environ.get("YOUTUBE_UPLOAD_NUM_RETRIES", "5"))
+VIDEO_LIST_MAX_IDS = 50
 
 # --- AUTHENTICATION ---
-def get_authenticated_service():
-    """Authenticate and return a YouTube API service instance."""
+def load_credentials():
+    """Load YouTube credentials from the token file, running the OAuth flow if missing."""
     credentials = None
 
     if os.path.exists(TOKEN_FILE):
@@ -27,23 +36,52 @@ def get_authenticated_service():
         with open(TOKEN_FILE, "wb") as token:
             pickle.dump(credentials, token)
 
-    return build("youtube", "v3", credentials=credentials)
+    return credentials
+
+def get_authenticated_service():
+    """Return the process-wide YouTube API service instance."""
+    return get_service("youtube", "v3", TOKEN_FILE, load_credentials)
 
 # --- PLAYLIST HANDLING ---
-def create_playlist_if_missing(youtube, class_name):
+def list_all_playlists(youtube):
+    """Return every playlist on the channel as ``(playlist_id, title)``, following all pages."""
+    playlists = []
+    page_token = None
+    while True:
+        response = youtube.playlists().list(
+            part="snippet",
+            mine=True,
+            maxResults=50,
+            pageToken=page_token,
+            fields="nextPageToken,items(id,snippet/title)"
+        ).execute()
+        playlists.extend((item["id"], item["snippet"]["title"]) for item in response.get("items", []))
+        page_token = response.get("nextPageToken")
+        if not page_token:
+            return playlists
+
+def create_playlist_if_missing(youtube, class_name, index=None):
     """
     Ensure a playlist exists for the given class name.
     If it doesn't exist, create a new unlisted one.
-    """
-    existing = youtube.playlists().list(
-        part="snippet",
-        mine=True,
-        maxResults=50
-    ).execute()
 
-    for item in existing.get("items", []):
-        if item["snippet"]["title"] == class_name:
-            return item["id"]
+    ``index`` is an optional local title -> playlist id store with
+    ``get(title)``, ``is_stale()``, ``refresh(playlists)`` and
+    ``put(playlist_id, title)``. While it is fresh, lookups never call the API.
+    """
+    if index is not None:
+        playlist_id = index.get(class_name)
+        if playlist_id:
+            return playlist_id
+        if index.is_stale():
+            index.refresh(list_all_playlists(youtube))
+            playlist_id = index.get(class_name)
+            if playlist_id:
+                return playlist_id
+    else:
+        for playlist_id, title in list_all_playlists(youtube):
+            if title == class_name:
+                return playlist_id
 
     playlist = youtube.playlists().insert(
         part="snippet,status",
@@ -58,18 +96,126 @@ def create_playlist_if_missing(youtube, class_name):
         }
     ).execute()
 
+    if index is not None:
+        index.put(playlist["id"], class_name)
     return playlist["id"]
 
+def add_video_to_playlist(youtube, playlist_id, video_id):
+    """Append an uploaded video to a playlist."""
+    youtube.playlistItems().insert(
+        part="snippet",
+        body={
+            "snippet": {
+                "playlistId": playlist_id,
+                "resourceId": {
+                    "kind": "youtube#video",
+                    "videoId": video_id
+                }
+            }
+        }
+    ).execute()
+    print(f"📁 Added to Playlist: {playlist_id}")
+
+def add_videos_to_playlist(youtube, playlist_id, video_ids):
+    """Append several videos to a playlist in batches; returns ``{video_id: error or None}``."""
+    queue = BatchQueue(youtube)
+    for video_id in video_ids:
+        queue.add(youtube.playlistItems().insert(
+            part="snippet",
+            body={
+                "snippet": {
+                    "playlistId": playlist_id,
+                    "resourceId": {
+                        "kind": "youtube#video",
+                        "videoId": video_id
+                    }
+                }
+            }
+        ), request_id=video_id)
+    results = {video_id: result.exception for video_id, result in queue.flush().items()}
+    print(f"📁 Added {sum(e is None for e in results.values())}/{len(results)} videos to Playlist: {playlist_id}")
+    return results
+
+# --- VIDEO METADATA ---
+def fetch_video_metadata(youtube, video_ids):
+    """
+    Return ``{video_id: {"title", "published_at"}}`` for videos that still exist.
+
+    ``videos.list`` takes up to 50 ids per call, and those calls are sent
+    together as batches, so thousands of videos cost a handful of round trips.
+    """
+    metadata = {}
+
+    def collect(request_id, response, exception):
+        for item in (response or {}).get("items", []):
+            metadata[item["id"]] = {
+                "title": item["snippet"].get("title"),
+                "published_at": item["snippet"].get("publishedAt")
+            }
+
+    video_ids = list(video_ids)
+    queue = BatchQueue(youtube)
+    for start in range(0, len(video_ids), VIDEO_LIST_MAX_IDS):
+        queue.add(youtube.videos().list(
+            part="snippet",
+            id=",".join(video_ids[start:start + VIDEO_LIST_MAX_IDS]),
+            maxResults=VIDEO_LIST_MAX_IDS,
+            fields="items(id,snippet(title,publishedAt))"
+        ), callback=collect)
+    errors = [r.exception for r in queue.flush().values() if r.exception is not None]
+    if errors:
+        raise errors[0]
+    return metadata
+
 # --- VIDEO UPLOAD ---
-def upload_video_to_youtube(file_path, title, description, playlist_id=None, tags=None):
+def normalize_chunk_size(chunk_size):
+    """Round a chunk size down to the 256 KiB multiple the upload protocol requires."""
+    return max(CHUNK_GRANULARITY, chunk_size - chunk_size % CHUNK_GRANULARITY)
+
+
+def upload_session_status(http, session_uri, total_size):
+    """
+    Ask YouTube how much of a resumable upload session it has stored.
+
+    Uses the documented status query (an empty PUT with ``Content-Range:
+    bytes */total``). Returns ``(bytes_received, None)`` while the upload is
+    incomplete and ``(total_size, video)`` once it has finished; raises
+    HttpError otherwise (404/410 once the session has expired).
+    """
+    # Throttled and counted like any other call, but costs no units: the
+    # upload was charged when its session was opened
+    get_limiter("youtube").acquire(0)
+    resp, content = http.request(
+        session_uri, "PUT", headers={"Content-Range": f"bytes */{total_size}", "Content-Length": "0"}
+    )
+    if resp.status in (200, 201):
+        return total_size, json.loads(content)
+    if resp.status == 308:
+        received = resp.get("range")  # "bytes=0-<last byte stored>", absent when nothing is stored
+        return (int(received.rsplit("-", 1)[1]) + 1 if received else 0), None
+    raise HttpError(resp, content, uri=session_uri)
+
+
+def upload_video_to_youtube(file_path, title, description, playlist_id=None, tags=None,
+                            chunk_size=None, progress_callback=None, session_uri=None, on_session=None):
     """
     Upload a video to YouTube with the given metadata.
     Optionally add to a playlist.
+
+    The file is sent as a resumable upload in ``chunk_size`` pieces.
+    ``on_session(uri)`` is called once the upload session exists so the caller
+    can persist it; passing that ``session_uri`` back in later continues the
+    same upload from the last byte the server acknowledged.
+    ``progress_callback(bytes_sent, total_bytes)`` fires after every chunk.
     """
     youtube = get_authenticated_service()
-    media = MediaFileUpload(file_path)
+    media = MediaFileUpload(
+        file_path,
+        chunksize=normalize_chunk_size(chunk_size or UPLOAD_CHUNK_SIZE),
+        resumable=True
+    )
 
-    video_response = youtube.videos().insert(
+    insert_request = youtube.videos().insert(
         part="snippet,status",
         body={
             "snippet": {
@@ -84,25 +230,53 @@ def upload_video_to_youtube(file_path, title, description, playlist_id=None, tag
             }
         },
         media_body=media
-    ).execute()
+    )
+    if session_uri:
+        insert_request.resumable_uri = session_uri
+
+    def remember_session():
+        nonlocal session_uri
+        if insert_request.resumable_uri != session_uri:
+            session_uri = insert_request.resumable_uri
+            if on_session:
+                on_session(session_uri)
+
+    video_response = None
+    try:
+        if session_uri:
+            # Continue from the last byte the server acknowledged
+            offset, video_response = upload_session_status(insert_request.http, session_uri, media.size())
+            insert_request.resumable_progress = offset
+            if progress_callback and video_response is None:
+                progress_callback(offset, media.size())
+        while video_response is None:
+            status, video_response = insert_request.next_chunk(num_retries=UPLOAD_NUM_RETRIES)
+            remember_session()
+            if status and progress_callback:
+                progress_callback(status.resumable_progress, status.total_size)
+    except HttpError as e:
+        resumed = session_uri is not None and insert_request.resumable_uri == session_uri
+        remember_session()
+        if resumed and e.resp.status in (404, 410):
+            # The saved session has expired; start the upload over
+            print(f"⚠️ Upload session expired, restarting: {title}")
+            if on_session:
+                on_session(None)
+            return upload_video_to_youtube(file_path, title, description, playlist_id, tags,
+                                           chunk_size, progress_callback, None, on_session)
+        raise
+    except Exception:
+        # Keep the session even if the very first chunk failed
+        remember_session()
+        raise
+
+    if progress_callback:
+        progress_callback(media.size(), media.size())
 
     video_id = video_response.get("id")
     print(f"✅ Uploaded: {title} (Video ID: {video_id})")
 
     if playlist_id:
-        youtube.playlistItems().insert(
-            part="snippet",
-            body={
-                "snippet": {
-                    "playlistId": playlist_id,
-                    "resourceId": {
-                        "kind": "youtube#video",
-                        "videoId": video_id
-                    }
-                }
-            }
-        ).execute()
-        print(f"📁 Added to Playlist: {playlist_id}")
-        
+        add_video_to_playlist(youtube, playlist_id, video_id)
 
     return video_id